@@ -1,88 +1,100 @@
 """Admin API endpoints for running Python scripts and maintenance tasks"""
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException
 from typing import Dict, Any
-import subprocess
 import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent.parent))
+from core.executor import run_blocking
+from core.genius_cache import get_genius_cache
+from core.jobs import get_job_manager, python_command
+
 router = APIRouter()
 
 # Path to original scripts
 SCRIPTS_DIR = Path(__file__).parent.parent.parent.parent / "buckingham_conspiracy" / "scripts"
 
+# Per-job time limits (seconds)
+FETCH_LYRICS_TIMEOUT = 300
+UPDATE_ARTISTS_TIMEOUT = 600
+
 @router.post("/fetch-lyrics/{song_name}")
-async def fetch_lyrics_for_song(song_name: str, background_tasks: BackgroundTasks):
-    """Fetch lyrics for a specific song using the original script"""
+async def fetch_lyrics_for_song(song_name: str):
+    """Fetch lyrics for a specific song using the original script (runs as a background job)"""
     try:
         script_path = SCRIPTS_DIR / "fetch_lyrics.py"
         if not script_path.exists():
             raise HTTPException(status_code=404, detail="fetch_lyrics.py script not found")
 
-        # Add background task to run script
-        background_tasks.add_task(run_fetch_lyrics_script, song_name)
+        job = get_job_manager().submit(
+            f"fetch-lyrics: {song_name}",
+            python_command(script_path, "--song", song_name),
+            timeout=FETCH_LYRICS_TIMEOUT
+        )
 
         return {
             "status": "started",
             "message": f"Lyrics fetch started for '{song_name}'",
-            "song_name": song_name
+            "song_name": song_name,
+            "job_id": job.id,
+            "job": job.to_dict()
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error starting lyrics fetch: {str(e)}")
 
 @router.post("/update-artists")
-async def update_artists_database(background_tasks: BackgroundTasks):
-    """Update the artists database using the original script"""
+async def update_artists_database():
+    """Update the artists database using the original script (runs as a background job)"""
     try:
         script_path = SCRIPTS_DIR / "update_artists.py"
         if not script_path.exists():
             raise HTTPException(status_code=404, detail="update_artists.py script not found")
 
-        # Add background task to run script
-        background_tasks.add_task(run_update_artists_script)
+        job = get_job_manager().submit(
+            "update-artists",
+            python_command(script_path),
+            timeout=UPDATE_ARTISTS_TIMEOUT
+        )
 
         return {
             "status": "started",
-            "message": "Artists database update started"
+            "message": "Artists database update started",
+            "job_id": job.id,
+            "job": job.to_dict()
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error starting artists update: {str(e)}")
 
-async def run_fetch_lyrics_script(song_name: str):
-    """Background task to run fetch lyrics script"""
-    try:
-        script_path = SCRIPTS_DIR / "fetch_lyrics.py"
-        result = subprocess.run([
-            sys.executable, str(script_path), song_name
-        ], capture_output=True, text=True, timeout=300)
-
-        if result.returncode != 0:
-            print(f"Fetch lyrics script failed: {result.stderr}")
-        else:
-            print(f"Fetch lyrics completed for {song_name}: {result.stdout}")
-
-    except subprocess.TimeoutExpired:
-        print(f"Fetch lyrics script timed out for {song_name}")
-    except Exception as e:
-        print(f"Error running fetch lyrics script: {e}")
-
-async def run_update_artists_script():
-    """Background task to run update artists script"""
-    try:
-        script_path = SCRIPTS_DIR / "update_artists.py"
-        result = subprocess.run([
-            sys.executable, str(script_path)
-        ], capture_output=True, text=True, timeout=600)
-
-        if result.returncode != 0:
-            print(f"Update artists script failed: {result.stderr}")
-        else:
-            print(f"Update artists completed: {result.stdout}")
-
-    except subprocess.TimeoutExpired:
-        print("Update artists script timed out")
-    except Exception as e:
-        print(f"Error running update artists script: {e}")
+@router.get("/jobs")
+async def list_jobs():
+    """List recent admin jobs, newest first"""
+    return {"jobs": [job.to_dict() for job in get_job_manager().list_jobs()]}
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """Status and captured output of an admin job"""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict(include_output=True)
+
+@router.post("/jobs/{job_id}/cancel")
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running admin job"""
+    manager = get_job_manager()
+    job = manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not await manager.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}")
+    # A job run by another worker is a snapshot; read its state after the cancel
+    return (manager.get(job_id) or job).to_dict(include_output=True)
 
 @router.get("/scripts/status")
 async def get_scripts_status():
@@ -99,4 +111,25 @@ async def get_scripts_status():
     return {
         "scripts_directory": str(SCRIPTS_DIR),
         "scripts": scripts_status
-    }
\ No newline at end of file
+    }
+
+@router.get("/genius-cache")
+async def get_genius_cache_stats():
+    """Hit/miss counters for the on-disk Genius cache"""
+    cache = get_genius_cache()
+    return {
+        "enabled": cache.enabled,
+        "cache_dir": str(cache.cache_dir),
+        "ttl_seconds": cache.ttl,
+        "negative_ttl_seconds": cache.negative_ttl,
+        "stats": cache.stats()
+    }
+
+@router.post("/genius-cache/prune")
+async def prune_genius_cache():
+    """Delete expired Genius cache entries"""
+    try:
+        removed = await run_blocking(get_genius_cache().prune)
+        return {"status": "success", "removed": removed}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error pruning Genius cache: {str(e)}")
\ No newline at end of file
@@ -15,8 +15,10 @@ import os
 # Import business logic
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
-from core.song_manager import load_song_list
-from core.setlist_manager import save_setlist_to_file, load_previous_setlists, SETLISTS_DIR
+from core.executor import run_blocking
+from core.song_manager import get_song_catalog
+from core.file_locks import WriteConflict
+from core.setlist_manager import save_setlist_to_file, get_setlist, get_setlist_by_position, SETLISTS_DIR
 
 router = APIRouter()
 templates = Jinja2Templates(directory=str(Path(__file__).parent.parent / "templates"))
@@ -24,12 +26,12 @@ templates = Jinja2Templates(directory=str(Path(__file__).parent.parent / "templa
 @router.get("/", response_class=HTMLResponse)
 async def get_builder(
     request: Request,
-    edit: Optional[int] = Query(None),
-    setlist_id: Optional[int] = Query(None)
+    edit: Optional[str] = Query(None),
+    setlist_id: Optional[str] = Query(None)
 ):
     """Render the Setlist Builder UI, optionally pre-loaded with an existing setlist for editing."""
     try:
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
         
         # Sort songs alphabetically for the library sidebar
         sorted_songs = sorted(songs_data.keys())
@@ -49,11 +51,13 @@ async def get_builder(
         target_id = edit if edit is not None else setlist_id
         initial_setlist = None
         if target_id is not None:
-            setlists = load_previous_setlists()
-            if 0 <= target_id < len(setlists):
-                s = setlists[target_id]
+            s = await run_blocking(get_setlist, target_id)
+            if s is None and target_id.isdigit():
+                # Legacy positional id from an old bookmark
+                s = await run_blocking(get_setlist_by_position, int(target_id))
+            if s is not None:
                 initial_setlist = {
-                    "setlist_id": target_id,
+                    "setlist_id": s["id"],
                     "venue": s.get("venue", ""),
                     "date": s.get("date", ""),
                     "set1": [{"name": item["name"], "bpm": item.get("bpm"), "is_segue": item.get("is_segue", False)} if isinstance(item, dict) else {"name": str(item), "bpm": None, "is_segue": False} for item in s["sets"].get("set1", [])],
@@ -103,7 +107,7 @@ async def export_built_setlist(request: Request):
         venue_dir_name = f"{venue} Setlist ({dir_date})"
         
         venue_dir = SETLISTS_DIR / venue_dir_name
-        venue_dir.mkdir(parents=True, exist_ok=True)
+        await run_blocking(venue_dir.mkdir, parents=True, exist_ok=True)
         
         # File name is usually "Venue Date.md" or similar. We'll use "setlist.md" inside the venue dir
         # matching the existing structure where there's a markdown file inside the directory.
@@ -118,8 +122,10 @@ async def export_built_setlist(request: Request):
         }
         
         # Save it
-        save_setlist_to_file(setlist_data)
+        await run_blocking(save_setlist_to_file, setlist_data)
         
         return {"success": True, "message": "Setlist saved successfully!"}
+    except WriteConflict as e:
+        return JSONResponse(status_code=409, content={"success": False, "message": str(e)})
     except Exception as e:
         return JSONResponse(status_code=500, content={"success": False, "message": str(e)})
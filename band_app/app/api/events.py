@@ -0,0 +1,36 @@
+"""Server-Sent Events stream of data changes for live client refresh"""
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from core.change_feed import get_change_feed, sse_stream
+
+router = APIRouter()
+
+# Stop reverse proxies from buffering the stream, and browsers from caching it
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _parse_event_id(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        # Not one of ours; the client gets a resync
+        return -1
+
+
+@router.get("")
+async def change_events(request: Request, last_event_id: Optional[str] = Query(None)):
+    """Stream change events (song, catalog, setlist, setlists, lyrics) as text/event-stream.
+
+    Browsers resume with the Last-Event-ID header after a reconnect; the
+    ``last_event_id`` query parameter does the same for clients that can't set it.
+    """
+    resume_from = _parse_event_id(request.headers.get("last-event-id") or last_event_id)
+    subscription = get_change_feed().subscribe(resume_from)
+    return StreamingResponse(sse_stream(subscription, request.is_disconnected),
+                             media_type="text/event-stream", headers=STREAM_HEADERS)
@@ -4,24 +4,28 @@ Mobile-optimized with HTMX support for smooth navigation
 """
 
 from fastapi import APIRouter, Request, HTTPException, Query, Form
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from typing import List, Optional
 from pathlib import Path
+import json
 
 # Import business logic
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
+from core.executor import run_blocking
 from core.lyrics_manager import (
     load_available_lyrics,
     load_lyrics_content,
-    format_lyrics_for_display,
-    search_lyrics,
+    load_lyrics_for_display,
+    search_lyrics_ranked,
     save_lyrics_content,
     delete_lyrics_file
 )
-from core.song_manager import load_song_list, delete_song_from_catalog
-from core.lyrics_fetcher import fetch_lyrics_online
+from core.song_manager import get_song_catalog, delete_song_from_catalog
+from core.file_locks import WriteConflict
+from core.lyrics_fetcher import fetch_lyrics_online_async
+from core.lyrics_backfill import backfill_lyrics, find_songs_missing_lyrics
 
 router = APIRouter()
 
@@ -33,8 +37,8 @@ templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 async def lyrics_home(request: Request):
     """Main lyrics page with song selection"""
     try:
-        available_lyrics = load_available_lyrics()
-        songs_data = load_song_list()
+        available_lyrics = await run_blocking(load_available_lyrics)
+        songs_data = await run_blocking(get_song_catalog)
 
         return templates.TemplateResponse(request=request, name="lyrics/index.html", context={
             "request": request,
@@ -50,7 +54,7 @@ async def lyrics_home(request: Request):
 async def get_lyrics_list(search: Optional[str] = Query(None)):
     """Get list of available lyrics with optional search"""
     try:
-        available_lyrics = load_available_lyrics()
+        available_lyrics = await run_blocking(load_available_lyrics)
 
         if search:
             # Filter by search term in song name
@@ -73,20 +77,16 @@ async def get_lyrics_list(search: Optional[str] = Query(None)):
 async def get_fetch_lyrics_modal(request: Request):
     """Render fetch lyrics modal with missing songs from catalog"""
     try:
-        available_lyrics = set(load_available_lyrics())
-        songs_data = load_song_list()
-        
         # Prioritize songs in catalog that don't yet have lyrics
-        missing_catalog_songs = {
-            name: info for name, info in songs_data.items()
-            if name not in available_lyrics
-        }
+        missing_catalog_songs = await run_blocking(find_songs_missing_lyrics)
+        missing_count = len(missing_catalog_songs)
         if not missing_catalog_songs:
-            missing_catalog_songs = songs_data
+            missing_catalog_songs = await run_blocking(get_song_catalog)
 
         return templates.TemplateResponse(request=request, name="lyrics/fetch_modal.html", context={
             "request": request,
             "catalog_songs": missing_catalog_songs,
+            "missing_count": missing_count,
         })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading fetch modal: {str(e)}")
@@ -110,7 +110,7 @@ async def fetch_lyrics_preview(
                 "error": "Please enter a song title to search.",
             })
 
-        res = fetch_lyrics_online(title, artist)
+        res = await fetch_lyrics_online_async(title, artist)
         return templates.TemplateResponse(request=request, name="lyrics/fetch_preview_partial.html", context={
             "request": request,
             "success": res.get("success", False),
@@ -129,6 +129,23 @@ async def fetch_lyrics_preview(
         })
 
 
+@router.post("/backfill")
+async def backfill_missing_lyrics(concurrency: Optional[int] = Query(None, ge=1, le=16)):
+    """Fetch lyrics for every catalog song without a lyrics file, streaming NDJSON progress"""
+    try:
+        missing = await run_blocking(find_songs_missing_lyrics)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error finding songs missing lyrics: {str(e)}")
+
+    async def progress():
+        events = backfill_lyrics(missing, concurrency) if concurrency else backfill_lyrics(missing)
+        async for event in events:
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(progress(), media_type="application/x-ndjson",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
 @router.post("/save-new")
 async def save_new_lyrics(
     request: Request,
@@ -144,7 +161,7 @@ async def save_new_lyrics(
     if not lyrics_content.strip():
         raise HTTPException(status_code=400, detail="Lyrics content cannot be empty")
 
-    save_lyrics_content(target_song, lyrics_content.strip())
+    await run_blocking(save_lyrics_content, target_song, lyrics_content.strip())
     
     return HTMLResponse(
         content=f"<script>window.location.href='/api/lyrics/{target_song}';</script>",
@@ -157,13 +174,15 @@ async def save_new_lyrics(
 async def delete_lyrics_and_song_endpoint(request: Request, song_name: str):
     """Permanently delete a song from lyrics and catalog"""
     try:
-        delete_song_from_catalog(song_name)
-        delete_lyrics_file(song_name)
+        await run_blocking(delete_song_from_catalog, song_name)
+        await run_blocking(delete_lyrics_file, song_name)
         
         return HTMLResponse(
             content="<script>window.location.href='/api/lyrics/';</script>",
             headers={"HX-Redirect": "/api/lyrics/"}
         )
+    except WriteConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting song: {str(e)}")
 
@@ -172,17 +191,14 @@ async def delete_lyrics_and_song_endpoint(request: Request, song_name: str):
 async def get_lyrics(request: Request, song_name: str):
     """Get lyrics for a specific song - HTMX compatible"""
     try:
-        # Load lyrics content
-        lyrics_content = load_lyrics_content(song_name)
+        # Load lyrics content and its cached HTML rendering
+        lyrics_content, formatted_lyrics = await run_blocking(load_lyrics_for_display, song_name)
 
         if "not found" in lyrics_content.lower() or not lyrics_content.strip():
             formatted_lyrics = ""
-        else:
-            # Format for HTML display
-            formatted_lyrics = format_lyrics_for_display(lyrics_content)
 
         # Get song info if available
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
         song_info = songs_data.get(song_name, {})
         duration_sec = song_info.get('duration', 0)
         duration_formatted = f"{duration_sec // 60}:{(duration_sec % 60):02d}" if duration_sec else ""
@@ -211,13 +227,11 @@ async def get_lyrics(request: Request, song_name: str):
 async def get_lyrics_view_partial(request: Request, song_name: str):
     """Get partial view of lyrics (just the content inside container)"""
     try:
-        lyrics_content = load_lyrics_content(song_name)
+        lyrics_content, formatted_lyrics = await run_blocking(load_lyrics_for_display, song_name)
         if "not found" in lyrics_content.lower() or not lyrics_content.strip():
             formatted_lyrics = ""
-        else:
-            formatted_lyrics = format_lyrics_for_display(lyrics_content)
 
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
         song_info = songs_data.get(song_name, {})
         duration_sec = song_info.get('duration', 0)
         duration_formatted = f"{duration_sec // 60}:{(duration_sec % 60):02d}" if duration_sec else ""
@@ -245,11 +259,11 @@ async def get_lyrics_view_partial(request: Request, song_name: str):
 async def get_lyrics_edit(request: Request, song_name: str):
     """Get partial edit form for lyrics"""
     try:
-        lyrics_content = load_lyrics_content(song_name)
+        lyrics_content = await run_blocking(load_lyrics_content, song_name)
         if "not found" in lyrics_content.lower():
             lyrics_content = ""
 
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
         song_info = songs_data.get(song_name, {})
 
         return templates.TemplateResponse(request=request, name="lyrics/edit_partial.html", context={
@@ -268,13 +282,12 @@ async def post_lyrics_edit(request: Request, song_name: str, lyrics: str = Form(
     """Save edited lyrics and return the display partial"""
     try:
         # Save to file (which persists to mounted directory via lyrics_manager)
-        save_lyrics_content(song_name, lyrics)
+        await run_blocking(save_lyrics_content, song_name, lyrics)
 
         # Reload and format
-        lyrics_content = load_lyrics_content(song_name)
-        formatted_lyrics = format_lyrics_for_display(lyrics_content)
+        lyrics_content, formatted_lyrics = await run_blocking(load_lyrics_for_display, song_name)
 
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
         song_info = songs_data.get(song_name, {})
         duration_sec = song_info.get('duration', 0)
         duration_formatted = f"{duration_sec // 60}:{(duration_sec % 60):02d}" if duration_sec else ""
@@ -301,17 +314,14 @@ async def post_lyrics_edit(request: Request, song_name: str, lyrics: str = Form(
 async def get_lyrics_fullscreen(request: Request, song_name: str):
     """Get lyrics in full-screen mode - optimized for mobile performance"""
     try:
-        # Load lyrics content
-        lyrics_content = load_lyrics_content(song_name)
+        # Load lyrics content and its cached HTML rendering
+        lyrics_content, formatted_lyrics = await run_blocking(load_lyrics_for_display, song_name)
 
         if "not found" in lyrics_content.lower():
             raise HTTPException(status_code=404, detail=f"Lyrics for '{song_name}' not found")
 
-        # Format for HTML display
-        formatted_lyrics = format_lyrics_for_display(lyrics_content)
-
         # Get song info if available
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
         song_info = songs_data.get(song_name, {})
 
         artist = song_info.get('artist', '')
@@ -346,19 +356,19 @@ async def get_lyrics_fullscreen(request: Request, song_name: str):
 async def get_lyrics_raw(song_name: str):
     """Get raw lyrics content as JSON"""
     try:
-        lyrics_content = load_lyrics_content(song_name)
+        lyrics_content, formatted_lyrics = await run_blocking(load_lyrics_for_display, song_name)
 
         if "not found" in lyrics_content.lower():
             raise HTTPException(status_code=404, detail=f"Lyrics for '{song_name}' not found")
 
         # Get song info if available
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
         song_info = songs_data.get(song_name, {})
 
         return {
             "song_name": song_name,
             "lyrics": lyrics_content,
-            "formatted_lyrics": format_lyrics_for_display(lyrics_content),
+            "formatted_lyrics": formatted_lyrics,
             "artist": song_info.get('artist', ''),
             "bpm": song_info.get('bpm', ''),
             "duration": song_info.get('duration', ''),
@@ -371,15 +381,16 @@ async def get_lyrics_raw(song_name: str):
         raise HTTPException(status_code=500, detail=f"Error loading lyrics: {str(e)}")
 
 @router.get("/search/{query}")
-async def search_lyrics_content(query: str):
-    """Search for songs by lyrics content"""
+async def search_lyrics_content(query: str, limit: Optional[int] = Query(None)):
+    """Search for songs by lyrics content (ranked, with matching line snippets)"""
     try:
-        matching_songs = search_lyrics(query)
+        results = await run_blocking(search_lyrics_ranked, query, limit=limit)
 
         return {
             "query": query,
-            "matches": matching_songs,
-            "total": len(matching_songs)
+            "matches": [result['song_name'] for result in results],
+            "results": results,
+            "total": len(results)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching lyrics: {str(e)}")
@@ -388,7 +399,7 @@ async def search_lyrics_content(query: str):
 async def get_lyrics_navigation(request: Request, song_name: str, context: Optional[str] = Query(None)):
     """Get navigation controls for lyrics - supports setlist context"""
     try:
-        available_lyrics = load_available_lyrics()
+        available_lyrics = await run_blocking(load_available_lyrics)
 
         # Find current song index
         current_index = -1
@@ -3,18 +3,29 @@ Setlists API endpoints for band app
 Previous setlist viewing, setlist building, and navigation
 """
 
-from fastapi import APIRouter, Request, HTTPException, Query, Form
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import APIRouter, Request, HTTPException, Query, Form, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.templating import Jinja2Templates
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
+from collections import OrderedDict
+import gzip
+import hashlib
 import json
+import threading
 
 # Import business logic
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
+from core.executor import run_blocking
 from core.setlist_manager import (
     load_previous_setlists,
+    get_setlist,
+    get_setlist_by_position,
+    get_setlist_archive,
+    read_setlist_markdown,
+    write_setlist_markdown,
+    setlist_markdown_version,
     parse_setlist_file,
     save_setlist_to_file,
     delete_setlist,
@@ -23,14 +34,20 @@ from core.setlist_manager import (
     create_setlist_export_data,
     load_setlist_from_json,
     search_setlists_by_song,
+    find_setlists_with_song,
+    get_song_play_stats,
     format_duration,
     format_human_duration,
     human_readable_date
 )
-from core.song_manager import load_song_list
+from core.setlist_analytics import get_setlist_analytics
+from core.conditional_get import etag_matches
+from core.file_locks import WriteConflict
+from core.show_sync import get_show_sync_hub
+from core.song_manager import get_song_catalog, get_catalog_cache
 from core.lyrics_manager import (
-    load_lyrics_content,
-    format_lyrics_for_display
+    load_lyrics_for_display,
+    lyrics_file_stamp
 )
 
 router = APIRouter()
@@ -39,11 +56,32 @@ router = APIRouter()
 TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
+
+async def resolve_setlist(request: Request, setlist_id: str) -> Dict:
+    """Setlist for a route's id; legacy positional ids are redirected to the stable id.
+
+    The redirect is temporary (307) because a position points at a different
+    show whenever one is added, and 307 keeps the method for form posts.
+    """
+    setlist = await run_blocking(get_setlist, setlist_id)
+    if setlist is not None:
+        return setlist
+    if setlist_id.isdigit():
+        setlist = await run_blocking(get_setlist_by_position, int(setlist_id))
+        if setlist is not None:
+            # Swap the id segment in place; url_for can't tell apart stacked routes sharing a name
+            parts = request.url.path.split("/")
+            parts[parts.index(setlist_id)] = setlist['id']
+            url = request.url.replace(path="/".join(parts))
+            raise HTTPException(status_code=307, detail="Setlist moved to a stable id",
+                                headers={"Location": str(url)})
+    raise HTTPException(status_code=404, detail=f"Setlist {setlist_id} not found")
+
 @router.get("/", response_class=HTMLResponse)
 async def setlists_home(request: Request):
     """Main setlists page showing previous setlists"""
     try:
-        previous_setlists = load_previous_setlists()
+        previous_setlists = await run_blocking(load_previous_setlists)
 
         return templates.TemplateResponse(request=request, name="setlists/index.html", context={
             "request": request,
@@ -62,19 +100,17 @@ async def get_setlists_list(
 ):
     """Get list of previous setlists with optional filtering"""
     try:
-        setlists = load_previous_setlists()
+        if search_song:
+            # Only the setlists containing the song, straight from the song index
+            setlists = await run_blocking(find_setlists_with_song, search_song)
+        else:
+            setlists = await run_blocking(load_previous_setlists)
 
         # Apply filters
         if search_venue:
             venue_lower = search_venue.lower()
             setlists = [s for s in setlists if venue_lower in s['venue'].lower()]
 
-        if search_song:
-            # Search for setlists containing specific song
-            song_matches = search_setlists_by_song(search_song)
-            matching_setlist_files = {match['setlist']['file_path'] for match in song_matches}
-            setlists = [s for s in setlists if s['file_path'] in matching_setlist_files]
-
         # Limit results
         if limit:
             setlists = setlists[:limit]
@@ -91,17 +127,26 @@ async def get_setlists_list(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading setlists list: {str(e)}")
 
+@router.get("/analytics")
+async def get_setlists_analytics(request: Request):
+    """Play counts, venue frequency, songs per show and songs played only once across the archive"""
+    try:
+        analytics = await run_blocking(get_setlist_analytics)
+        # The summary and its ETag are rebuilt only when the archive version changes
+        etag = analytics['etag']
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(content=analytics, headers=headers)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading setlist analytics: {str(e)}")
+
 @router.get("/{setlist_id}", response_class=HTMLResponse)
-async def get_setlist_details(request: Request, setlist_id: int):
+async def get_setlist_details(request: Request, setlist_id: str):
     """Get detailed view of a specific setlist"""
     try:
-        setlists = load_previous_setlists()
-
-        if setlist_id >= len(setlists) or setlist_id < 0:
-            raise HTTPException(status_code=404, detail=f"Setlist {setlist_id} not found")
-
-        setlist = setlists[setlist_id]
-        songs_data = load_song_list()
+        setlist = await resolve_setlist(request, setlist_id)
+        songs_data = await run_blocking(get_song_catalog)
 
         # Calculate set timings
         set_timings = {}
@@ -137,20 +182,14 @@ async def get_setlist_details(request: Request, setlist_id: int):
 
 
 @router.get("/{setlist_id}/edit", response_class=HTMLResponse)
-async def get_edit_setlist_form(request: Request, setlist_id: int):
+async def get_edit_setlist_form(request: Request, setlist_id: str):
     """Return the edit form for a setlist (raw markdown editing)."""
     try:
-        previous_setlists = load_previous_setlists()
-        
-        if setlist_id < 0 or setlist_id >= len(previous_setlists):
-            raise HTTPException(status_code=404, detail="Setlist not found")
-            
-        setlist = previous_setlists[setlist_id]
+        setlist = await resolve_setlist(request, setlist_id)
         
         # Read the raw markdown
         try:
-            with open(setlist['file_path'], 'r', encoding='utf-8') as f:
-                raw_markdown = f.read()
+            raw_markdown = await run_blocking(read_setlist_markdown, setlist['file_path'])
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error reading file: {str(e)}")
             
@@ -159,6 +198,7 @@ async def get_edit_setlist_form(request: Request, setlist_id: int):
             "setlist": setlist,
             "setlist_id": setlist_id,
             "raw_markdown": raw_markdown,
+            "markdown_version": setlist_markdown_version(raw_markdown),
             "active_page": "setlists",
         })
     except HTTPException:
@@ -170,34 +210,24 @@ async def get_edit_setlist_form(request: Request, setlist_id: int):
 @router.post("/{setlist_id}/edit", response_class=HTMLResponse)
 async def save_edited_setlist(
     request: Request, 
-    setlist_id: int,
-    markdown_content: str = Form(...)
+    setlist_id: str,
+    markdown_content: str = Form(...),
+    version: Optional[str] = Form(None)
 ):
-    """Save the raw markdown and return updated details."""
+    """Save the raw markdown and return updated details; 409 if the file changed since the form loaded."""
     try:
-        previous_setlists = load_previous_setlists()
-        
-        if setlist_id < 0 or setlist_id >= len(previous_setlists):
-            raise HTTPException(status_code=404, detail="Setlist not found")
-            
-        setlist = previous_setlists[setlist_id]
+        setlist = await resolve_setlist(request, setlist_id)
         
         # Write the raw markdown back
         try:
-            with open(setlist['file_path'], 'w', encoding='utf-8') as f:
-                f.write(markdown_content)
+            await run_blocking(write_setlist_markdown, setlist['file_path'], markdown_content, version)
+        except WriteConflict as e:
+            raise HTTPException(status_code=409, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error writing file: {str(e)}")
             
-        # Re-parse to ensure valid and then redirect/refresh to the details page
-        # Since it's a full page edit usually, we can return the HX-Redirect header
-        # or render the details page again. Returning the details HTML is easiest.
-        
-        # Reload setlists to get updated data
-        updated_setlists = load_previous_setlists()
-        # Note: saving might change its position in the list if the date was edited. 
-        # But for now, we'll just redirect to the index or try to find it.
-        # HX-Redirect is safer.
+        # Redirect to the details page; the id comes from the venue directory,
+        # so it stays valid even if the edit changed the show's date.
         response = HTMLResponse("")
         response.headers["HX-Redirect"] = f"/api/setlists/{setlist_id}"
         return response
@@ -208,15 +238,10 @@ async def save_edited_setlist(
         raise HTTPException(status_code=500, detail=f"Error saving setlist: {str(e)}")
 
 @router.get("/{setlist_id}/navigation", response_class=HTMLResponse)
-async def get_setlist_navigation(request: Request, setlist_id: int, current_song: Optional[str] = Query(None)):
+async def get_setlist_navigation(request: Request, setlist_id: str, current_song: Optional[str] = Query(None)):
     """Get navigation controls for setlist progression"""
     try:
-        setlists = load_previous_setlists()
-
-        if setlist_id >= len(setlists) or setlist_id < 0:
-            raise HTTPException(status_code=404, detail=f"Setlist {setlist_id} not found")
-
-        setlist = setlists[setlist_id]
+        setlist = await resolve_setlist(request, setlist_id)
 
         # Build flat song list with set context
         all_songs = []
@@ -262,7 +287,7 @@ async def get_setlist_navigation(request: Request, setlist_id: int, current_song
 async def search_setlists_by_song_name(song_name: str):
     """Find all setlists containing a specific song"""
     try:
-        matches = search_setlists_by_song(song_name)
+        matches = await run_blocking(search_setlists_by_song, song_name)
 
         return {
             "song_name": song_name,
@@ -272,16 +297,19 @@ async def search_setlists_by_song_name(song_name: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching setlists: {str(e)}")
 
+@router.get("/search/song/{song_name}/stats")
+async def get_song_stats(song_name: str):
+    """How many times a song was played and when it was first and last played"""
+    try:
+        return await run_blocking(get_song_play_stats, song_name)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading song stats: {str(e)}")
+
 @router.get("/{setlist_id}/export")
-async def export_setlist(setlist_id: int, format: str = Query("json")):
+async def export_setlist(request: Request, setlist_id: str, format: str = Query("json")):
     """Export setlist in various formats"""
     try:
-        setlists = load_previous_setlists()
-
-        if setlist_id >= len(setlists) or setlist_id < 0:
-            raise HTTPException(status_code=404, detail=f"Setlist {setlist_id} not found")
-
-        setlist = setlists[setlist_id]
+        setlist = await resolve_setlist(request, setlist_id)
 
         if format == "json":
             # Build song list for export
@@ -300,7 +328,7 @@ async def export_setlist(setlist_id: int, format: str = Query("json")):
             return export_data
 
         elif format == "markdown":
-            songs_data = load_song_list()
+            songs_data = await run_blocking(get_song_catalog)
 
             # Calculate set timings for markdown
             set_durations = {}
@@ -345,16 +373,11 @@ async def export_setlist(setlist_id: int, format: str = Query("json")):
         raise HTTPException(status_code=500, detail=f"Error exporting setlist: {str(e)}")
 
 @router.get("/{setlist_id}/stats")
-async def get_setlist_stats(setlist_id: int):
+async def get_setlist_stats(request: Request, setlist_id: str):
     """Get comprehensive statistics for a setlist"""
     try:
-        setlists = load_previous_setlists()
-
-        if setlist_id >= len(setlists) or setlist_id < 0:
-            raise HTTPException(status_code=404, detail=f"Setlist {setlist_id} not found")
-
-        setlist = setlists[setlist_id]
-        songs_data = load_song_list()
+        setlist = await resolve_setlist(request, setlist_id)
+        songs_data = await run_blocking(get_song_catalog)
 
         # Calculate detailed statistics
         total_songs = sum(len(songs) for songs in setlist['sets'].values())
@@ -419,20 +442,15 @@ async def get_setlist_stats(setlist_id: int):
         raise HTTPException(status_code=500, detail=f"Error calculating setlist stats: {str(e)}")
 
 @router.get("/{setlist_id}/songs/{set_name}")
-async def get_setlist_set_songs(setlist_id: int, set_name: str):
+async def get_setlist_set_songs(request: Request, setlist_id: str, set_name: str):
     """Get songs from a specific set in a setlist"""
     try:
         if set_name not in ["set1", "set2", "set3"]:
             raise HTTPException(status_code=400, detail="Invalid set name. Use: set1, set2, set3")
 
-        setlists = load_previous_setlists()
-
-        if setlist_id >= len(setlists) or setlist_id < 0:
-            raise HTTPException(status_code=404, detail=f"Setlist {setlist_id} not found")
-
-        setlist = setlists[setlist_id]
+        setlist = await resolve_setlist(request, setlist_id)
         songs_in_set = setlist['sets'].get(set_name, [])
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
 
         # Enhance song data
         enhanced_songs = []
@@ -464,82 +482,221 @@ async def get_setlist_set_songs(setlist_id: int, set_name: str):
         raise HTTPException(status_code=500, detail=f"Error loading set songs: {str(e)}")
 
 
+SHOW_SET_LABELS = {1: "Set 1", 2: "Set 2", 3: "Encore"}
+NO_SONGS_HTML = "<p class='text-muted' style='font-style: italic;'>This setlist has no songs listed.</p>"
+# Rendered show bundles kept in memory, keyed by ETag
+SHOW_BUNDLE_CACHE_SIZE = 8
+
+_show_bundles: "OrderedDict[str, Tuple[bytes, bytes]]" = OrderedDict()
+_show_bundles_lock = threading.Lock()
+
+
+def build_show_songs(setlist: Dict, songs_data: Dict) -> Tuple[List[Dict], List[Dict]]:
+    """Flattened show order and the same songs grouped by set."""
+    flattened_songs = []
+    grouped_sets = []
+    for set_num in [1, 2, 3]:
+        set_key = f"set{set_num}"
+        set_songs = setlist['sets'].get(set_key, [])
+        if not set_songs:
+            continue
+
+        current_set_group = {
+            'set_num': set_num,
+            'set_label': SHOW_SET_LABELS.get(set_num, f"Set {set_num}"),
+            'songs': []
+        }
+
+        for s_idx, s in enumerate(set_songs):
+            s_name = s['name']
+            s_info = songs_data.get(s_name, {})
+            duration = s_info.get('duration', 0)
+            if not duration or duration <= 0:
+                duration = 240 # Default 4 mins if unmeasured
+
+            song_obj = {
+                'global_index': len(flattened_songs),
+                'set_num': set_num,
+                'set_label': SHOW_SET_LABELS.get(set_num, f"Set {set_num}"),
+                'song_in_set': s_idx + 1,
+                'set_total': len(set_songs),
+                'name': s_name,
+                'bpm': s.get('bpm') or s_info.get('bpm', None),
+                'song_key': s_info.get('song_key', ''),
+                'duration': duration,
+                'duration_formatted': format_duration(duration),
+                'artist': s_info.get('artist', ''),
+                'energy_level': s_info.get('energy_level', 'standard'),
+                'has_horn': s_info.get('has_horn', False),
+                'is_jam_vehicle': s_info.get('is_jam_vehicle', False),
+                'is_segue': s.get('is_segue', False) or s.get('segue', False)
+            }
+            flattened_songs.append(song_obj)
+            current_set_group['songs'].append(song_obj)
+
+        grouped_sets.append(current_set_group)
+    return flattened_songs, grouped_sets
+
+
+def load_show_lyrics_html(song_name: str) -> Tuple[bool, str]:
+    """(has_lyrics, HTML) for a song on stage, with a placeholder when lyrics are missing."""
+    raw_lyrics, lyrics_html = load_lyrics_for_display(song_name)
+    if "not found" in raw_lyrics.lower() or not raw_lyrics.strip():
+        return False, f"<p class='text-muted' style='font-style: italic;'>No lyrics found for '{song_name}'.</p>"
+    return True, lyrics_html
+
+
+def build_show_bundle(setlist_id: str) -> Optional[Tuple[str, bytes, bytes]]:
+    """(etag, JSON body, gzipped body) with every song of a show, or None if the setlist is unknown.
+
+    The ETag covers the setlist archive and catalog fingerprints plus each
+    song's lyrics file identity, so an unchanged show is answered without
+    rendering. Fingerprints rather than versions, which restart with the
+    process and differ between workers. They are read before the data, so a
+    concurrent edit can only make the ETag older than the bundle, never newer.
+    """
+    catalog = get_catalog_cache()
+    archive_fingerprint = get_setlist_archive().fingerprint
+    catalog_fingerprint = catalog.fingerprint
+    setlist = get_setlist(setlist_id)
+    if setlist is None:
+        return None
+    flattened_songs, _ = build_show_songs(setlist, catalog.songs())
+
+    change_token = json.dumps([
+        setlist_id,
+        archive_fingerprint,
+        catalog_fingerprint,
+        [[song['name'], lyrics_file_stamp(song['name'])] for song in flattened_songs],
+    ])
+    etag = '"' + hashlib.sha1(change_token.encode('utf-8')).hexdigest()[:20] + '"'
+
+    with _show_bundles_lock:
+        cached = _show_bundles.get(etag)
+        if cached is not None:
+            _show_bundles.move_to_end(etag)
+            return (etag,) + cached
+
+    partial_template = templates.get_template("setlists/show_song_partial.html")
+    total_songs = len(flattened_songs)
+    bundle_songs = []
+    for idx, song in enumerate(flattened_songs):
+        has_lyrics, lyrics_html = load_show_lyrics_html(song['name'])
+        partial_html = partial_template.render({
+            "current_song": song,
+            "current_idx": idx,
+            "total_songs": total_songs,
+            "lyrics_content": lyrics_html,
+            "prev_idx": idx - 1 if idx > 0 else None,
+            "next_idx": idx + 1 if idx < total_songs - 1 else None,
+        })
+        bundle_songs.append({**song, "has_lyrics": has_lyrics, "lyrics_html": lyrics_html, "partial_html": partial_html})
+
+    body = json.dumps({
+        "setlist_id": setlist_id,
+        "venue": setlist['venue'],
+        "date": setlist['date'],
+        "friendly_date": human_readable_date(setlist['date']),
+        "etag": etag,
+        "total_songs": total_songs,
+        "total_duration": sum(song['duration'] for song in flattened_songs),
+        "songs": bundle_songs,
+    }, separators=(",", ":")).encode('utf-8')
+    entry = (body, gzip.compress(body, compresslevel=6))
+
+    with _show_bundles_lock:
+        _show_bundles[etag] = entry
+        while len(_show_bundles) > SHOW_BUNDLE_CACHE_SIZE:
+            _show_bundles.popitem(last=False)
+    return (etag,) + entry
+
+
+# Newest shows whose bundles are rendered at startup (see core.warmup)
+WARMUP_SHOW_BUNDLES = 3
+
+
+def warm_show_bundles(count: int = WARMUP_SHOW_BUNDLES) -> int:
+    """Render and cache the show bundles of the newest ``count`` setlists; returns how many."""
+    newest = get_setlist_archive().setlists()[:count]
+    for setlist in newest:
+        build_show_bundle(setlist['id'])
+    return len(newest)
+
+
+@router.get("/{setlist_id}/show/bundle")
+async def get_setlist_show_bundle(request: Request, setlist_id: str):
+    """Every song of a show with rendered lyrics in one compressed, ETag-validated payload"""
+    try:
+        setlist = await resolve_setlist(request, setlist_id)
+        bundle = await run_blocking(build_show_bundle, setlist['id'])
+        if bundle is None:
+            raise HTTPException(status_code=404, detail="Setlist not found")
+        etag, body, gzipped = bundle
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=gzipped, media_type="application/json", headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error building show bundle: {str(e)}")
+
+
+@router.websocket("/{setlist_id}/show/sync")
+async def sync_setlist_show(websocket: WebSocket, setlist_id: str,
+                            client: str = Query(..., min_length=1, max_length=64),
+                            lead: int = Query(0)):
+    """Keep every device in a show on the leader's song, scroll position and play state"""
+    setlist = await run_blocking(get_setlist, setlist_id)
+    if setlist is None:
+        await websocket.close(code=4404)
+        return
+    songs_data = await run_blocking(get_song_catalog)
+    flattened_songs, _ = build_show_songs(setlist, songs_data)
+
+    await websocket.accept()
+    hub = get_show_sync_hub()
+    session, member = hub.join(setlist['id'], len(flattened_songs), client, websocket.send_text,
+                               lead=bool(lead))
+    try:
+        while True:
+            hub.handle(session, member, await websocket.receive_text())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.leave(setlist['id'], member)
+
+
 @router.get("/{setlist_id}/show", response_class=HTMLResponse)
 async def get_setlist_show_mode(
     request: Request,
-    setlist_id: int,
+    setlist_id: str,
     song: int = Query(0, description="0-based index of active song in flattened show list"),
     partial: int = Query(0, description="If 1, return only stage partial for HTMX swap")
 ):
     """Stage-ready Show Mode with ordered setlist navigation and autoscroll lyrics"""
     try:
-        setlists = load_previous_setlists()
-        if setlist_id < 0 or setlist_id >= len(setlists):
-            raise HTTPException(status_code=404, detail="Setlist not found")
-
-        setlist = setlists[setlist_id]
-        songs_data = load_song_list()
+        setlist = await resolve_setlist(request, setlist_id)
+        songs_data = await run_blocking(get_song_catalog)
 
         # Build ordered flattened song list and structured grouped sets
-        flattened_songs = []
-        grouped_sets = []
-        set_labels = {1: "Set 1", 2: "Set 2", 3: "Encore"}
-        for set_num in [1, 2, 3]:
-            set_key = f"set{set_num}"
-            set_songs = setlist['sets'].get(set_key, [])
-            if not set_songs:
-                continue
-
-            current_set_group = {
-                'set_num': set_num,
-                'set_label': set_labels.get(set_num, f"Set {set_num}"),
-                'songs': []
-            }
-
-            for s_idx, s in enumerate(set_songs):
-                s_name = s['name']
-                s_info = songs_data.get(s_name, {})
-                duration = s_info.get('duration', 0)
-                if not duration or duration <= 0:
-                    duration = 240 # Default 4 mins if unmeasured
-
-                song_obj = {
-                    'global_index': len(flattened_songs),
-                    'set_num': set_num,
-                    'set_label': set_labels.get(set_num, f"Set {set_num}"),
-                    'song_in_set': s_idx + 1,
-                    'set_total': len(set_songs),
-                    'name': s_name,
-                    'bpm': s.get('bpm') or s_info.get('bpm', None),
-                    'song_key': s_info.get('song_key', ''),
-                    'duration': duration,
-                    'duration_formatted': format_duration(duration),
-                    'artist': s_info.get('artist', ''),
-                    'energy_level': s_info.get('energy_level', 'standard'),
-                    'has_horn': s_info.get('has_horn', False),
-                    'is_jam_vehicle': s_info.get('is_jam_vehicle', False),
-                    'is_segue': s.get('is_segue', False) or s.get('segue', False)
-                }
-                flattened_songs.append(song_obj)
-                current_set_group['songs'].append(song_obj)
-
-            grouped_sets.append(current_set_group)
+        flattened_songs, grouped_sets = build_show_songs(setlist, songs_data)
 
         total_songs = len(flattened_songs)
         if total_songs == 0:
             current_idx = 0
             current_song = None
-            lyrics_html = "<p class='text-muted' style='font-style: italic;'>This setlist has no songs listed.</p>"
+            lyrics_html = NO_SONGS_HTML
             prev_idx = None
             next_idx = None
         else:
             current_idx = max(0, min(song, total_songs - 1))
             current_song = flattened_songs[current_idx]
-            raw_lyrics = load_lyrics_content(current_song['name'])
-            if "not found" in raw_lyrics.lower() or not raw_lyrics.strip():
-                lyrics_html = f"<p class='text-muted' style='font-style: italic;'>No lyrics found for '{current_song['name']}'.</p>"
-            else:
-                lyrics_html = format_lyrics_for_display(raw_lyrics)
+            _, lyrics_html = await run_blocking(load_show_lyrics_html, current_song['name'])
 
             prev_idx = current_idx - 1 if current_idx > 0 else None
             next_idx = current_idx + 1 if current_idx < total_songs - 1 else None
@@ -582,10 +739,14 @@ async def get_setlist_show_mode(
 
 @router.post("/{setlist_id}/delete")
 @router.delete("/{setlist_id}")
-async def remove_setlist(request: Request, setlist_id: int):
+async def remove_setlist(request: Request, setlist_id: str):
     """Delete a setlist markdown file and remove empty directories."""
     try:
-        success = delete_setlist(setlist_id)
+        setlist = await resolve_setlist(request, setlist_id)
+        try:
+            success = await run_blocking(delete_setlist, setlist['id'])
+        except WriteConflict as e:
+            raise HTTPException(status_code=409, detail=str(e))
         if not success:
             raise HTTPException(status_code=404, detail="Setlist not found")
 
@@ -12,17 +12,23 @@ from pathlib import Path
 # Import business logic
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
+from core.executor import run_blocking
 from core.song_manager import (
-    load_song_list,
+    get_song_catalog,
     get_song_stats,
-    save_song_list,
+    update_song_list,
+    song_version,
+    check_song_version,
     split_minutes_seconds,
     combine_avg_length,
     derive_song_duration,
     delete_song_from_catalog
 )
+from core.file_locks import WriteConflict
+from core.song_query import InvalidCursor, query_song_library
+from core.song_suggest import DEFAULT_SUGGESTIONS, suggest_songs
 from core.lyrics_manager import load_available_lyrics, save_lyrics_content, delete_lyrics_file
-from core.lyrics_fetcher import fetch_lyrics_online
+from core.lyrics_fetcher import fetch_lyrics_online_async
 from core.utils import load_available_tabs
 
 router = APIRouter()
@@ -50,10 +56,10 @@ def parse_time_string(val: str) -> Optional[int]:
 async def songs_home(request: Request):
     """Main songs library page"""
     try:
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
         stats = get_song_stats(songs_data)
-        available_lyrics = load_available_lyrics()
-        available_tabs = load_available_tabs()
+        available_lyrics = await run_blocking(load_available_lyrics)
+        available_tabs = await run_blocking(load_available_tabs)
 
         return templates.TemplateResponse(request=request, name="songs/index.html", context={
             "request": request,
@@ -92,12 +98,10 @@ async def add_new_song(
     if not clean_title:
         raise HTTPException(status_code=400, detail="Song title is required")
 
-    songs_data = load_song_list()
-    
     parsed_length = parse_time_string(avg_length)
     duration_sec = derive_song_duration(bpm, parsed_length)
 
-    songs_data[clean_title] = {
+    song_info = {
         "bpm": bpm,
         "song_key": song_key.strip(),
         "duration": duration_sec,
@@ -109,17 +113,23 @@ async def add_new_song(
         "raw_line": f"{clean_title} ({bpm})",
     }
 
+    def add_to_catalog(songs_data: Dict[str, Dict]) -> None:
+        songs_data[clean_title] = song_info
+
     # 1. Save metadata to CSV and Markdown
-    save_song_list(songs_data)
+    try:
+        await run_blocking(update_song_list, add_to_catalog)
+    except WriteConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
     # 2. Save or fetch lyrics
     if lyrics_content and lyrics_content.strip():
-        save_lyrics_content(clean_title, lyrics_content.strip())
+        await run_blocking(save_lyrics_content, clean_title, lyrics_content.strip())
     elif auto_fetch_lyrics:
         try:
-            fetched = fetch_lyrics_online(clean_title, artist.strip())
+            fetched = await fetch_lyrics_online_async(clean_title, artist.strip())
             if fetched.get("success") and fetched.get("lyrics"):
-                save_lyrics_content(clean_title, fetched["lyrics"])
+                await run_blocking(save_lyrics_content, clean_title, fetched["lyrics"])
         except Exception as e:
             print(f"Auto-fetch lyrics exception for '{clean_title}': {e}")
 
@@ -134,13 +144,15 @@ async def add_new_song(
 async def delete_song_endpoint(request: Request, song_name: str):
     """Permanently delete a song from catalog and its lyrics file"""
     try:
-        delete_song_from_catalog(song_name)
-        delete_lyrics_file(song_name)
+        await run_blocking(delete_song_from_catalog, song_name)
+        await run_blocking(delete_lyrics_file, song_name)
         
         return HTMLResponse(
             content="<script>window.location.href='/api/lyrics/';</script>",
             headers={"HX-Redirect": "/api/lyrics/"}
         )
+    except WriteConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting song: {str(e)}")
 
@@ -154,67 +166,30 @@ async def get_songs_list(
     min_bpm: Optional[int] = Query(None),
     max_bpm: Optional[int] = Query(None),
     sort_by: Optional[str] = Query("title"),  # title, bpm, artist, duration
-    sort_order: Optional[str] = Query("asc")  # asc, desc
+    sort_order: Optional[str] = Query("asc"),  # asc, desc
+    limit: Optional[int] = Query(None, ge=1),  # page size; all matches when omitted
+    cursor: Optional[str] = Query(None)  # next_cursor of the previous page
 ):
-    """Get filtered and sorted songs list"""
+    """Get filtered and sorted songs list, optionally one page at a time"""
     try:
-        songs_data = load_song_list()
-
-        # Apply filters
-        filtered_songs = {}
-
-        for song_name, song_info in songs_data.items():
-            # Search filter
-            if search:
-                search_lower = search.lower()
-                if not (search_lower in song_name.lower() or
-                       search_lower in song_info.get('artist', '').lower()):
-                    continue
-
-            # Energy level filter
-            if energy_level and song_info.get('energy_level') != energy_level:
-                continue
-
-            # Horn filter
-            if has_horn is not None and song_info.get('has_horn') != has_horn:
-                continue
-
-            # Jam vehicle filter
-            if is_jam_vehicle is not None and song_info.get('is_jam_vehicle') != is_jam_vehicle:
-                continue
-
-            # BPM range filters
-            song_bpm = song_info.get('bpm', 0)
-            if min_bpm and song_bpm < min_bpm:
-                continue
-            if max_bpm and song_bpm > max_bpm:
-                continue
-
-            filtered_songs[song_name] = song_info
-
-        # Sort results
-        sort_reverse = sort_order == "desc"
-
-        if sort_by == "title":
-            sorted_items = sorted(filtered_songs.items(),
-                                key=lambda x: x[0].lower(), reverse=sort_reverse)
-        elif sort_by == "artist":
-            sorted_items = sorted(filtered_songs.items(),
-                                key=lambda x: x[1].get('artist', '').lower(), reverse=sort_reverse)
-        elif sort_by == "bpm":
-            sorted_items = sorted(filtered_songs.items(),
-                                key=lambda x: x[1].get('bpm', 0), reverse=sort_reverse)
-        elif sort_by == "duration":
-            sorted_items = sorted(filtered_songs.items(),
-                                key=lambda x: x[1].get('duration', 0), reverse=sort_reverse)
-        else:
-            sorted_items = list(filtered_songs.items())
-
-        result_songs = dict(sorted_items)
+        songs_data, names, total, next_cursor = await run_blocking(
+            query_song_library,
+            search=search,
+            energy_level=energy_level,
+            has_horn=has_horn,
+            is_jam_vehicle=is_jam_vehicle,
+            min_bpm=min_bpm,
+            max_bpm=max_bpm,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            limit=limit,
+            cursor=cursor
+        )
 
         return {
-            "songs": result_songs,
-            "total": len(result_songs),
+            "songs": {name: songs_data[name] for name in names},
+            "total": total,
+            "next_cursor": next_cursor,
             "filters": {
                 "search": search,
                 "energy_level": energy_level,
@@ -223,17 +198,37 @@ async def get_songs_list(
                 "min_bpm": min_bpm,
                 "max_bpm": max_bpm,
                 "sort_by": sort_by,
-                "sort_order": sort_order
+                "sort_order": sort_order,
+                "limit": limit,
+                "cursor": cursor
             }
         }
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error filtering songs: {str(e)}")
 
+@router.get("/suggest")
+async def get_song_suggestions(
+    q: str = Query(""),
+    limit: int = Query(DEFAULT_SUGGESTIONS, ge=1, le=50)
+):
+    """Typo-tolerant search-as-you-type suggestions over song titles and artists"""
+    try:
+        suggestions = await run_blocking(suggest_songs, q, limit)
+        return {
+            "query": q,
+            "suggestions": suggestions,
+            "total": len(suggestions)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error loading suggestions: {str(e)}")
+
 @router.get("/{song_name}")
 async def get_song_details(song_name: str):
     """Get detailed information about a specific song"""
     try:
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
 
         if song_name not in songs_data:
             raise HTTPException(status_code=404, detail=f"Song '{song_name}' not found")
@@ -241,8 +236,8 @@ async def get_song_details(song_name: str):
         song_info = songs_data[song_name]
 
         # Check if lyrics and tabs are available
-        available_lyrics = load_available_lyrics()
-        available_tabs = load_available_tabs()
+        available_lyrics = await run_blocking(load_available_lyrics)
+        available_tabs = await run_blocking(load_available_tabs)
 
         has_lyrics = song_name in available_lyrics
         has_tabs = any(tab for tab in available_tabs if song_name.lower() in tab.lower())
@@ -274,7 +269,7 @@ async def get_song_details(song_name: str):
 async def get_song_card(request: Request, song_name: str):
     """Get HTML card for a specific song - HTMX compatible"""
     try:
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
 
         if song_name not in songs_data:
             raise HTTPException(status_code=404, detail=f"Song '{song_name}' not found")
@@ -282,8 +277,8 @@ async def get_song_card(request: Request, song_name: str):
         song_info = songs_data[song_name]
 
         # Check availability of related content
-        available_lyrics = load_available_lyrics()
-        available_tabs = load_available_tabs()
+        available_lyrics = await run_blocking(load_available_lyrics)
+        available_tabs = await run_blocking(load_available_tabs)
 
         has_lyrics = song_name in available_lyrics
         has_tabs = any(tab for tab in available_tabs if song_name.lower() in tab.lower())
@@ -310,12 +305,12 @@ async def get_song_card(request: Request, song_name: str):
 async def get_song_row(request: Request, song_name: str):
     """Get HTML row for a specific song - HTMX compatible"""
     try:
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
         if song_name not in songs_data:
             raise HTTPException(status_code=404, detail=f"Song '{song_name}' not found")
 
         song_info = songs_data[song_name]
-        available_lyrics = load_available_lyrics()
+        available_lyrics = await run_blocking(load_available_lyrics)
         has_lyrics = song_name in available_lyrics
 
         duration_minutes, duration_seconds = split_minutes_seconds(song_info.get('duration', 0))
@@ -342,7 +337,7 @@ async def get_edit_song_form(
 ):
     """Return the edit form for a specific song."""
     try:
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
         
         if song_name not in songs_data:
             raise HTTPException(status_code=404, detail="Song not found")
@@ -359,6 +354,7 @@ async def get_edit_song_form(
             "request": request,
             "song_name": song_name,
             "song_info": song_info,
+            "song_version": song_version(song_name, song_info),
             "avg_len_formatted": avg_len_formatted,
             "context_type": context,
         })
@@ -379,15 +375,15 @@ async def save_edited_song(
     is_jam_vehicle: bool = Form(False),
     energy_level: str = Form("standard"),
     avg_length: Optional[str] = Form(""),
-    context_type: Optional[str] = Form("card")
+    context_type: Optional[str] = Form("card"),
+    version: Optional[str] = Form(None)
 ):
-    """Save edited song metadata."""
+    """Save edited song metadata.
+
+    ``version`` is the song's version when the form was rendered; if the song
+    changed since, nothing is saved and 409 is returned.
+    """
     try:
-        songs_data = load_song_list()
-        
-        if song_name not in songs_data:
-            raise HTTPException(status_code=404, detail="Song not found")
-            
         # Parse average length back to seconds if provided
         avg_length_seconds = None
         if avg_length:
@@ -401,30 +397,30 @@ async def save_edited_song(
             except ValueError:
                 avg_length_seconds = None
                 
-        # Update metadata dictionary
-        songs_data[song_name].update({
-            "artist": artist.strip(),
-            "bpm": bpm,
-            "song_key": song_key.strip(),
-            "has_horn": has_horn,
-            "is_jam_vehicle": is_jam_vehicle,
-            "energy_level": energy_level,
-            "avg_length": avg_length_seconds
-        })
-        
+        def apply_edit(songs_data: Dict[str, Dict]) -> Dict:
+            if song_name not in songs_data:
+                raise HTTPException(status_code=404, detail="Song not found")
+            check_song_version(songs_data, song_name, version)
+            songs_data[song_name].update({
+                "artist": artist.strip(),
+                "bpm": bpm,
+                "song_key": song_key.strip(),
+                "has_horn": has_horn,
+                "is_jam_vehicle": is_jam_vehicle,
+                "energy_level": energy_level,
+                "avg_length": avg_length_seconds
+            })
+            return dict(songs_data[song_name])
+
         # Save to persistent storage (CSV + Markdown on mounted disk)
-        save_success = save_song_list(songs_data)
-        if not save_success:
-            raise Exception("Failed to save to CSV/Markdown")
-            
-        song_info = songs_data[song_name]
+        song_info = await run_blocking(update_song_list, apply_edit)
         from core.song_manager import derive_song_duration
         song_info['duration'] = derive_song_duration(bpm, avg_length_seconds)
         duration_minutes, duration_seconds = split_minutes_seconds(song_info['duration'])
         duration_formatted = f"{duration_minutes:02d}:{duration_seconds:02d}"
 
-        has_lyrics = song_name in load_available_lyrics()
-        has_tabs = any(tab for tab in load_available_tabs() if song_name.lower() in tab.lower())
+        has_lyrics = song_name in await run_blocking(load_available_lyrics)
+        has_tabs = any(tab for tab in await run_blocking(load_available_tabs) if song_name.lower() in tab.lower())
 
         if context_type == "row":
             return templates.TemplateResponse(request=request, name="songs/row_partial.html", context={
@@ -436,9 +432,10 @@ async def save_edited_song(
                 "active_page": "songs",
             })
         elif context_type == "lyrics":
-            from core.lyrics_manager import load_lyrics_content, format_lyrics_for_display
-            raw_lyrics = load_lyrics_content(song_name)
-            lyrics_html = format_lyrics_for_display(raw_lyrics) if "not found" not in raw_lyrics.lower() else ""
+            from core.lyrics_manager import load_lyrics_for_display
+            raw_lyrics, lyrics_html = await run_blocking(load_lyrics_for_display, song_name)
+            if "not found" in raw_lyrics.lower():
+                lyrics_html = ""
 
             return templates.TemplateResponse(request=request, name="lyrics/display_partial.html", context={
                 "request": request,
@@ -467,6 +464,8 @@ async def save_edited_song(
             })
     except HTTPException:
         raise
+    except WriteConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error saving song metadata: {str(e)}")
 
@@ -474,7 +473,7 @@ async def save_edited_song(
 async def get_song_stats_overview():
     """Get comprehensive statistics about the song library"""
     try:
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
         stats = get_song_stats(songs_data)
 
         # Additional statistics
@@ -508,7 +507,7 @@ async def get_songs_by_energy(energy_level: str):
         if energy_level not in ["high", "standard", "low"]:
             raise HTTPException(status_code=400, detail="Invalid energy level. Use: high, standard, low")
 
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
         filtered_songs = {
             name: info for name, info in songs_data.items()
             if info.get('energy_level') == energy_level
@@ -528,7 +527,7 @@ async def get_songs_by_energy(energy_level: str):
 async def get_horn_songs():
     """Get all songs that feature horn sections"""
     try:
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
         horn_songs = {
             name: info for name, info in songs_data.items()
             if info.get('has_horn', False)
@@ -545,7 +544,7 @@ async def get_horn_songs():
 async def get_jam_vehicles():
     """Get all songs marked as jam vehicles"""
     try:
-        songs_data = load_song_list()
+        songs_data = await run_blocking(get_song_catalog)
         jam_vehicles = {
             name: info for name, info in songs_data.items()
             if info.get('is_jam_vehicle', False)
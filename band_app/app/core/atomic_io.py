@@ -0,0 +1,178 @@
+"""Crash-safe file writes.
+
+``atomic_write`` writes a temp file in the target's directory, fsyncs it,
+renames it over the target and fsyncs the directory, so after a power cut the
+target holds either the old content or the new, never a truncated file. The
+replacement keeps the target's permission bits, since other tools (Obsidian,
+the Streamlit app) edit the same files.
+
+Inside ``group_commit()`` the writes of the current thread are staged and
+committed together on exit: each staged file is fsynced, all are renamed, and
+each directory is fsynced once, so a burst of writes (the four song list
+files, an export) becomes visible together.
+"""
+
+import os
+import stat
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Set, Tuple, Union
+
+# Set BCH_FSYNC=0 to skip fsync (tests, tmpfs); renames stay atomic
+FSYNC_ENABLED = os.getenv("BCH_FSYNC", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+_GROUP = threading.local()
+
+
+def temp_path_for(target: Path) -> Path:
+    """A unique hidden temp file next to ``target`` (same filesystem, so rename is atomic)."""
+    return target.parent / f".{target.name}.{uuid.uuid4().hex}.tmp"
+
+
+def is_temp_file(path: Path) -> bool:
+    """True for an in-flight ``atomic_write`` temp file."""
+    return path.name.startswith('.') and path.name.endswith('.tmp')
+
+
+def fsync_dir(directory: Path) -> None:
+    """Make renames in ``directory`` durable (no-op where directories can't be opened)."""
+    if not FSYNC_ENABLED:
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_temp(target: Path, data: Union[str, bytes], encoding: str, newline: Optional[str],
+                sync: bool) -> Path:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = temp_path_for(target)
+    try:
+        if isinstance(data, bytes):
+            f = open(tmp_path, 'xb')
+        else:
+            f = open(tmp_path, 'x', encoding=encoding, newline=newline)
+        with f:
+            f.write(data)
+            f.flush()
+            if sync and FSYNC_ENABLED:
+                os.fsync(f.fileno())
+        _copy_mode(target, tmp_path)
+    except BaseException:
+        _discard(tmp_path)
+        raise
+    return tmp_path
+
+
+def _copy_mode(target: Path, tmp_path: Path) -> None:
+    """Give the replacement the permission bits of the file it replaces (new files keep the umask default)."""
+    try:
+        mode = stat.S_IMODE(os.stat(target).st_mode)
+    except FileNotFoundError:
+        return
+    os.chmod(tmp_path, mode)
+
+
+def _discard(tmp_path: Path) -> None:
+    try:
+        os.unlink(tmp_path)
+    except OSError:
+        pass
+
+
+def _install(tmp_path: Path, target: Path, overwrite: bool) -> bool:
+    """Move a synced temp file into place; False if ``overwrite`` is off and target exists."""
+    try:
+        if overwrite:
+            os.replace(tmp_path, target)
+        else:
+            try:
+                # link() refuses to clobber, unlike rename()
+                os.link(tmp_path, target)
+            except FileExistsError:
+                return False
+    finally:
+        if os.path.exists(tmp_path):
+            _discard(tmp_path)
+    return True
+
+
+def atomic_write(target: Union[str, Path], data: Union[str, bytes], encoding: str = 'utf-8',
+                 newline: Optional[str] = None, overwrite: bool = True) -> bool:
+    """Replace ``target`` with ``data`` atomically and durably.
+
+    With overwrite=False an existing target is left untouched and False is
+    returned. Inside ``group_commit()`` overwriting writes only become visible
+    when the group commits.
+    """
+    target = Path(target)
+    group: Optional[List[Tuple[Path, Path]]] = getattr(_GROUP, 'staged', None)
+    if group is not None and overwrite:
+        group.append((_write_temp(target, data, encoding, newline, sync=False), target))
+        return True
+    tmp_path = _write_temp(target, data, encoding, newline, sync=True)
+    if not _install(tmp_path, target, overwrite):
+        return False
+    fsync_dir(target.parent)
+    return True
+
+
+@contextmanager
+def group_commit() -> Iterator[None]:
+    """Stage this thread's ``atomic_write`` calls and commit them together on exit.
+
+    Nested groups join the outermost one. If the block raises, staged files
+    are discarded and no target is touched.
+    """
+    if getattr(_GROUP, 'staged', None) is not None:
+        yield
+        return
+    staged: List[Tuple[Path, Path]] = []
+    _GROUP.staged = staged
+    try:
+        yield
+    except BaseException:
+        for tmp_path, _ in staged:
+            _discard(tmp_path)
+        raise
+    finally:
+        _GROUP.staged = None
+    _commit(staged)
+
+
+def _commit(staged: List[Tuple[Path, Path]]) -> None:
+    if not staged:
+        return
+    try:
+        if FSYNC_ENABLED:
+            # Only the staged files: os.sync() would flush every filesystem and
+            # can stall for seconds on an SD card while the write lock is held
+            for tmp_path, _ in staged:
+                _fsync_file(tmp_path)
+        directories: Set[Path] = set()
+        for tmp_path, target in staged:
+            os.replace(tmp_path, target)
+            directories.add(target.parent)
+        for directory in directories:
+            fsync_dir(directory)
+    finally:
+        for tmp_path, _ in staged:
+            if os.path.exists(tmp_path):
+                _discard(tmp_path)
+
+
+def _fsync_file(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,208 @@
+"""In-process feed of data change events for live clients.
+
+Write paths in the core managers call ``publish_change`` (from any thread);
+each connected /api/events client holds a Subscription whose asyncio queue is
+fed on its own event loop. Events are compact dicts:
+
+    {"seq": 42, "type": "song", "id": "Dreams", "action": "saved", "version": 42}
+
+``seq`` increases for every event and doubles as the SSE event id; ``version``
+is the seq at which that entity last changed, so clients can drop stale
+refreshes. The last FEED_HISTORY events are kept so a reconnecting client
+(Last-Event-ID) misses nothing; a client that fell further behind, or whose
+queue overflowed, gets a single "resync" event instead.
+
+Streams never end on their own, so ``end_streams`` closes every open one when
+the server shuts down; otherwise the server would wait on them until its
+graceful-shutdown timeout. Browsers reconnect and resume from their last event.
+"""
+
+import asyncio
+import json
+import threading
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+# Events kept for clients resuming with Last-Event-ID
+FEED_HISTORY = 256
+# Events buffered per client before it is told to resync
+SUBSCRIBER_QUEUE_SIZE = 128
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_SECONDS = 15.0
+# Milliseconds a browser waits before reconnecting a dropped stream
+RECONNECT_MS = 3000
+
+# Entity types
+SONG = "song"
+CATALOG = "catalog"
+SETLIST = "setlist"
+SETLISTS = "setlists"
+LYRICS = "lyrics"
+
+# Actions
+SAVED = "saved"
+DELETED = "deleted"
+CHANGED = "changed"
+RESYNC = "resync"
+
+# Queued to wake a subscriber whose stream is being ended
+_END = {"type": None}
+
+
+class Subscription:
+    """One client's queue of events; iterate with ``await next_event()``."""
+
+    def __init__(self, feed: "ChangeFeed", loop: asyncio.AbstractEventLoop) -> None:
+        self.feed = feed
+        self.loop = loop
+        self.queue: "asyncio.Queue[Dict]" = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+        self.ended = False
+
+    def _deliver(self, event: Dict) -> None:
+        # Runs on the subscriber's loop
+        if self.overflowed or self.ended:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def _end(self) -> None:
+        # Runs on the subscriber's loop; the stop marker always fits after draining
+        self.ended = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(_END)
+
+    async def next_event(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Next event, a resync event after an overflow, or None on timeout or once ended."""
+        if self.ended:
+            return None
+        if self.overflowed:
+            self.overflowed = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return self.feed.resync_event()
+        try:
+            event = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return None if event is _END else event
+
+    def close(self) -> None:
+        self.feed.unsubscribe(self)
+
+
+class ChangeFeed:
+    """Thread-safe publisher of change events to asyncio subscribers."""
+
+    def __init__(self, history: int = FEED_HISTORY) -> None:
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._history: Deque[Dict] = deque(maxlen=history)
+        self._subscribers: Set[Subscription] = set()
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def resync_event(self) -> Dict:
+        return {"seq": self._seq, "type": RESYNC, "id": None, "action": RESYNC, "version": self._seq}
+
+    def publish(self, entity_type: str, entity_id: Optional[str] = None, action: str = SAVED) -> Dict:
+        """Record a change and hand it to every subscriber's loop."""
+        with self._lock:
+            self._seq += 1
+            event = {"seq": self._seq, "type": entity_type, "id": entity_id,
+                     "action": action, "version": self._seq}
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # The subscriber's loop is gone
+                self.unsubscribe(subscription)
+        return event
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        """New subscription on the running loop, replaying events after ``last_event_id``."""
+        subscription = Subscription(self, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(subscription)
+            if last_event_id is not None and last_event_id != self._seq:
+                missed = [event for event in self._history if event["seq"] > last_event_id]
+                if not missed or missed[0]["seq"] != last_event_id + 1:
+                    # Fell out of the history window, or the id is from before a restart
+                    missed = [self.resync_event()]
+                for event in missed:
+                    subscription._deliver(event)
+        return subscription
+
+    def end_streams(self) -> int:
+        """End every open stream (server shutdown). Returns how many.
+
+        Safe from any thread and from signal handlers: it takes no lock (copying
+        the set is atomic under the GIL) and only schedules work on each loop.
+        """
+        subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._end)
+            except RuntimeError:
+                # The subscriber's loop is gone; the next publish drops it
+                pass
+        return len(subscribers)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def recent(self, after: int = 0) -> List[Dict]:
+        """Events still in the history with seq > ``after``."""
+        with self._lock:
+            return [event for event in self._history if event["seq"] > after]
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+_FEED = ChangeFeed()
+
+
+def get_change_feed() -> ChangeFeed:
+    """The process-wide change feed."""
+    return _FEED
+
+
+def publish_change(entity_type: str, entity_id: Optional[str] = None, action: str = SAVED) -> None:
+    """Announce a data change to live clients; never raises into the write path."""
+    try:
+        _FEED.publish(entity_type, entity_id, action)
+    except Exception as e:
+        print(f"Error publishing change event: {e}")
+
+
+def format_sse(event: Dict) -> str:
+    """One event in text/event-stream framing; the event name is its entity type."""
+    data = json.dumps(event, separators=(',', ':'))
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+async def sse_stream(subscription: Subscription,
+                     is_disconnected: Callable[[], Awaitable[bool]],
+                     heartbeat: float = HEARTBEAT_SECONDS) -> AsyncIterator[str]:
+    """Serialised events for one client until it disconnects or the stream is ended; always unsubscribes."""
+    try:
+        yield f"retry: {RECONNECT_MS}\n\n"
+        while not subscription.ended and not await is_disconnected():
+            event = await subscription.next_event(timeout=heartbeat)
+            if subscription.ended:
+                break
+            # A comment line keeps proxies from closing an idle connection
+            yield format_sse(event) if event is not None else ": keep-alive\n\n"
+    finally:
+        subscription.close()
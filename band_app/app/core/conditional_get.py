@@ -0,0 +1,180 @@
+"""Conditional GET for routes whose output depends only on the data files.
+
+Each rule maps a GET path pattern to the data it reads (song catalog, setlist
+archive, lyrics files, tabs listing). The ETag is a digest of those sources'
+file identities, so it is computed with a few stat() calls and is the same in
+every worker process. A matching ``If-None-Match`` is answered with 304
+before the route runs, so no template is rendered and no data file is read.
+"""
+
+import hashlib
+import os
+import re
+from typing import Callable, Dict, List, Optional, Pattern, Sequence, Tuple
+
+from .executor import run_blocking
+from .lyrics_manager import LYRICS_DIR, get_lyrics_index, lyrics_file_stamp
+from .setlist_manager import get_setlist_archive
+from .song_manager import get_catalog_cache
+from .utils import TABS_DIR
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Browsers may keep responses but must revalidate before using them
+CACHE_CONTROL = "no-cache"
+
+
+def _dir_stamp(path) -> Optional[int]:
+    """Directory mtime; changes when files are added, removed or renamed in it."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _deploy_token() -> str:
+    """Changes when templates or code are redeployed, so cached pages don't outlive them."""
+    stamps = []
+    for folder in ("templates", "api", "core"):
+        for root, _, files in os.walk(os.path.join(APP_DIR, folder)):
+            for name in files:
+                if name.endswith(('.html', '.py')):
+                    try:
+                        st = os.stat(os.path.join(root, name))
+                    except OSError:
+                        continue
+                    stamps.append((name, st.st_mtime_ns, st.st_size))
+    return hashlib.sha1(repr(sorted(stamps)).encode('utf-8')).hexdigest()[:12]
+
+
+def _show_lyrics_stamps(setlist_id: str) -> Optional[List]:
+    """Lyrics file identities of a show's songs, so edits to other songs keep its ETag."""
+    setlist = get_setlist_archive().get(setlist_id)
+    if setlist is None:
+        return None
+    return [[song['name'], lyrics_file_stamp(song['name'])]
+            for set_songs in setlist['sets'].values() for song in set_songs]
+
+
+# Data sources; each returns a token that changes whenever the source does
+SOURCES: Dict[str, Callable[[Dict[str, str]], object]] = {
+    "catalog": lambda params: get_catalog_cache().fingerprint,
+    "setlists": lambda params: get_setlist_archive().fingerprint,
+    "lyrics": lambda params: get_lyrics_index().fingerprint,
+    "lyrics_listing": lambda params: _dir_stamp(LYRICS_DIR),
+    "lyrics_file": lambda params: lyrics_file_stamp(params["song_name"]),
+    "show_lyrics": lambda params: _show_lyrics_stamps(params["setlist_id"]),
+    "tabs_listing": lambda params: _dir_stamp(TABS_DIR),
+}
+
+# (path pattern, sources or None to skip). The first matching pattern wins. Unmatched paths
+# (edit forms, admin) are left alone, as are routes validating themselves
+# (analytics, the show bundle).
+RULES: Sequence[Tuple[str, Optional[Tuple[str, ...]]]] = (
+    (r"/", ()),
+    (r"/api/songs/", ("catalog", "lyrics_listing", "tabs_listing")),
+    (r"/api/songs/(list|suggest|stats/overview|energy/[^/]+|horn/songs|jam/vehicles)", ("catalog",)),
+    (r"/api/songs/(?P<song_name>[^/]+)/card", ("catalog", "lyrics_listing", "tabs_listing")),
+    (r"/api/songs/(?P<song_name>[^/]+)/row", ("catalog", "lyrics_listing")),
+    (r"/api/songs/(?P<song_name>[^/]+)", ("catalog", "lyrics_listing", "tabs_listing")),
+    (r"/api/lyrics/(fetch-modal)?", ("catalog", "lyrics_listing")),
+    (r"/api/lyrics/list", ("lyrics_listing",)),
+    (r"/api/lyrics/search/[^/]+", ("lyrics",)),
+    (r"/api/lyrics/(?P<song_name>[^/]+)/navigation", ("lyrics_listing",)),
+    (r"/api/lyrics/(?P<song_name>[^/]+)(/view_partial|/fullscreen|/raw)?", ("catalog", "lyrics_file")),
+    (r"/api/setlists/", ("setlists",)),
+    (r"/api/setlists/(list|search/song/[^/]+(/stats)?)", ("setlists",)),
+    (r"/api/setlists/analytics", None),
+    (r"/api/setlists/[^/]+(/navigation|/export|/stats|/songs/[^/]+)?", ("setlists", "catalog")),
+    (r"/api/setlists/(?P<setlist_id>[^/]+)/show", ("setlists", "catalog", "show_lyrics")),
+    (r"/api/builder/", ("setlists", "catalog")),
+)
+
+
+def compile_rules(rules) -> List[Tuple[Pattern, Optional[Tuple[str, ...]]]]:
+    return [(re.compile(pattern + r"\Z"), sources) for pattern, sources in rules]
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as RFC 9110 requires for If-None-Match."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class ConditionalGetMiddleware:
+    """ASGI middleware adding ETag/Cache-Control to data-driven GETs and answering 304s."""
+
+    def __init__(self, app, rules=RULES, sources=SOURCES) -> None:
+        self.app = app
+        self.rules = compile_rules(rules)
+        self.sources = sources
+        self.deploy_token = _deploy_token()
+        self.not_modified = 0
+
+    def match(self, path: str) -> Optional[Tuple[Tuple[str, ...], Dict[str, str]]]:
+        for pattern, sources in self.rules:
+            found = pattern.match(path)
+            if found:
+                if sources is None:
+                    return None
+                return sources, {k: v for k, v in found.groupdict().items() if v is not None}
+        return None
+
+    def compute_etag(self, path: str, query: bytes, hx_request: bytes) -> Optional[str]:
+        """Weak ETag for a path, or None if no rule covers it (blocking: stats data files)."""
+        matched = self.match(path)
+        if matched is None:
+            return None
+        sources, params = matched
+        tokens = [self.deploy_token, path, query, hx_request]
+        tokens.extend(self.sources[name](params) for name in sources)
+        return 'W/"' + hashlib.sha1(repr(tokens).encode('utf-8')).hexdigest()[:20] + '"'
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        try:
+            etag = await run_blocking(self.compute_etag, scope["path"], scope.get("query_string", b""),
+                                      headers.get(b"hx-request", b""))
+        except Exception as e:
+            # Never let validation break the route itself
+            print(f"Error computing ETag for {scope['path']}: {e}")
+            etag = None
+        if etag is None:
+            await self.app(scope, receive, send)
+            return
+
+        extra = [(b"etag", etag.encode("latin-1")),
+                 (b"cache-control", CACHE_CONTROL.encode("latin-1")),
+                 (b"vary", b"HX-Request")]
+        if_none_match = headers.get(b"if-none-match")
+        if if_none_match is not None and etag_matches(if_none_match.decode("latin-1"), etag):
+            self.not_modified += 1
+            await send({"type": "http.response.start", "status": 304, "headers": extra})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                response_headers = list(message.get("headers", []))
+                names = {name.lower() for name, _ in response_headers}
+                if b"etag" not in names:
+                    for i, (name, value) in enumerate(response_headers):
+                        if name.lower() == b"vary":
+                            response_headers[i] = (name, value + b", HX-Request")
+                    response_headers.extend(header for header in extra if header[0] not in names)
+                    message = {**message, "headers": response_headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
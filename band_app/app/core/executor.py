@@ -0,0 +1,25 @@
+"""Bounded thread pool for running blocking core calls from async route handlers."""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# File reads, CSV/markdown writes and HTML parsing all share this pool. The work
+# is mostly disk I/O, during which a thread releases the GIL and waits on the SD
+# card rather than a core, so two threads per core of a Pi (four cores) keep the
+# card busy while a slow write or fetch holds a thread. More would only queue on
+# the card and the GIL; BAND_APP_IO_WORKERS overrides it for other hardware.
+BLOCKING_IO_WORKERS = int(os.getenv("BAND_APP_IO_WORKERS", "8"))
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=BLOCKING_IO_WORKERS, thread_name_prefix="band-io")
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking function on the shared pool without stalling the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_EXECUTOR, functools.partial(func, *args, **kwargs))
+
@@ -0,0 +1,130 @@
+"""Inter-process write locks and optimistic versions for data files.
+
+Several server workers can share one data directory. Every writer holds
+``file_lock(path)`` - an exclusive ``flock`` on a lock file kept outside the
+data directory - for its whole read-modify-write cycle, so writes from
+different processes run one after another instead of clobbering each other.
+
+Edits made from a form carry the version of the data they were loaded from
+(``content_version``). If the data changed in the meantime the write raises
+WriteConflict, which the API answers with 409, rather than silently losing
+the other edit.
+
+Locks are reentrant within a thread. Without fcntl (Windows) only the threads
+of one process are serialised.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# How long a writer waits for another process before giving up with a conflict
+LOCK_TIMEOUT = float(os.getenv("BCH_LOCK_TIMEOUT_SECONDS", "10"))
+# Lock files live here, one per data file, so data directories stay clean
+LOCK_DIR = Path(os.getenv("BCH_LOCK_DIR") or Path(tempfile.gettempdir()) / "band_hub_locks")
+
+_HELD = threading.local()
+_THREAD_LOCKS: Dict[str, threading.Lock] = {}
+_THREAD_LOCKS_GUARD = threading.Lock()
+
+
+class WriteConflict(Exception):
+    """The data changed since it was read, or another writer held it for too long."""
+
+
+def content_version(data: Union[str, bytes, None]) -> str:
+    """Short version token for a file's content; '' for a missing file."""
+    if data is None:
+        return ""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+def file_version(path: Union[str, Path]) -> str:
+    """``content_version`` of the file at ``path`` as it is on disk now."""
+    try:
+        with open(path, 'rb') as f:
+            return content_version(f.read())
+    except FileNotFoundError:
+        return ""
+
+
+def check_version(expected: Optional[str], current: str, what: str) -> None:
+    """Raise WriteConflict unless ``expected`` is None or still current."""
+    if expected is not None and expected != current:
+        raise WriteConflict(f"{what} was changed by someone else since you opened it; reload and try again")
+
+
+def _lock_key(target: Union[str, Path]) -> str:
+    return os.path.abspath(os.fspath(target))
+
+
+def lock_file_for(target: Union[str, Path]) -> Path:
+    digest = hashlib.sha1(_lock_key(target).encode('utf-8')).hexdigest()[:20]
+    return LOCK_DIR / f"{digest}.lock"
+
+
+def _thread_lock(key: str) -> threading.Lock:
+    with _THREAD_LOCKS_GUARD:
+        lock = _THREAD_LOCKS.get(key)
+        if lock is None:
+            lock = _THREAD_LOCKS[key] = threading.Lock()
+        return lock
+
+
+@contextmanager
+def file_lock(target: Union[str, Path], timeout: Optional[float] = None) -> Iterator[None]:
+    """Hold the exclusive write lock for ``target`` across threads and processes."""
+    key = _lock_key(target)
+    held: Dict[str, int] = getattr(_HELD, 'counts', None)
+    if held is None:
+        held = _HELD.counts = {}
+    if key in held:
+        held[key] += 1
+        try:
+            yield
+        finally:
+            held[key] -= 1
+        return
+
+    timeout = LOCK_TIMEOUT if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    thread_lock = _thread_lock(key)
+    if not thread_lock.acquire(timeout=max(0.0, timeout)):
+        raise WriteConflict(f"Timed out waiting to write {target}")
+    fd = None
+    try:
+        if fcntl is not None:
+            LOCK_DIR.mkdir(parents=True, exist_ok=True)
+            fd = os.open(lock_file_for(target), os.O_RDWR | os.O_CREAT, 0o666)
+            delay = 0.002
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise WriteConflict(f"Timed out waiting to write {target}")
+                    time.sleep(delay)
+                    delay = min(delay * 2, 0.05)
+        held[key] = 1
+        try:
+            yield
+        finally:
+            del held[key]
+    finally:
+        if fd is not None:
+            # Closing the descriptor releases the flock
+            os.close(fd)
+        thread_lock.release()
@@ -0,0 +1,306 @@
+"""Change notifications for the data directory.
+
+Songs, setlists and lyrics are often edited outside the app (Obsidian, the
+Streamlit app, a Docker bind mount). A DataWatcher follows the data directory
+with inotify via ``watchfiles`` when it is installed, or by polling
+``os.scandir`` stats in batches otherwise, and publishes typed ChangeEvents.
+The in-memory caches subscribe to the kinds they hold and, while the watcher
+runs, trust their contents instead of re-stat'ing files on every request.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from . import change_feed
+from .lyrics_manager import get_lyrics_cache, get_lyrics_index
+from .setlist_manager import get_setlist_archive
+from .song_manager import DATA_ROOT, get_catalog_cache
+
+try:
+    import watchfiles
+except ImportError:  # Optional: fall back to stat polling
+    watchfiles = None
+
+DATA_DIR = DATA_ROOT / "buckingham_conspiracy"
+# auto (inotify when available), inotify, polling or off
+WATCH_BACKEND = os.getenv("BCH_WATCH_BACKEND", "auto").lower()
+# Seconds between polling passes
+WATCH_POLL_INTERVAL = float(os.getenv("BCH_WATCH_POLL_SECONDS", "1.0"))
+# inotify events are grouped for this long before being published
+WATCH_DEBOUNCE_MS = 200
+
+# Event kinds
+CATALOG = "catalog"
+SETLIST = "setlist"
+LYRICS = "lyrics"
+TABS = "tabs"
+MIXER = "mixer"
+STAGE_PLOT = "stage_plot"
+
+# Actions
+ADDED = "added"
+MODIFIED = "modified"
+DELETED = "deleted"
+
+# Top-level data directories that are watched, and the kind of change each holds
+WATCHED_DIRS = {
+    "songlist": CATALOG,
+    "setlists": SETLIST,
+    "song_data": None,  # split into lyrics and tabs below
+    "mixer_configurations": MIXER,
+    "stage_plots": STAGE_PLOT,
+}
+
+
+class ChangeEvent(NamedTuple):
+    """One changed file. ``name`` is the song for lyrics/tabs and the venue folder for setlists."""
+    kind: str
+    action: str
+    path: str
+    name: str
+
+
+Subscriber = Callable[[List[ChangeEvent]], None]
+
+
+def classify(path: str, data_dir: Path = DATA_DIR, action: str = MODIFIED) -> Optional[ChangeEvent]:
+    """ChangeEvent for a path under the data directory, or None if nothing caches it."""
+    try:
+        parts = Path(path).relative_to(data_dir).parts
+    except ValueError:
+        return None
+    if len(parts) < 2 or any(part.startswith('.') for part in parts):
+        # Temp files from atomic writes, .DS_Store, the Genius cache
+        return None
+
+    top, name = parts[0], Path(parts[-1]).stem
+    if top == "songlist":
+        if Path(parts[-1]).suffix.lower() not in ('.csv', '.md'):
+            return None
+        return ChangeEvent(CATALOG, action, path, parts[-1])
+    if top == "setlists":
+        if len(parts) > 2 and not parts[-1].endswith('.md'):
+            return None
+        return ChangeEvent(SETLIST, action, path, parts[1])
+    if top == "song_data" and len(parts) >= 3:
+        if parts[1] == "lyrics":
+            return ChangeEvent(LYRICS, action, path, name) if parts[-1].endswith('.txt') else None
+        if parts[1] == "tabs":
+            return ChangeEvent(TABS, action, path, name)
+        return None
+    kind = WATCHED_DIRS.get(top)
+    if kind is None:
+        return None
+    return ChangeEvent(kind, action, path, name)
+
+
+def scan_stamps(roots: Iterable[Path]) -> Dict[str, Tuple[int, int]]:
+    """(mtime_ns, size) of every file below ``roots``, skipping dot entries."""
+    stamps: Dict[str, Tuple[int, int]] = {}
+    pending = [str(root) for root in roots]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file():
+                            st = entry.stat()
+                            stamps[entry.path] = (st.st_mtime_ns, st.st_size)
+                    except OSError:
+                        continue  # Vanished between listing and stat
+        except OSError:
+            continue
+    return stamps
+
+
+def diff_stamps(before: Dict[str, Tuple[int, int]],
+                after: Dict[str, Tuple[int, int]]) -> List[Tuple[str, str]]:
+    """(action, path) pairs turning ``before`` into ``after``."""
+    changes = [(DELETED, path) for path in before if path not in after]
+    for path, stamp in after.items():
+        previous = before.get(path)
+        if previous is None:
+            changes.append((ADDED, path))
+        elif previous != stamp:
+            changes.append((MODIFIED, path))
+    return changes
+
+
+class DataWatcher:
+    """Publishes ChangeEvents for the data directory from a background thread.
+
+    Subscribers get one list of events per batch (a debounced inotify burst or
+    one polling pass), filtered to the kinds they asked for, on the watcher
+    thread; they should only invalidate, not do I/O.
+    """
+
+    def __init__(self, data_dir: Path = DATA_DIR, backend: str = WATCH_BACKEND,
+                 poll_interval: float = WATCH_POLL_INTERVAL) -> None:
+        self.data_dir = Path(data_dir)
+        if backend == "auto":
+            backend = "inotify" if watchfiles is not None else "polling"
+        if backend == "inotify" and watchfiles is None:
+            print("watchfiles is not installed; watching the data directory by polling")
+            backend = "polling"
+        self.backend = backend
+        self.poll_interval = poll_interval
+        self.events_published = 0
+        self._lock = threading.Lock()
+        self._subscribers: List[Tuple[Subscriber, Optional[Set[str]]]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        """True while changes are being followed; caches only trust themselves then."""
+        return self._running
+
+    def roots(self) -> List[Path]:
+        return [self.data_dir / name for name in WATCHED_DIRS if (self.data_dir / name).is_dir()]
+
+    def subscribe(self, callback: Subscriber, kinds: Optional[Iterable[str]] = None) -> Callable[[], None]:
+        """Call ``callback`` with each batch of events of ``kinds`` (all kinds if None); returns an unsubscribe function."""
+        subscription = (callback, set(kinds) if kinds is not None else None)
+        with self._lock:
+            self._subscribers.append(subscription)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if subscription in self._subscribers:
+                    self._subscribers.remove(subscription)
+        return unsubscribe
+
+    def publish(self, events: Iterable[ChangeEvent]) -> None:
+        """Deliver a batch; one event per (kind, path), keeping the latest action."""
+        latest: Dict[Tuple[str, str], ChangeEvent] = {}
+        for event in events:
+            latest[(event.kind, event.path)] = event
+        if not latest:
+            return
+        batch = list(latest.values())
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.events_published += len(batch)
+        for callback, kinds in subscribers:
+            selected = batch if kinds is None else [e for e in batch if e.kind in kinds]
+            if not selected:
+                continue
+            try:
+                callback(selected)
+            except Exception as e:
+                # One broken subscriber must not starve the others
+                print(f"Error handling data change events: {e}")
+
+    def start(self) -> bool:
+        """Start following changes; False when disabled or already running."""
+        if self.backend == "off" or self._thread is not None:
+            return False
+        self._stop.clear()
+        if self.backend == "polling":
+            baseline = scan_stamps(self.roots())
+            target, args = self._poll_loop, (baseline,)
+        else:
+            target, args = self._inotify_loop, ()
+        self._thread = threading.Thread(target=target, args=args, name="data-watcher", daemon=True)
+        self._running = True
+        self._thread.start()
+        print(f"Watching {self.data_dir} for changes ({self.backend})")
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the watcher thread; caches go back to checking files themselves."""
+        self._running = False
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _events(self, changes: Iterable[Tuple[str, str]]) -> List[ChangeEvent]:
+        events = []
+        for action, path in changes:
+            event = classify(path, self.data_dir, action)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _poll_loop(self, stamps: Dict[str, Tuple[int, int]]) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                current = scan_stamps(self.roots())
+                self.publish(self._events(diff_stamps(stamps, current)))
+                stamps = current
+            except Exception as e:
+                print(f"Error polling data directory: {e}")
+
+    def _inotify_loop(self) -> None:
+        actions = {
+            watchfiles.Change.added: ADDED,
+            watchfiles.Change.modified: MODIFIED,
+            watchfiles.Change.deleted: DELETED,
+        }
+        roots = self.roots()
+        if not roots:
+            print(f"No data directories to watch under {self.data_dir}")
+            self._running = False
+            return
+        try:
+            for changes in watchfiles.watch(
+                    *roots, stop_event=self._stop, debounce=WATCH_DEBOUNCE_MS,
+                    rust_timeout=1000, raise_interrupt=False, ignore_permission_denied=True):
+                self.publish(self._events((actions[change], path) for change, path in changes))
+        except Exception as e:
+            print(f"Error watching data directory: {e}")
+        finally:
+            # Whatever stopped the loop, caches must stop trusting it
+            self._running = False
+
+
+_WATCHER: Optional[DataWatcher] = None
+
+
+def publish_external_changes(events: List[ChangeEvent]) -> None:
+    """Forward data edits made outside the app to the live client change feed."""
+    kinds = {event.kind for event in events}
+    if CATALOG in kinds:
+        change_feed.publish_change(change_feed.CATALOG, None, change_feed.CHANGED)
+    if SETLIST in kinds:
+        change_feed.publish_change(change_feed.SETLISTS, None, change_feed.CHANGED)
+    for event in events:
+        if event.kind == LYRICS:
+            action = change_feed.DELETED if event.action == DELETED else change_feed.SAVED
+            change_feed.publish_change(change_feed.LYRICS, event.name, action)
+
+
+def get_data_watcher() -> DataWatcher:
+    """Process-wide watcher for DATA_ROOT, with the shared caches subscribed."""
+    global _WATCHER
+    if _WATCHER is None:
+        _WATCHER = DataWatcher()
+        for cache, kinds in ((get_catalog_cache(), (CATALOG,)),
+                             (get_setlist_archive(), (SETLIST,)),
+                             (get_lyrics_index(), (LYRICS,)),
+                             (get_lyrics_cache(), (LYRICS,))):
+            cache.attach_watcher(_WATCHER)
+            _WATCHER.subscribe(cache.on_changes, kinds)
+        _WATCHER.subscribe(publish_external_changes, (CATALOG, SETLIST, LYRICS))
+    return _WATCHER
+
+
+def start_data_watcher() -> DataWatcher:
+    """Start the shared watcher (app startup)."""
+    watcher = get_data_watcher()
+    watcher.start()
+    return watcher
+
+
+def stop_data_watcher() -> None:
+    """Stop the shared watcher (app shutdown)."""
+    if _WATCHER is not None:
+        _WATCHER.stop()
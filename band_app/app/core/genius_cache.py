@@ -0,0 +1,172 @@
+"""Content-addressed on-disk cache for Genius search results and extracted lyrics.
+
+Entries are small JSON files named by the sha256 of (namespace, URL, query
+params). Only definitive answers are stored: a "no results" answer is a
+negative entry with a shorter TTL, while network errors are never cached.
+
+The app and the maintenance scripts under buckingham_conspiracy/scripts use
+the same directory. They share lyrics: both store a Genius page's lyrics under
+LYRICS_NAMESPACE, keyed by the page URL, as the raw text of its lyrics blocks
+(``<br>`` as newline, blocks joined by a blank line, stripped) or None for a
+page without lyrics. Each side cleans that text after reading it. Searches are
+not shared between the app and the scripts. The app uses Genius's public web
+search and the scripts use the token API (api.genius.com/search). The two
+endpoints answer in different shapes, so only the two scripts reuse each
+other's search entries.
+
+The module imports only the standard library and core.atomic_io (itself
+stdlib-only), so the scripts can import it without the app's dependencies;
+they pass their cache directory to ResponseCache. The app's default cache is
+built on first use by get_genius_cache().
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .atomic_io import atomic_write
+
+# Lyrics of a Genius song page, shared with the scripts (see the module docstring)
+LYRICS_NAMESPACE = "lyrics"
+# Lyrics pages and matched search hits change rarely; "no results" may be fixed upstream sooner
+GENIUS_CACHE_TTL = float(os.getenv("GENIUS_CACHE_TTL", str(30 * 24 * 3600)))
+GENIUS_CACHE_NEGATIVE_TTL = float(os.getenv("GENIUS_CACHE_NEGATIVE_TTL", str(24 * 3600)))
+GENIUS_CACHE_ENABLED = os.getenv("GENIUS_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+
+
+def cache_key(namespace: str, url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """sha256 of the namespace, URL and sorted query params."""
+    query = urllib.parse.urlencode(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return hashlib.sha256(f"{namespace}\n{url}\n{query}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """TTL cache of JSON values on disk, one file per key, with hit/miss counters."""
+
+    def __init__(self, cache_dir: Path, ttl: float = GENIUS_CACHE_TTL,
+                 negative_ttl: float = GENIUS_CACHE_NEGATIVE_TTL, enabled: bool = True) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "negative_hits": 0, "misses": 0, "expired": 0, "stores": 0, "errors": 0}
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, namespace: str, url: str,
+            params: Optional[Mapping[str, Any]] = None) -> Tuple[bool, Any]:
+        """(hit, value) for a fresh entry; (False, None) when missing, expired or unreadable."""
+        if not self.enabled:
+            return False, None
+        path = self._path(cache_key(namespace, url, params))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self._count("misses")
+            return False, None
+        except (OSError, ValueError):
+            self._count("errors")
+            self._count("misses")
+            return False, None
+
+        if entry.get("expires_at", 0) <= time.time():
+            self._count("expired")
+            self._count("misses")
+            return False, None
+        self._count("negative_hits" if entry.get("negative") else "hits")
+        return True, entry.get("value")
+
+    def put(self, namespace: str, url: str, value: Any,
+            params: Optional[Mapping[str, Any]] = None, negative: bool = False) -> None:
+        """Store a JSON-serialisable value; negative entries get the shorter TTL."""
+        if not self.enabled:
+            return
+        path = self._path(cache_key(namespace, url, params))
+        now = time.time()
+        entry = {
+            "namespace": namespace,
+            "url": url,
+            "params": dict(params or {}),
+            "negative": negative,
+            "stored_at": now,
+            "expires_at": now + (self.negative_ttl if negative else self.ttl),
+            "value": value,
+        }
+        try:
+            atomic_write(path, json.dumps(entry, ensure_ascii=False))
+            self._count("stores")
+        except (OSError, TypeError, ValueError) as e:
+            # A cache that cannot write must never break a lyrics fetch
+            self._count("errors")
+            print(f"Genius cache write failed for {url}: {e}")
+
+    def prune(self) -> int:
+        """Delete expired or unreadable entries; returns how many were removed."""
+        removed = 0
+        now = time.time()
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    expired = json.load(f).get("expires_at", 0) <= now
+            except (OSError, ValueError):
+                expired = True
+            if expired:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters since start-up plus the hit ratio."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+        lookups = stats["hits"] + stats["negative_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["hits"] + stats["negative_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def summary(self) -> str:
+        """One-line counter summary for script output and logs."""
+        s = self.stats()
+        return (f"Genius cache: {s['hits']} hits, {s['negative_hits']} negative hits, "
+                f"{s['misses']} misses, {s['stores']} stored")
+
+
+_GENIUS_CACHE: Optional[ResponseCache] = None
+_GENIUS_CACHE_LOCK = threading.Lock()
+
+
+def default_cache_dir() -> Path:
+    """GENIUS_CACHE_DIR, else .cache/genius beside the band's data (where the scripts look too)."""
+    if os.getenv("GENIUS_CACHE_DIR"):
+        return Path(os.environ["GENIUS_CACHE_DIR"])
+    # Imported here so scripts that only construct a ResponseCache never load the app's catalog
+    from .song_manager import DATA_ROOT
+    return DATA_ROOT / "buckingham_conspiracy" / ".cache" / "genius"
+
+
+def get_genius_cache() -> ResponseCache:
+    """Process-wide Genius cache of the app."""
+    global _GENIUS_CACHE
+    if _GENIUS_CACHE is None:
+        with _GENIUS_CACHE_LOCK:
+            if _GENIUS_CACHE is None:
+                _GENIUS_CACHE = ResponseCache(default_cache_dir(), enabled=GENIUS_CACHE_ENABLED)
+    return _GENIUS_CACHE
+
+
+def set_genius_cache(cache: Optional[ResponseCache]) -> Optional[ResponseCache]:
+    """Replace the process-wide cache and return the previous one (tests use a temp dir; None rebuilds the default)."""
+    global _GENIUS_CACHE
+    previous, _GENIUS_CACHE = _GENIUS_CACHE, cache
+    return previous
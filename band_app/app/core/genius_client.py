@@ -0,0 +1,226 @@
+"""Pooled async HTTP client for Genius with rate limiting, per-host limits and retries.
+
+One client runs on a dedicated event-loop thread so the connection pool, the
+rate limiter and the per-host limits are shared by the whole server process:
+async route handlers and the sync fetch_lyrics_online() facade go through the
+same keep-alive connections. The maintenance scripts under
+buckingham_conspiracy/scripts run as separate processes with their own
+``requests`` sessions and don't use this client.
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import random
+import threading
+import time
+import urllib.parse
+from typing import Any, Coroutine, Dict, Optional, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+REQUEST_TIMEOUT = 12
+
+# Overall budget for one lookup (search + lyrics page), retries included
+FETCH_DEADLINE = float(os.getenv("GENIUS_FETCH_DEADLINE", "25"))
+GENIUS_RATE_PER_SECOND = float(os.getenv("GENIUS_RATE_PER_SECOND", "5"))
+GENIUS_RATE_BURST = int(os.getenv("GENIUS_RATE_BURST", "5"))
+GENIUS_PER_HOST_LIMIT = int(os.getenv("GENIUS_PER_HOST_LIMIT", "4"))
+GENIUS_MAX_ATTEMPTS = int(os.getenv("GENIUS_MAX_ATTEMPTS", "3"))
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class GeniusRequestError(Exception):
+    """A Genius request failed after retries or ran out of deadline."""
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, holding at most ``capacity``."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, deadline: Optional[float] = None) -> None:
+        """Wait for a token; raise GeniusRequestError if it would arrive after ``deadline``."""
+        if self.rate <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    raise GeniusRequestError("Rate limit wait exceeds the request deadline")
+                await asyncio.sleep(wait)
+                self._refill()
+            self._tokens -= 1
+
+
+class GeniusClient:
+    """Async client with a shared connection pool.
+
+    Must be used from a single event loop (see ``run_on_client_loop``).
+    """
+
+    def __init__(
+        self,
+        *,
+        rate_per_second: float = GENIUS_RATE_PER_SECOND,
+        burst: int = GENIUS_RATE_BURST,
+        per_host_limit: int = GENIUS_PER_HOST_LIMIT,
+        max_attempts: int = GENIUS_MAX_ATTEMPTS,
+        backoff_base: float = 0.25,
+        backoff_cap: float = 4.0,
+        request_timeout: float = REQUEST_TIMEOUT,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.per_host_limit = per_host_limit
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.request_timeout = request_timeout
+        self._bucket = TokenBucket(rate_per_second, burst)
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=8, keepalive_expiry=30),
+            transport=transport,
+        )
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urllib.parse.urlsplit(url).netloc
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return limit
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (0-based) attempt."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    async def get(self, url: str, *, deadline: float, headers: Optional[Dict[str, str]] = None,
+                  params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        """GET with retries on transport errors and 429/5xx, bounded by ``deadline`` (monotonic)."""
+        last_error: Optional[str] = None
+        for attempt in range(self.max_attempts):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await self._bucket.acquire(deadline)
+            try:
+                async with self._host_limit(url):
+                    self.stats["requests"] += 1
+                    resp = await self._client.get(
+                        url, headers=headers, params=params,
+                        timeout=min(self.request_timeout, max(0.1, deadline - time.monotonic())),
+                    )
+                if resp.status_code not in RETRY_STATUS_CODES:
+                    return resp
+                last_error = f"HTTP {resp.status_code}"
+                delay = self._backoff(attempt)
+                retry_after = resp.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+            except httpx.TransportError as e:
+                last_error = f"{type(e).__name__}: {e}"
+                delay = self._backoff(attempt)
+
+            if attempt + 1 >= self.max_attempts or time.monotonic() + delay >= deadline:
+                break
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+        self.stats["failures"] += 1
+        raise GeniusRequestError(f"GET {url} failed: {last_error or 'deadline exceeded'}")
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def deadline_in(seconds: float = FETCH_DEADLINE) -> float:
+    """Monotonic deadline ``seconds`` from now."""
+    return time.monotonic() + seconds
+
+
+class _ClientLoop:
+    """Background event loop that owns the process-wide GeniusClient."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[GeniusClient] = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="genius-client", daemon=True)
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+    def client(self) -> GeniusClient:
+        """The shared client; only call from coroutines running on this loop."""
+        with self._lock:
+            if self._client is None:
+                self._client = GeniusClient()
+            return self._client
+
+    def set_client(self, client: Optional[GeniusClient]) -> Optional[GeniusClient]:
+        """Swap the shared client (tests use this to target a stand-in server)."""
+        with self._lock:
+            previous, self._client = self._client, client
+            return previous
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+
+_CLIENT_LOOP = _ClientLoop()
+
+
+def get_genius_client() -> GeniusClient:
+    """Shared client; valid only inside coroutines passed to run_on_client_loop()."""
+    return _CLIENT_LOOP.client()
+
+
+def set_genius_client(client: Optional[GeniusClient]) -> Optional[GeniusClient]:
+    """Replace the shared client and return the previous one (not closed)."""
+    return _CLIENT_LOOP.set_client(client)
+
+
+async def run_on_client_loop(coro: Coroutine[Any, Any, T]) -> T:
+    """Await a coroutine on the client's loop from any other event loop."""
+    return await asyncio.wrap_future(_CLIENT_LOOP.submit(coro))
+
+
+def run_on_client_loop_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the client's loop and block until it finishes."""
+    return _CLIENT_LOOP.submit(coro).result()
+
+
+async def close_genius_client() -> None:
+    """Close the shared client's connections; a fresh client is created on next use."""
+    client = set_genius_client(None)
+    if client is not None:
+        await run_on_client_loop(client.aclose())
@@ -0,0 +1,379 @@
+"""Background job runner for admin scripts.
+
+Jobs run as asyncio subprocesses on the server's event loop, so a ten-minute
+artist update neither blocks request handling nor ties up an I/O pool thread.
+Each job gets an id, moves through queued -> running -> succeeded / failed /
+cancelled, and keeps the tail of its combined stdout/stderr.
+
+With several server workers a status poll or cancel can reach a different
+process than the one running the job, so every job's state is also written to
+a small JSON file under the lock directory (core.file_locks). Other workers
+answer status queries from that file and cancel by leaving a marker file that
+the owning worker picks up. The concurrency limit is held with ``flock`` slot
+files, so it applies across all workers rather than per process.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from .atomic_io import temp_path_for
+from .file_locks import LOCK_DIR
+
+# Admin scripts hit the network and rewrite data files; run them one at a time by default
+MAX_CONCURRENT_JOBS = int(os.getenv("BAND_APP_MAX_JOBS", "1"))
+# Finished jobs kept for status queries
+JOB_HISTORY_LIMIT = 50
+# Output lines kept per job
+JOB_OUTPUT_LINES = 500
+# Longest single output line accepted from a script
+JOB_LINE_LIMIT = 1024 * 1024
+# Grace period between terminate and kill when cancelling
+JOB_TERMINATE_GRACE = 5.0
+# Shared job state, readable by every server worker
+JOB_STATE_DIR = LOCK_DIR / "jobs"
+# How often a running job's output is written to its state file, and how often
+# workers look for cancel markers and free slots
+JOB_SYNC_INTERVAL = 0.5
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class Job:
+    """One admin command and its progress."""
+
+    def __init__(self, name: str, command: Sequence[str], timeout: Optional[float]) -> None:
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.command = list(command)
+        self.timeout = timeout
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.returncode: Optional[int] = None
+        self.error: Optional[str] = None
+        self.output: Deque[str] = deque(maxlen=JOB_OUTPUT_LINES)
+        self.owner_pid = os.getpid()
+        self._lines = 0
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        """Read-only copy of a job from its state file (possibly another worker's)."""
+        job = cls(data["name"], data["command"], data.get("timeout"))
+        job.id = data["id"]
+        for field in ("status", "created_at", "started_at", "finished_at", "returncode", "error"):
+            setattr(job, field, data.get(field))
+        job.owner_pid = data.get("owner_pid")
+        job.output.extend(data.get("output", []))
+        return job
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def to_dict(self, include_output: bool = False) -> Dict[str, Any]:
+        """JSON-friendly view of the job."""
+        end = self.finished_at or time.time()
+        data: Dict[str, Any] = {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "command": self.command,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_seconds": round(end - self.started_at, 3) if self.started_at else None,
+            "returncode": self.returncode,
+            "error": self.error,
+        }
+        if include_output:
+            data["output"] = list(self.output)
+        return data
+
+    def state(self) -> Dict[str, Any]:
+        """Everything ``from_dict`` needs, for the shared state file."""
+        data = self.to_dict(include_output=True)
+        data["timeout"] = self.timeout
+        data["owner_pid"] = self.owner_pid
+        return data
+
+
+class JobManager:
+    """Queues jobs and runs up to ``max_concurrent`` of them as subprocesses."""
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_JOBS, history_limit: int = JOB_HISTORY_LIMIT,
+                 state_dir: Path = JOB_STATE_DIR) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self.history_limit = history_limit
+        self.state_dir = Path(state_dir)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def submit(self, name: str, command: Sequence[str], timeout: Optional[float] = None) -> Job:
+        """Queue a command; must be called from the event loop that will run it."""
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            # asyncio primitives are bound to one loop (tests start a fresh one per client)
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+            self._loop = loop
+        job = Job(name, command, timeout)
+        self._jobs[job.id] = job
+        self._trim_history()
+        self._save(job)
+        job._task = asyncio.create_task(self._run(job))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """This worker's job, or a snapshot of another worker's from its state file."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            job = self._load(job_id)
+        return job
+
+    def list_jobs(self) -> List[Job]:
+        """Jobs of every worker, newest first."""
+        jobs = {job.id: job for job in self._load_all()}
+        jobs.update(self._jobs)
+        newest = sorted(jobs.values(), key=lambda job: job.created_at, reverse=True)
+        return newest[:max(self.history_limit, len(self._jobs))]
+
+    async def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; False if unknown or already finished."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return await self._cancel_remote(job_id)
+        if job.finished or job._task is None:
+            return False
+        job._task.cancel()
+        try:
+            await job._task
+        except asyncio.CancelledError:
+            pass
+        return True
+
+    async def _cancel_remote(self, job_id: str) -> bool:
+        """Ask the worker that owns ``job_id`` to cancel it, and wait until it has."""
+        job = self._load(job_id)
+        if job is None or job.finished:
+            return False
+        try:
+            self._marker(job_id).touch()
+        except OSError:
+            return False
+        deadline = time.monotonic() + JOB_TERMINATE_GRACE + 2 * JOB_SYNC_INTERVAL + 1
+        while time.monotonic() < deadline:
+            await asyncio.sleep(JOB_SYNC_INTERVAL / 2)
+            job = self._load(job_id)
+            if job is None or job.finished:
+                break
+        return True
+
+    async def wait(self, job_id: str) -> Optional[Job]:
+        """Wait for a job to finish."""
+        job = self._jobs.get(job_id)
+        if job is not None and job._task is not None:
+            await asyncio.wait({job._task})
+        return job
+
+    async def shutdown(self) -> None:
+        """Cancel everything still queued or running (app shutdown)."""
+        for job in list(self._jobs.values()):
+            if not job.finished:
+                await self.cancel(job.id)
+
+    def _trim_history(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(self._jobs) - self.history_limit)]:
+            del self._jobs[job_id]
+            self._forget(job_id)
+        # State files outlive the worker that wrote them; keep the newest across all workers
+        others = sorted(self._load_all(), key=lambda job: job.created_at, reverse=True)
+        for job in others[self.history_limit:]:
+            if job.finished:
+                self._forget(job.id)
+
+    def _forget(self, job_id: str) -> None:
+        for path in (self._state_path(job_id), self._marker(job_id)):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _state_path(self, job_id: str) -> Path:
+        return self.state_dir / f"{job_id}.json"
+
+    def _marker(self, job_id: str) -> Path:
+        return self.state_dir / f"{job_id}.cancel"
+
+    def _save(self, job: Job) -> None:
+        """Publish the job's state to the other workers (scratch data: no fsync)."""
+        target = self._state_path(job.id)
+        try:
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = temp_path_for(target)
+            tmp_path.write_text(json.dumps(job.state()), encoding="utf-8")
+            os.replace(tmp_path, target)
+        except OSError as e:
+            print(f"Could not save state of job {job.id}: {e}")
+
+    def _load(self, job_id: str) -> Optional[Job]:
+        if not job_id.isalnum():
+            return None
+        try:
+            job = Job.from_dict(json.loads(self._state_path(job_id).read_text(encoding="utf-8")))
+        except (OSError, ValueError, KeyError):
+            return None
+        if not job.finished and not _process_alive(job.owner_pid):
+            # The worker that ran it exited without finishing it (crash, kill -9)
+            job.status = FAILED
+            job.error = "Server worker running this job exited"
+        return job
+
+    def _load_all(self) -> List[Job]:
+        try:
+            paths = list(self.state_dir.glob("*.json"))
+        except OSError:
+            return []
+        jobs = (self._load(path.stem) for path in paths if path.stem not in self._jobs)
+        return [job for job in jobs if job is not None]
+
+    async def _sync(self, job: Job) -> None:
+        """Write the job's state periodically and cancel it when another worker asks to."""
+        marker = self._marker(job.id)
+        saved = (job.status, job._lines)
+        while True:
+            await asyncio.sleep(JOB_SYNC_INTERVAL)
+            if marker.exists() and job._task is not None:
+                job._task.cancel()
+                return
+            if (job.status, job._lines) != saved:
+                saved = (job.status, job._lines)
+                self._save(job)
+
+    async def _acquire_slot(self) -> Optional[int]:
+        """Hold one of ``max_concurrent`` slot files shared by every worker; returns its fd."""
+        if fcntl is None:
+            return None
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        while True:
+            for slot in range(self.max_concurrent):
+                fd = os.open(self.state_dir / f"slot-{slot}.lock", os.O_RDWR | os.O_CREAT, 0o666)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return fd
+                except BlockingIOError:
+                    os.close(fd)
+            await asyncio.sleep(JOB_SYNC_INTERVAL)
+
+    async def _run(self, job: Job) -> None:
+        sync = asyncio.create_task(self._sync(job))
+        slot_fd: Optional[int] = None
+        try:
+            async with self._slots:
+                slot_fd = await self._acquire_slot()
+                job.status = RUNNING
+                job.started_at = time.time()
+                self._save(job)
+                job._process = await asyncio.create_subprocess_exec(
+                    *job.command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    limit=JOB_LINE_LIMIT,
+                )
+                try:
+                    await asyncio.wait_for(self._collect(job), timeout=job.timeout)
+                except asyncio.TimeoutError:
+                    await self._stop(job)
+                    job.status = FAILED
+                    job.error = f"Timed out after {job.timeout:g}s"
+                    return
+                job.returncode = job._process.returncode
+                job.status = SUCCEEDED if job.returncode == 0 else FAILED
+                if job.status == FAILED:
+                    job.error = f"Exited with code {job.returncode}"
+        except asyncio.CancelledError:
+            await self._stop(job)
+            job.status = CANCELLED
+            job.error = "Cancelled"
+        except Exception as e:
+            job.status = FAILED
+            job.error = f"Error running job: {e}"
+        finally:
+            sync.cancel()
+            if slot_fd is not None:
+                # Closing the descriptor releases the flock
+                os.close(slot_fd)
+            job.finished_at = time.time()
+            if job._process is not None:
+                job.returncode = job._process.returncode
+            job._process = None
+            self._save(job)
+            try:
+                self._marker(job.id).unlink()
+            except OSError:
+                pass
+            print(f"Job {job.id} ({job.name}) {job.status}")
+
+    async def _collect(self, job: Job) -> None:
+        assert job._process is not None and job._process.stdout is not None
+        async for raw_line in job._process.stdout:
+            job.output.append(raw_line.decode("utf-8", errors="replace").rstrip("\n"))
+            job._lines += 1
+        await job._process.wait()
+
+    async def _stop(self, job: Job) -> None:
+        process = job._process
+        if process is None or process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), timeout=JOB_TERMINATE_GRACE)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+
+def _process_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def python_command(script_path: Union[str, Path], *args: str) -> List[str]:
+    """Command line running a script with the server's interpreter."""
+    return [sys.executable, str(script_path), *args]
+
+
+_JOB_MANAGER = JobManager()
+
+
+def get_job_manager() -> JobManager:
+    """This worker's job manager (it sees every worker's jobs)."""
+    return _JOB_MANAGER
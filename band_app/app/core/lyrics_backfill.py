@@ -0,0 +1,69 @@
+"""Concurrent bulk fetch of lyrics for catalog songs that have no lyrics file yet."""
+
+import asyncio
+import os
+from typing import AsyncIterator, Dict, Mapping
+
+from .executor import run_blocking
+from .lyrics_fetcher import fetch_lyrics_online_async
+from .lyrics_manager import load_available_lyrics, save_lyrics_content
+from .song_manager import get_song_catalog
+
+# Songs fetched at once; the Genius client's rate limiter still applies on top
+BACKFILL_CONCURRENCY = int(os.getenv("BCH_BACKFILL_CONCURRENCY", "6"))
+
+
+def find_songs_missing_lyrics() -> Dict[str, Mapping]:
+    """Catalog songs (title -> catalog info) without a lyrics file."""
+    available = set(load_available_lyrics())
+    return {
+        name: info for name, info in get_song_catalog().items()
+        if name not in available
+    }
+
+
+async def _backfill_one(title: str, artist: str, limit: asyncio.Semaphore) -> Dict:
+    async with limit:
+        event = {'event': 'song', 'song': title, 'matched_title': '', 'source_url': '', 'error': None}
+        try:
+            res = await fetch_lyrics_online_async(title, artist)
+        except Exception as e:
+            return {**event, 'status': 'error', 'error': str(e)}
+
+        event.update(matched_title=res.get('matched_title', ''), source_url=res.get('source_url', ''))
+        if not res.get('success') or not res.get('lyrics'):
+            return {**event, 'status': 'not_found', 'error': res.get('error')}
+
+        try:
+            # Never clobber lyrics that were saved by hand while the backfill ran
+            saved = await run_blocking(save_lyrics_content, title, res['lyrics'], overwrite=False)
+        except Exception as e:
+            return {**event, 'status': 'error', 'error': str(e)}
+        return {**event, 'status': 'saved' if saved else 'skipped'}
+
+
+async def backfill_lyrics(songs: Mapping[str, Mapping],
+                          concurrency: int = BACKFILL_CONCURRENCY) -> AsyncIterator[Dict]:
+    """Fetch lyrics for ``songs`` with bounded parallelism, yielding progress events.
+
+    Yields one 'start' event, one 'song' event per song in completion order
+    (status: saved, skipped, not_found or error), then a 'complete' summary.
+    Pending fetches are cancelled if the consumer stops early.
+    """
+    total = len(songs)
+    limit = asyncio.Semaphore(max(1, concurrency))
+    tasks = [
+        asyncio.ensure_future(_backfill_one(title, (info.get('artist') or '').strip(), limit))
+        for title, info in songs.items()
+    ]
+    counts = {'saved': 0, 'skipped': 0, 'not_found': 0, 'error': 0}
+    try:
+        yield {'event': 'start', 'total': total}
+        for done, next_result in enumerate(asyncio.as_completed(tasks), 1):
+            result = await next_result
+            counts[result['status']] += 1
+            yield {**result, 'done': done, 'total': total}
+        yield {'event': 'complete', 'total': total, **counts}
+    finally:
+        for task in tasks:
+            task.cancel()
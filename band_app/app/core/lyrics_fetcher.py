@@ -4,19 +4,21 @@ from __future__ import annotations
 
 import os
 import re
-import urllib.parse
-from typing import Dict, Optional, Tuple, Any
-import requests
+from typing import Callable, Dict, Optional, Tuple, Any
 from bs4 import BeautifulSoup
 
+from .executor import run_blocking
+from .genius_cache import LYRICS_NAMESPACE, get_genius_cache
+from .genius_client import (
+    GeniusClient,
+    deadline_in,
+    get_genius_client,
+    run_on_client_loop,
+    run_on_client_loop_sync,
+)
+
 GENIUS_API_BASE = "https://api.genius.com"
 GENIUS_SEARCH_URL = "https://genius.com/api/search/multi"
-USER_AGENT = (
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/120.0.0.0 Safari/537.36"
-)
-REQUEST_TIMEOUT = 12
 
 
 def clean_scraped_lyrics(raw_lyrics: str) -> str:
@@ -57,94 +59,143 @@ def clean_scraped_lyrics(raw_lyrics: str) -> str:
     return "\n".join(cleaned_lines).strip()
 
 
-def search_genius_song_url(title: str, artist: str = "") -> Optional[Tuple[str, str, str]]:
-    """Search Genius for a song URL. Returns (song_url, matched_title, matched_artist) or None."""
-    query = f"{title} {artist}".strip()
-    headers = {"User-Agent": USER_AGENT, "Accept": "application/json"}
-    
+def genius_search_query(title: str, artist: str = "") -> str:
+    """Search string sent to Genius for a title/artist pair."""
+    return f"{title} {artist}".strip()
+
+
+def pick_api_search_hit(data: Dict, title: str, artist: str) -> Optional[Tuple[str, str, str]]:
+    """Best hit from an authenticated API search response."""
+    hits = data.get("response", {}).get("hits", [])
+    if hits:
+        hit = hits[0].get("result", {})
+        return hit.get("url"), hit.get("title", title), hit.get("primary_artist", {}).get("name", artist)
+    return None
+
+
+def pick_public_search_hit(data: Dict, title: str, artist: str) -> Optional[Tuple[str, str, str]]:
+    """Best song hit from a public multi-search response."""
+    sections = data.get("response", {}).get("sections", [])
+    for sec in sections:
+        if sec.get("type") == "song":
+            hits = sec.get("hits", [])
+            if hits:
+                hit = hits[0].get("result", {})
+                return hit.get("url"), hit.get("title", title), hit.get("primary_artist", {}).get("name", artist)
+    return None
+
+
+async def _cached_search(client: GeniusClient, url: str, params: Dict[str, Any],
+                         headers: Dict[str, str], deadline: float,
+                         pick: Callable[[Dict], Optional[Tuple[str, str, str]]]) -> Optional[Tuple[str, str, str]]:
+    """Run one search through the cache; 200 responses are stored, hitless ones as negative entries."""
+    cache = get_genius_cache()
+    cached, data = await run_blocking(cache.get, "search", url, params)
+    if not cached:
+        resp = await client.get(url, deadline=deadline, headers=headers, params=params)
+        if resp.status_code != 200:
+            return None
+        data = resp.json()
+        await run_blocking(cache.put, "search", url, data, params, negative=pick(data) is None)
+    return pick(data)
+
+
+async def _search_genius(client: GeniusClient, title: str, artist: str,
+                         deadline: float) -> Optional[Tuple[str, str, str]]:
+    """Search Genius through the pooled client (authenticated API first, then public search)."""
+    query = genius_search_query(title, artist)
+    headers = {"Accept": "application/json"}
+
     # 1. Try authenticated API if token exists
     token = os.getenv("GENIUS_ACCESS_TOKEN")
     if token:
         try:
-            auth_headers = {**headers, "Authorization": f"Bearer {token}"}
-            resp = requests.get(
-                f"{GENIUS_API_BASE}/search",
-                headers=auth_headers,
-                params={"q": query},
-                timeout=REQUEST_TIMEOUT
+            hit = await _cached_search(
+                client, f"{GENIUS_API_BASE}/search", {"q": query},
+                {**headers, "Authorization": f"Bearer {token}"}, deadline,
+                lambda data: pick_api_search_hit(data, title, artist),
             )
-            if resp.status_code == 200:
-                hits = resp.json().get("response", {}).get("hits", [])
-                if hits:
-                    hit = hits[0].get("result", {})
-                    return hit.get("url"), hit.get("title", title), hit.get("primary_artist", {}).get("name", artist)
+            if hit:
+                return hit
         except Exception:
             pass
 
     # 2. Fall back to public search endpoint
     try:
-        url = f"{GENIUS_SEARCH_URL}?per_page=5&q={urllib.parse.quote(query)}"
-        resp = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-        if resp.status_code == 200:
-            data = resp.json()
-            sections = data.get("response", {}).get("sections", [])
-            for sec in sections:
-                if sec.get("type") == "song":
-                    hits = sec.get("hits", [])
-                    if hits:
-                        hit = hits[0].get("result", {})
-                        return hit.get("url"), hit.get("title", title), hit.get("primary_artist", {}).get("name", artist)
+        hit = await _cached_search(
+            client, GENIUS_SEARCH_URL, {"per_page": 5, "q": query}, headers, deadline,
+            lambda data: pick_public_search_hit(data, title, artist),
+        )
+        if hit:
+            return hit
     except Exception as e:
         print(f"Genius public search error for '{query}': {e}")
 
     return None
 
 
-def fetch_lyrics_from_url(url: str) -> Optional[str]:
-    """Download HTML from Genius song page and extract lyrics."""
-    headers = {"User-Agent": USER_AGENT, "Accept": "text/html"}
-    try:
-        resp = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
+def extract_raw_lyrics(page_html: str) -> Optional[str]:
+    """Raw text of a Genius song page's lyrics blocks, as cached under LYRICS_NAMESPACE."""
+    soup = BeautifulSoup(page_html, "html.parser")
 
-        containers = soup.select("div[data-lyrics-container='true']")
-        if not containers:
-            legacy = soup.select_one("div.lyrics")
-            if legacy:
-                containers = [legacy]
+    containers = soup.select("div[data-lyrics-container='true']")
+    if not containers:
+        legacy = soup.select_one("div.lyrics")
+        if legacy:
+            containers = [legacy]
+
+    if not containers:
+        return None
+
+    chunks = []
+    for container in containers:
+        for br in container.find_all("br"):
+            br.replace_with("\n")
+        text = container.get_text().strip()
+        if text:
+            chunks.append(text)
+
+    return "\n\n".join(chunks).strip() or None
 
-        if not containers:
-            return None
 
-        chunks = []
-        for container in containers:
-            for br in container.find_all("br"):
-                br.replace_with("\n")
-            text = container.get_text().strip()
-            if text:
-                chunks.append(text)
+def extract_lyrics_from_html(page_html: str) -> Optional[str]:
+    """Pull the lyrics text out of a Genius song page."""
+    raw_lyrics = extract_raw_lyrics(page_html)
+    return clean_scraped_lyrics(raw_lyrics) if raw_lyrics else None
 
-        raw_lyrics = "\n\n".join(chunks).strip()
-        return clean_scraped_lyrics(raw_lyrics)
+
+async def _fetch_lyrics_page(client: GeniusClient, url: str, deadline: float) -> Optional[str]:
+    """Download a Genius song page (or reuse cached lyrics); HTML parsing runs on the I/O pool."""
+    cache = get_genius_cache()
+    try:
+        cached, raw_lyrics = await run_blocking(cache.get, LYRICS_NAMESPACE, url)
+        if not cached:
+            resp = await client.get(url, deadline=deadline, headers={"Accept": "text/html"})
+            resp.raise_for_status()
+            raw_lyrics = await run_blocking(extract_raw_lyrics, resp.text)
+            # Pages without a lyrics block (instrumentals, stubs) are cached as negative entries
+            await run_blocking(cache.put, LYRICS_NAMESPACE, url, raw_lyrics, negative=not raw_lyrics)
+        return clean_scraped_lyrics(raw_lyrics) if raw_lyrics else None
     except Exception as e:
         print(f"Error fetching lyrics from URL {url}: {e}")
         return None
 
 
-def fetch_lyrics_online(title: str, artist: str = "") -> Dict[str, Any]:
-    """High-level function to fetch lyrics for a song title & artist.
-    Returns:
-        {
-            'success': bool,
-            'lyrics': str,
-            'matched_title': str,
-            'matched_artist': str,
-            'source_url': str,
-            'error': str or None
-        }
-    """
-    search_res = search_genius_song_url(title, artist)
+async def _fetch_lyrics(title: str, artist: str) -> Dict[str, Any]:
+    """Search and page fetch sharing one deadline."""
+    client = get_genius_client()
+    deadline = deadline_in()
+    search_res = await _search_genius(client, title, artist, deadline)
+    lyrics = None
+    if search_res and search_res[0]:
+        lyrics = await _fetch_lyrics_page(client, search_res[0], deadline)
+    return build_fetch_result(title, artist, search_res, lyrics)
+
+
+def build_fetch_result(title: str, artist: str,
+                       search_res: Optional[Tuple[str, str, str]],
+                       lyrics: Optional[str]) -> Dict[str, Any]:
+    """Shape search and page results into the fetch_lyrics_online() dict."""
     if not search_res or not search_res[0]:
         return {
             'success': False,
@@ -156,7 +207,6 @@ def fetch_lyrics_online(title: str, artist: str = "") -> Dict[str, Any]:
         }
 
     url, matched_title, matched_artist = search_res
-    lyrics = fetch_lyrics_from_url(url)
     if not lyrics:
         return {
             'success': False,
@@ -175,3 +225,37 @@ def fetch_lyrics_online(title: str, artist: str = "") -> Dict[str, Any]:
         'source_url': url,
         'error': None
     }
+
+
+def search_genius_song_url(title: str, artist: str = "") -> Optional[Tuple[str, str, str]]:
+    """Search Genius for a song URL. Returns (song_url, matched_title, matched_artist) or None."""
+    async def search():
+        return await _search_genius(get_genius_client(), title, artist, deadline_in())
+    return run_on_client_loop_sync(search())
+
+
+def fetch_lyrics_from_url(url: str) -> Optional[str]:
+    """Download HTML from Genius song page and extract lyrics."""
+    async def fetch():
+        return await _fetch_lyrics_page(get_genius_client(), url, deadline_in())
+    return run_on_client_loop_sync(fetch())
+
+
+def fetch_lyrics_online(title: str, artist: str = "") -> Dict[str, Any]:
+    """High-level function to fetch lyrics for a song title & artist.
+    Returns:
+        {
+            'success': bool,
+            'lyrics': str,
+            'matched_title': str,
+            'matched_artist': str,
+            'source_url': str,
+            'error': str or None
+        }
+    """
+    return run_on_client_loop_sync(_fetch_lyrics(title, artist))
+
+
+async def fetch_lyrics_online_async(title: str, artist: str = "") -> Dict[str, Any]:
+    """Async variant of fetch_lyrics_online() with the same result dict."""
+    return await run_on_client_loop(_fetch_lyrics(title, artist))
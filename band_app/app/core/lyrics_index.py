@@ -0,0 +1,209 @@
+"""Inverted full-text index over the lyrics directory."""
+
+import hashlib
+import math
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+# How long a scan of the lyrics directory is trusted before files are re-stat'ed
+LYRICS_RESCAN_INTERVAL = float(os.getenv("BCH_LYRICS_RESCAN_SECONDS", "2.0"))
+
+# Maximum number of matching lines returned per song
+MAX_SNIPPETS = 3
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z0-9]+)*")
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; curly apostrophes are folded so "don’t" == "don't"."""
+    return TOKEN_PATTERN.findall(text.lower().replace('’', "'"))
+
+
+def parse_query(query: str) -> List[List[str]]:
+    """Split a query into clauses. Each clause is a token sequence that must appear
+    contiguously; bare words become single-token clauses, "quoted text" a phrase."""
+    clauses: List[List[str]] = []
+    for phrase, word in QUERY_PATTERN.findall(query):
+        tokens = tokenize(phrase if phrase else word)
+        if tokens:
+            clauses.append(tokens)
+    return clauses
+
+
+class LyricsIndex:
+    """Token -> {song: [(line_no, position), ...]} postings for every lyrics file.
+
+    Files are re-read only when their (mtime_ns, size) changes, so query cost
+    depends on the postings touched rather than on the size of the corpus.
+    """
+
+    def __init__(self, lyrics_dir: Path) -> None:
+        self.lyrics_dir = lyrics_dir
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[str, List[Tuple[int, int]]]] = {}
+        self._documents: Dict[str, Tuple[Tuple[int, int], List[str], Set[str]]] = {}
+        self._last_scan: Optional[float] = None
+        self._version = 0
+        self._fingerprint = ""
+        self._watcher = None
+
+    def _remove_document(self, song_name: str) -> None:
+        _, _, tokens = self._documents.pop(song_name)
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(song_name, None)
+            if not postings:
+                del self._postings[token]
+
+    def _add_document(self, song_name: str, stamp: Tuple[int, int], path: str) -> None:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        lines = content.replace('\r\n', '\n').replace('\r', '\n').replace('\xa0', ' ').split('\n')
+
+        position = 0
+        seen_tokens: Set[str] = set()
+        for line_no, line in enumerate(lines):
+            for token in tokenize(line):
+                self._postings.setdefault(token, {}).setdefault(song_name, []).append((line_no, position))
+                seen_tokens.add(token)
+                position += 1
+        self._documents[song_name] = (stamp, lines, seen_tokens)
+
+    def _scan(self) -> None:
+        seen: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        if self.lyrics_dir.exists():
+            with os.scandir(self.lyrics_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.txt') and entry.is_file():
+                        st = entry.stat()
+                        seen[entry.name[:-4]] = ((st.st_mtime_ns, st.st_size), entry.path)
+
+        changed = False
+        for song_name in list(self._documents):
+            if song_name not in seen:
+                self._remove_document(song_name)
+                changed = True
+
+        for song_name, (stamp, path) in seen.items():
+            cached = self._documents.get(song_name)
+            if cached and cached[0] == stamp:
+                continue
+            if cached:
+                self._remove_document(song_name)
+            self._add_document(song_name, stamp, path)
+            changed = True
+
+        if changed:
+            stamps = sorted((song_name, document[0]) for song_name, document in self._documents.items())
+            self._fingerprint = hashlib.sha1(repr(stamps).encode('utf-8')).hexdigest()[:16]
+            self._version += 1
+
+    def _refresh_locked(self, force: bool = False) -> None:
+        now = time.monotonic()
+        watched = self._watcher is not None and self._watcher.running
+        if (force or self._last_scan is None
+                or (not watched and now - self._last_scan >= LYRICS_RESCAN_INTERVAL)):
+            self._scan()
+            self._last_scan = now
+
+    def refresh(self, force: bool = False) -> None:
+        """Re-index changed files if forced, never scanned, or the scan interval elapsed."""
+        with self._lock:
+            self._refresh_locked(force)
+
+    def invalidate(self) -> None:
+        """Force a rescan on next query (used after in-process writes)."""
+        with self._lock:
+            self._last_scan = None
+
+    def attach_watcher(self, watcher) -> None:
+        """Skip timed rescans while ``watcher`` (a file_watcher.DataWatcher) is running."""
+        self._watcher = watcher
+
+    def on_changes(self, events) -> None:
+        """Data watcher subscriber for lyrics changes."""
+        self.invalidate()
+
+    @property
+    def version(self) -> int:
+        self.refresh()
+        return self._version
+
+    @property
+    def fingerprint(self) -> str:
+        """Digest of every lyrics file's (mtime_ns, size); the same in every process."""
+        self.refresh()
+        return self._fingerprint
+
+    def _clause_matches(self, clause: List[str], song_name: str) -> List[Tuple[int, int]]:
+        """(line_no, position) of each occurrence of the clause in one song."""
+        first = self._postings[clause[0]][song_name]
+        if len(clause) == 1:
+            return first
+        followers = [
+            {position for _, position in self._postings[token][song_name]}
+            for token in clause[1:]
+        ]
+        return [
+            (line_no, position) for line_no, position in first
+            if all(position + offset in positions for offset, positions in enumerate(followers, 1))
+        ]
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict]:
+        """Ranked songs containing every clause of the query.
+
+        Each result is {'song_name', 'score', 'snippets': [{'line', 'text'}]}.
+        Scores are tf-idf sums over clauses; ties sort by song name.
+        """
+        clauses = parse_query(query)
+        if not clauses:
+            return []
+
+        with self._lock:
+            self._refresh_locked()
+
+            tokens = {token for clause in clauses for token in clause}
+            if any(token not in self._postings for token in tokens):
+                return []
+
+            # Intersect starting from the rarest token to keep the candidate set small
+            rarest = sorted(tokens, key=lambda token: len(self._postings[token]))
+            candidates = set(self._postings[rarest[0]])
+            for token in rarest[1:]:
+                candidates.intersection_update(self._postings[token])
+                if not candidates:
+                    return []
+
+            total_docs = len(self._documents)
+            results = []
+            for song_name in candidates:
+                score = 0.0
+                hit_lines: Set[int] = set()
+                for clause in clauses:
+                    matches = self._clause_matches(clause, song_name)
+                    if not matches:
+                        break
+                    doc_freq = min(len(self._postings[token]) for token in clause)
+                    score += len(matches) * math.log(1 + total_docs / doc_freq)
+                    hit_lines.update(line_no for line_no, _ in matches)
+                else:
+                    lines = self._documents[song_name][1]
+                    snippets = [
+                        {'line': line_no + 1, 'text': lines[line_no].strip()}
+                        for line_no in sorted(hit_lines)[:MAX_SNIPPETS]
+                    ]
+                    results.append({
+                        'song_name': song_name,
+                        'score': round(score, 3),
+                        'snippets': snippets,
+                    })
+
+        results.sort(key=lambda r: (-r['score'], r['song_name']))
+        return results[:limit] if limit else results
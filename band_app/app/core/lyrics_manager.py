@@ -1,11 +1,19 @@
 """Lyrics management module for band app - extracted from Streamlit app."""
 
 import html
+import os
 import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from .song_manager import DATA_ROOT
+from .atomic_io import atomic_write
+from .change_feed import DELETED, LYRICS, publish_change
+from .file_locks import WriteConflict, file_lock
+from .lyrics_index import LyricsIndex
+from .storage import FileStorage
 
 
 # Data paths for lyrics
@@ -15,6 +23,100 @@ LYRICS_DIR = SONG_DATA_DIR / "lyrics"
 # Pattern to match section labels like [Chorus], [Verse 1], etc.
 SECTION_LABEL_PATTERN = re.compile(r"^\s*\[.+?\]\s*$")
 
+# Lyrics files whose text and rendered HTML are kept in memory
+LYRICS_CACHE_SIZE = int(os.getenv("BCH_LYRICS_CACHE_SIZE", "256"))
+
+
+class RenderedLyricsCache:
+    """Bounded LRU of normalised lyrics text and rendered HTML per file.
+
+    An entry is reused only while the file's (mtime_ns, size) is unchanged, so
+    a repeat view costs one stat() instead of a read plus a formatting pass.
+    While an attached data watcher runs, entries are reused without the stat
+    and dropped when the watcher reports their file changed.
+    """
+
+    def __init__(self, max_entries: int = LYRICS_CACHE_SIZE) -> None:
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        # path -> [(mtime_ns, size), normalised text, rendered HTML or None]
+        self._entries: "OrderedDict[str, list]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._watcher = None
+
+    def _entry(self, path: Path) -> Optional[list]:
+        key = str(path)
+        if self._watcher is not None and self._watcher.running:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+        try:
+            st = os.stat(key)
+        except FileNotFoundError:
+            self.discard(path)
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        with open(key, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        content = content.replace('\r\n', '\n').replace('\r', '\n').replace('\xa0', ' ').strip()
+
+        entry = [stamp, content, None]
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def text(self, path: Path) -> Optional[str]:
+        """Normalised file text, or None if the file does not exist."""
+        entry = self._entry(path)
+        return entry[1] if entry is not None else None
+
+    def rendered(self, path: Path) -> Optional[Tuple[str, str]]:
+        """(normalised text, display HTML), or None if the file does not exist."""
+        entry = self._entry(path)
+        if entry is None:
+            return None
+        if entry[2] is None:
+            entry[2] = format_lyrics_for_display(entry[1])
+        return entry[1], entry[2]
+
+    def discard(self, path: Path) -> None:
+        with self._lock:
+            self._entries.pop(str(path), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def attach_watcher(self, watcher) -> None:
+        """Reuse entries without a stat while ``watcher`` (a file_watcher.DataWatcher) is running."""
+        self._watcher = watcher
+
+    def on_changes(self, events) -> None:
+        """Data watcher subscriber: drop the entries for changed lyrics files."""
+        for event in events:
+            self.discard(Path(event.path))
+
+
+_LYRICS_INDEX = LyricsIndex(LYRICS_DIR)
+_LYRICS_CACHE = RenderedLyricsCache()
+_LYRICS_STORAGE = FileStorage()
+
 
 def load_available_lyrics() -> List[str]:
     """Load list of available lyrics files"""
@@ -31,18 +133,34 @@ def load_available_lyrics() -> List[str]:
 def load_lyrics_content(song_name: str) -> str:
     """Load lyrics content from file"""
     try:
-        lyrics_file = LYRICS_DIR / f"{song_name}.txt"
-        if lyrics_file.exists():
-            with open(lyrics_file, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-                content = content.replace('\r\n', '\n').replace('\r', '\n').replace('\xa0', ' ')
-                return content.strip()
-        else:
+        content = _LYRICS_CACHE.text(LYRICS_DIR / f"{song_name}.txt")
+        if content is None:
             return f"Lyrics file for '{song_name}' not found."
+        return content
     except Exception as e:
         return f"Error loading lyrics: {e}"
 
 
+def lyrics_file_stamp(song_name: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a song's lyrics file, or None if it has none; a cheap change token."""
+    try:
+        st = os.stat(LYRICS_DIR / f"{song_name}.txt")
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def load_lyrics_for_display(song_name: str) -> Tuple[str, str]:
+    """Load lyrics content and its display HTML; the HTML is empty when the file is missing."""
+    try:
+        cached = _LYRICS_CACHE.rendered(LYRICS_DIR / f"{song_name}.txt")
+        if cached is None:
+            return f"Lyrics file for '{song_name}' not found.", ""
+        return cached
+    except Exception as e:
+        return f"Error loading lyrics: {e}", ""
+
+
 def format_lyrics_for_display(content: str) -> str:
     """Ensure section headers have clean padding and render bold in HTML without any leading empty space."""
     if not content:
@@ -76,14 +194,23 @@ def format_lyrics_for_display(content: str) -> str:
     return "<br/>".join(formatted_lines)
 
 
-def save_lyrics_content(song_name: str, content: str) -> bool:
-    """Save lyrics content to file."""
+def save_lyrics_content(song_name: str, content: str, overwrite: bool = True) -> bool:
+    """Save lyrics content to file atomically (see core.atomic_io).
+
+    With overwrite=False an existing file is left untouched and False is returned.
+    """
     try:
-        LYRICS_DIR.mkdir(parents=True, exist_ok=True)
         lyrics_file = LYRICS_DIR / f"{song_name}.txt"
-        with open(lyrics_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        with file_lock(lyrics_file):
+            if not atomic_write(lyrics_file, content, overwrite=overwrite):
+                return False
+        _LYRICS_CACHE.discard(lyrics_file)
+        _LYRICS_INDEX.invalidate()
+        _LYRICS_STORAGE.invalidate_lyrics()
+        publish_change(LYRICS, song_name)
         return True
+    except WriteConflict:
+        raise
     except Exception as e:
         raise Exception(f"Error saving lyrics: {e}")
 
@@ -92,24 +219,53 @@ def delete_lyrics_file(song_name: str) -> bool:
     """Delete a lyrics file."""
     try:
         lyrics_file = LYRICS_DIR / f"{song_name}.txt"
-        if lyrics_file.exists():
-            lyrics_file.unlink()
+        with file_lock(lyrics_file):
+            deleted = lyrics_file.exists()
+            if deleted:
+                lyrics_file.unlink()
+        if deleted:
+            _LYRICS_CACHE.discard(lyrics_file)
+            _LYRICS_INDEX.invalidate()
+            _LYRICS_STORAGE.invalidate_lyrics()
+            publish_change(LYRICS, song_name, DELETED)
             return True
         return False
+    except WriteConflict:
+        raise
     except Exception as e:
         raise Exception(f"Error deleting lyrics file: {e}")
 
 
-def search_lyrics(query: str) -> List[str]:
-    """Search for songs that have lyrics containing the query."""
-    matching_songs = []
-    available_lyrics = load_available_lyrics()
+def get_lyrics_cache() -> RenderedLyricsCache:
+    """The shared rendered-lyrics cache."""
+    return _LYRICS_CACHE
 
-    query_lower = query.lower()
 
-    for song_name in available_lyrics:
-        lyrics_content = load_lyrics_content(song_name)
-        if query_lower in lyrics_content.lower():
-            matching_songs.append(song_name)
+def get_lyrics_index() -> LyricsIndex:
+    """The shared lyrics full-text index."""
+    return _LYRICS_INDEX
 
-    return matching_songs
\ No newline at end of file
+
+def attach_lyrics_storage(storage: FileStorage) -> None:
+    """Search lyrics through ``storage`` when it has a full-text index (see core.storage)."""
+    global _LYRICS_STORAGE
+    _LYRICS_STORAGE = storage
+
+
+def search_lyrics_ranked(query: str, limit: Optional[int] = None) -> List[Dict]:
+    """Ranked lyrics matches with line snippets.
+
+    Bare words must all appear (AND); "quoted text" must appear as a phrase.
+    """
+    try:
+        results = _LYRICS_STORAGE.search_lyrics(LYRICS_DIR, query, limit=limit)
+        if results is not None:
+            return results
+        return _LYRICS_INDEX.search(query, limit=limit)
+    except Exception as e:
+        raise Exception(f"Error searching lyrics: {e}")
+
+
+def search_lyrics(query: str) -> List[str]:
+    """Search for songs that have lyrics containing the query, best matches first."""
+    return [result['song_name'] for result in search_lyrics_ranked(query)]
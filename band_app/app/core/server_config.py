@@ -0,0 +1,251 @@
+"""Launch profiles for the band app server.
+
+``dev`` is the old ``python main.py``: one process with the file-watching
+reloader and synchronous access logging. ``production`` is for the Pi: no
+reloader, uvloop and httptools when installed (``uvicorn[standard]``), a
+worker count, longer keep-alive for phones that poll and hold SSE streams,
+and access lines written by a background thread in batches so a slow SD card
+never stalls a request.
+
+With one worker the two profiles serve about the same requests per second
+(bench_profiles.py; request handling is CPU-bound in route and template code),
+so production's gain on a multi-core Pi comes from ``--workers``. Two features
+still live in one process's memory and only work within a single worker:
+
+- show sync sessions (core.show_sync): every device of a show must reach the
+  same worker;
+- the change feed (core.change_feed): a change only reaches the browsers
+  connected to the worker that made it.
+
+Keep ``BCH_WORKERS=1`` (the default) when the band relies on either; ``run``
+warns otherwise. Admin jobs (core.jobs) share their state between workers.
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+DEV = "dev"
+PRODUCTION = "production"
+PROFILES = (DEV, PRODUCTION)
+
+DEFAULT_HOST = "0.0.0.0"  # Bind to all interfaces for Pi access
+DEFAULT_PORT = 8000
+# Production keep-alive: phones re-request fragments every few seconds
+PRODUCTION_KEEPALIVE_SECONDS = 30
+# Time given to open requests (and the catalog flush) on shutdown
+GRACEFUL_SHUTDOWN_SECONDS = 10
+
+
+def module_available(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+def uvicorn_options(profile: str, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    workers: int = 1, keepalive: Optional[int] = None) -> Dict[str, Any]:
+    """Keyword arguments for ``uvicorn.run("main:app", ...)`` under ``profile``."""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown server profile {profile!r}; use one of {', '.join(PROFILES)}")
+    if profile == DEV:
+        return {
+            "host": host,
+            "port": port,
+            "reload": True,
+            "access_log": True,
+            "log_level": "info",
+        }
+    return {
+        "host": host,
+        "port": port,
+        "reload": False,
+        "workers": max(1, workers),
+        "loop": "uvloop" if module_available("uvloop") else "asyncio",
+        "http": "httptools" if module_available("httptools") else "h11",
+        "timeout_keep_alive": PRODUCTION_KEEPALIVE_SECONDS if keepalive is None else keepalive,
+        "timeout_graceful_shutdown": GRACEFUL_SHUTDOWN_SECONDS,
+        "backlog": 512,
+        "server_header": False,
+        "access_log": True,
+        "log_level": "info",
+        "log_config": production_log_config(),
+    }
+
+
+def production_log_config() -> Dict[str, Any]:
+    """uvicorn's logging setup, with access lines going through BufferedAccessLogHandler."""
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {
+            "default": {
+                "()": "uvicorn.logging.DefaultFormatter",
+                "fmt": "%(levelprefix)s %(message)s",
+                "use_colors": False,
+            },
+            "access": {
+                "()": "uvicorn.logging.AccessFormatter",
+                "fmt": '%(asctime)s %(client_addr)s - "%(request_line)s" %(status_code)s',
+                "use_colors": False,
+            },
+        },
+        "handlers": {
+            "default": {
+                "formatter": "default",
+                "class": "logging.StreamHandler",
+                "stream": "ext://sys.stderr",
+            },
+            "access": {
+                "formatter": "access",
+                "()": "core.server_config.BufferedAccessLogHandler",
+            },
+        },
+        "loggers": {
+            "uvicorn": {"handlers": ["default"], "level": "INFO", "propagate": False},
+            "uvicorn.error": {"level": "INFO"},
+            "uvicorn.access": {"handlers": ["access"], "level": "INFO", "propagate": False},
+        },
+    }
+
+
+class BufferedAccessLogHandler(logging.Handler):
+    """Queue log records and write them from a background thread in batches.
+
+    ``emit`` only enqueues, so request handling never waits on the log stream.
+    The writer formats queued records and writes a batch when ``capacity``
+    lines are buffered or ``flush_interval`` seconds have passed. Records
+    beyond ``max_queue`` are dropped and counted rather than growing memory.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, capacity: int = 200,
+                 flush_interval: float = 1.0, max_queue: int = 10000) -> None:
+        super().__init__()
+        self.stream = stream
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[logging.LogRecord]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="access-log", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        lines: List[str] = []
+        last_write = time.monotonic()
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_write))
+            try:
+                record = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                record = False
+            if record is None:
+                self._write(lines)
+                return
+            if record is not False:
+                try:
+                    lines.append(self.format(record))
+                except Exception:
+                    self.handleError(record)
+            if len(lines) >= self.capacity or time.monotonic() - last_write >= self.flush_interval:
+                self._write(lines)
+                lines = []
+                last_write = time.monotonic()
+
+    def _write(self, lines: List[str]) -> None:
+        if not lines:
+            return
+        stream = self.stream or sys.stdout
+        try:
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Write out everything queued, then stop the writer thread."""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout=5.0)
+        self._thread = None
+        super().close()
+
+
+_EXIT_CALLBACKS: List[Callable[[], Any]] = []
+
+
+def on_server_exit(callback: Callable[[], Any]) -> None:
+    """Call ``callback`` as soon as uvicorn is told to stop, before it waits for connections.
+
+    uvicorn runs the lifespan shutdown only once every connection has closed,
+    which long-lived streams never do by themselves. The callback runs inside
+    the signal handler, so it must not block or take locks. Register it when
+    the app module is imported: uvicorn installs its signal handlers after
+    loading the app and before running the lifespan. No-op without uvicorn.
+    """
+    try:
+        from uvicorn.server import Server
+    except ImportError:
+        return
+    if not getattr(Server.handle_exit, "band_hub_hooked", False):
+        original = Server.handle_exit
+
+        def handle_exit(self, sig, frame):
+            for registered in list(_EXIT_CALLBACKS):
+                try:
+                    registered()
+                except Exception as e:
+                    print(f"Error in server exit callback: {e}")
+            return original(self, sig, frame)
+
+        handle_exit.band_hub_hooked = True
+        Server.handle_exit = handle_exit
+    if callback not in _EXIT_CALLBACKS:
+        _EXIT_CALLBACKS.append(callback)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Command-line flags for ``python main.py``; each defaults to its environment variable."""
+    parser = argparse.ArgumentParser(description="Run the Band Hub server")
+    parser.add_argument("--profile", choices=PROFILES, default=os.getenv("BAND_APP_PROFILE", DEV),
+                        help="dev (reload, default) or production")
+    parser.add_argument("--host", default=os.getenv("BAND_APP_HOST", DEFAULT_HOST))
+    parser.add_argument("--port", type=int, default=int(os.getenv("BAND_APP_PORT", str(DEFAULT_PORT))))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("BCH_WORKERS", "1")),
+                        help="worker processes (production only)")
+    parser.add_argument("--keepalive", type=int, default=None,
+                        help="HTTP keep-alive seconds (production only)")
+    args = parser.parse_args(argv)
+    if args.keepalive is None and os.getenv("BAND_APP_KEEPALIVE_SECONDS"):
+        args.keepalive = int(os.environ["BAND_APP_KEEPALIVE_SECONDS"])
+    return args
+
+
+def run(argv: Optional[List[str]] = None) -> None:
+    """Start uvicorn with the selected profile."""
+    import uvicorn
+
+    args = parse_args(argv)
+    options = uvicorn_options(args.profile, args.host, args.port, args.workers, args.keepalive)
+    workers = options.get("workers", 1)
+    if workers > 1:
+        print(f"Warning: running {workers} workers. Synced show mode and live list refresh only work "
+              "between devices connected to the same worker; use --workers 1 if the band relies on them.")
+    # Workers are fresh processes; they read the worker count (see core.song_manager) from here
+    os.environ["BCH_WORKERS"] = str(workers)
+    uvicorn.run("main:app", **options)
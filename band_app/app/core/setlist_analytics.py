@@ -0,0 +1,115 @@
+"""Play-count and venue analytics for the setlist archive.
+
+The same figures as the Streamlit "Stats & Insights" tab (play counts, venue
+frequency, songs per show, songs played only once), kept as running totals.
+When the archive changes only the setlists it reparsed are subtracted and
+re-added, and the summary is rebuilt at most once per archive version.
+"""
+
+import hashlib
+import json
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from .setlist_manager import SetlistArchive, get_setlist_archive
+
+SET_KEYS = ('set1', 'set2', 'set3')
+
+
+class SetlistAnalytics:
+    """Running play and venue counters over a SetlistArchive.
+
+    Each contribution is keyed by file path and remembers the parsed setlist
+    it came from. The archive replaces that dict only when it reparses the
+    file, so an identity check finds the changed setlists without recounting
+    the others.
+    """
+
+    def __init__(self, archive: SetlistArchive) -> None:
+        self.archive = archive
+        self._lock = threading.Lock()
+        self._contributions: Dict[str, Tuple[Dict, str, List[str]]] = {}
+        self._song_counts: Counter = Counter()
+        self._venue_counts: Counter = Counter()
+        self._played_once: Set[str] = set()
+        self._total_songs = 0
+        self._version: Optional[int] = None
+        self._summary: Optional[Dict] = None
+
+    def _count_song(self, song_name: str, delta: int) -> None:
+        count = self._song_counts[song_name] + delta
+        if count > 0:
+            self._song_counts[song_name] = count
+        else:
+            del self._song_counts[song_name]
+        if count == 1:
+            self._played_once.add(song_name)
+        else:
+            self._played_once.discard(song_name)
+
+    def _apply(self, file_path: str, delta: int) -> None:
+        _, venue, song_names = self._contributions[file_path]
+        for song_name in song_names:
+            self._count_song(song_name, delta)
+        self._venue_counts[venue] += delta
+        if self._venue_counts[venue] <= 0:
+            del self._venue_counts[venue]
+        self._total_songs += delta * len(song_names)
+
+    def _sync(self, setlists: List[Dict]) -> None:
+        current = {setlist['file_path']: setlist for setlist in setlists}
+        for file_path in list(self._contributions):
+            cached = self._contributions[file_path]
+            if current.get(file_path) is not cached[0]:
+                self._apply(file_path, -1)
+                del self._contributions[file_path]
+
+        for file_path, setlist in current.items():
+            if file_path in self._contributions:
+                continue
+            song_names = [song['name'] for set_key in SET_KEYS for song in setlist['sets'].get(set_key, [])]
+            self._contributions[file_path] = (setlist, setlist['venue'], song_names)
+            self._apply(file_path, 1)
+
+    def _build_summary(self, setlists: List[Dict]) -> Dict:
+        songs_per_show = [len(self._contributions[setlist['file_path']][2]) for setlist in setlists]
+        total_shows = len(setlists)
+        summary = {
+            'total_shows': total_shows,
+            'unique_songs': len(self._song_counts),
+            'total_songs_played': self._total_songs,
+            'avg_songs_per_show': round(self._total_songs / total_shows, 1) if total_shows else 0,
+            'song_counts': [{'song': song, 'times_played': count}
+                            for song, count in self._song_counts.most_common()],
+            'venue_counts': [{'venue': venue, 'shows': count}
+                             for venue, count in self._venue_counts.most_common()],
+            # Newest show first, matching the archive order
+            'songs_per_show': [{'id': setlist['id'], 'venue': setlist['venue'], 'date': setlist['date'],
+                                'songs': count} for setlist, count in zip(setlists, songs_per_show)],
+            'played_once': sorted(self._played_once),
+        }
+        # Content hash rather than the version, which restarts with the process
+        digest = hashlib.sha1(json.dumps(summary, sort_keys=True).encode('utf-8')).hexdigest()[:20]
+        summary['etag'] = f'"{digest}"'
+        return summary
+
+    def summary(self) -> Dict:
+        """Analytics for the current archive; callers must not mutate the result."""
+        version = self.archive.version
+        with self._lock:
+            if self._summary is not None and version == self._version:
+                return self._summary
+            setlists = self.archive.setlists()
+            self._sync(setlists)
+            self._version = version
+            self._summary = self._build_summary(setlists)
+            return self._summary
+
+
+_ANALYTICS = SetlistAnalytics(get_setlist_archive())
+
+
+def get_setlist_analytics() -> Dict:
+    """Play counts, venue frequency, songs per show and played-once songs for the archive."""
+    return _ANALYTICS.summary()
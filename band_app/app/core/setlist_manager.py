@@ -3,56 +3,415 @@
 import os
 import re
 import json
+import hashlib
+import threading
+import time
+import unicodedata
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Set
 
 from .song_manager import DATA_ROOT
+from .atomic_io import atomic_write
+from .file_locks import WriteConflict, check_version, content_version, file_lock, file_version
+from .change_feed import DELETED, SETLIST, SETLISTS, publish_change
+from .storage import FileStorage
 
 
 # Data paths for setlists
 SETLISTS_DIR = DATA_ROOT / "buckingham_conspiracy" / "setlists"
 
 
-def load_previous_setlists() -> List[Dict]:
-    """Load all previous setlists"""
-    setlists_dir = SETLISTS_DIR
-    setlists = []
+# How long a scan of the archive is trusted before files are re-stat'ed for outside edits
+SETLIST_RESCAN_INTERVAL = float(os.getenv("BCH_SETLIST_RESCAN_SECONDS", "2.0"))
+# Ids given out so far (venue dir/file -> id), kept with the data so they outlive restarts
+SETLIST_IDS_FILE = ".setlist_ids.json"
+
 
+def setlist_sort_key(date: str) -> str:
+    """ISO date used to order setlists; unparseable dates sort as oldest."""
     try:
-        for venue_dir in os.listdir(setlists_dir):
-            venue_path = os.path.join(setlists_dir, venue_dir)
-            if os.path.isdir(venue_path):
-                for file in os.listdir(venue_path):
-                    if file.endswith('.md'):
-                        file_path = os.path.join(venue_path, file)
-                        setlist_data = parse_setlist_file(file_path, venue_dir)
-                        if setlist_data:
-                            setlists.append(setlist_data)
-    except Exception as e:
-        raise Exception(f"Error loading setlists: {e}")
+        return datetime.strptime(date, "%m/%d/%y").date().isoformat()
+    except ValueError:
+        return ""
+
+
+def slugify(text: str) -> str:
+    """Lowercase ASCII slug: 'Paradise Garage Setlist (082424)' -> 'paradise-garage-setlist-082424'."""
+    ascii_text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', ascii_text.lower()).strip('-')
+
+
+def assign_setlist_ids(files: Dict[str, str], known: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Stable ids for setlist files (file path -> venue dir name).
+
+    The id is the slug of the venue directory, so it survives date edits and new
+    shows. Ids in ``known`` (file path -> id, from earlier scans) are kept, so an
+    id never changes once given out: only a newcomer is suffixed, with its file's
+    slug when its directory already has a setlist, or a short hash of its path
+    when another directory's setlist holds the slug. Without history the file
+    named after its directory (as the app saves them) comes first, then the rest
+    by directory and file name.
+    """
+    known = known or {}
+    ids: Dict[str, str] = {}
+    taken: Set[str] = set()
+    for file_path, setlist_id in known.items():
+        if file_path in files and setlist_id not in taken:
+            ids[file_path] = setlist_id
+            taken.add(setlist_id)
+
+    def order(file_path: str) -> Tuple[str, bool, str]:
+        name = Path(file_path).stem
+        return files[file_path], name != files[file_path], name
+
+    for file_path in sorted((path for path in files if path not in ids), key=order):
+        venue_dir = files[file_path]
+        setlist_id = slugify(venue_dir) or "setlist"
+        if setlist_id in taken and any(files.get(path) == venue_dir for path in ids):
+            setlist_id += "--" + (slugify(Path(file_path).stem) or "setlist")
+        # Ids must never look like legacy positional ids, which are redirected
+        if setlist_id in taken or setlist_id.isdigit():
+            digest = hashlib.sha1(f"{venue_dir}/{Path(file_path).name}".encode('utf-8')).hexdigest()[:6]
+            setlist_id = f"{setlist_id}-{digest}"
+        ids[file_path] = setlist_id
+        taken.add(setlist_id)
+    return ids
+
+
+def normalize_song_name(name: str) -> str:
+    """Key used to match song names across setlists: case, accents, apostrophes and spacing folded."""
+    folded = unicodedata.normalize('NFKD', name.replace('’', "'")).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(folded.casefold().split())
+
+
+class SongPlayIndex:
+    """Normalised song name -> {setlist file: [(set key, position), ...]}.
+
+    Maintained per file by SetlistArchive, so a changed setlist only touches
+    the postings of its own songs.
+    """
+
+    def __init__(self) -> None:
+        self._plays: Dict[str, Dict[str, List[Tuple[str, int]]]] = {}
+        self._keys_by_file: Dict[str, Set[str]] = {}
+
+    def add(self, file_path: str, setlist_data: Dict) -> None:
+        keys: Set[str] = set()
+        for set_key, songs in setlist_data['sets'].items():
+            for position, song in enumerate(songs):
+                key = normalize_song_name(song['name'])
+                self._plays.setdefault(key, {}).setdefault(file_path, []).append((set_key, position))
+                keys.add(key)
+        self._keys_by_file[file_path] = keys
+
+    def remove(self, file_path: str) -> None:
+        for key in self._keys_by_file.pop(file_path, ()):
+            postings = self._plays.get(key)
+            if postings is None:
+                continue
+            postings.pop(file_path, None)
+            if not postings:
+                del self._plays[key]
+
+    def lookup(self, song_name: str, partial: bool = False) -> Dict[str, List[Tuple[str, int]]]:
+        """Postings for a song; ``partial`` also matches names containing it."""
+        key = normalize_song_name(song_name)
+        if not partial:
+            return dict(self._plays.get(key, {}))
+        if not key:
+            return {}
+        matches: Dict[str, List[Tuple[str, int]]] = {}
+        # Linear in distinct song names, not in songs played across the archive
+        for name, postings in self._plays.items():
+            if key in name:
+                for file_path, plays in postings.items():
+                    matches.setdefault(file_path, []).extend(plays)
+        return matches
+
+
+class SetlistArchive:
+    """In-memory index of every parsed setlist, kept newest first and by id.
+
+    A rescan only stats the markdown files and reparses the ones whose
+    (mtime_ns, size) changed. Scans are throttled to SETLIST_RESCAN_INTERVAL,
+    or only happen on change events while an attached data watcher runs;
+    in-process writers call ``invalidate()`` so their changes show up at once.
+    Each setlist carries a stable ``id`` (see assign_setlist_ids), and a
+    SongPlayIndex answers "which shows played X" without walking every set
+    (the sqlite backend answers from its indexed setlist entries instead).
+    """
+
+    def __init__(self, setlists_dir: Path) -> None:
+        self.setlists_dir = setlists_dir
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[Tuple[int, int], str, Dict]] = {}
+        self._ordered: List[Dict] = []
+        self._by_id: Dict[str, Dict] = {}
+        self._ids: Dict[str, str] = {}
+        self._plays = SongPlayIndex()
+        self._version = 0
+        self._fingerprint = ""
+        self._last_scan: Optional[float] = None
+        self._watcher = None
+        self._storage = FileStorage()
+
+    def _scan(self) -> bool:
+        """Reparse changed files. Returns True if the archive changed."""
+        seen: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        try:
+            with os.scandir(self.setlists_dir) as venues:
+                for venue in venues:
+                    if not venue.is_dir():
+                        continue
+                    with os.scandir(venue.path) as files:
+                        for entry in files:
+                            if entry.name.endswith('.md') and entry.is_file():
+                                st = entry.stat()
+                                seen[entry.path] = ((st.st_mtime_ns, st.st_size), venue.name)
+        except Exception as e:
+            raise Exception(f"Error loading setlists: {e}")
+
+        changed = False
+        removed = [file_path for file_path in self._entries if file_path not in seen]
+        for file_path in removed:
+            del self._entries[file_path]
+            self._plays.remove(file_path)
+            changed = True
+        self._storage.forget_setlists(removed)
+
+        for file_path, (stamp, venue_dir) in seen.items():
+            cached = self._entries.get(file_path)
+            if cached and cached[0] == stamp:
+                continue
+            setlist_data = self._storage.load_setlist(file_path, venue_dir, stamp, parse_setlist_file)
+            if cached:
+                self._plays.remove(file_path)
+            self._entries[file_path] = (stamp, setlist_sort_key(setlist_data['date']), setlist_data)
+            self._plays.add(file_path, setlist_data)
+            changed = True
+
+        if changed:
+            self._ids = self._assign_ids({file_path: venue_dir for file_path, (_, venue_dir) in seen.items()})
+            for file_path, (_, _, setlist_data) in self._entries.items():
+                setlist_data['id'] = self._ids[file_path]
+            # Sort by path first so shows on the same date keep a stable order
+            ordered = sorted(self._entries.items(), key=lambda item: item[0])
+            ordered.sort(key=lambda item: item[1][1], reverse=True)
+            self._ordered = [setlist for _, (_, _, setlist) in ordered]
+            self._by_id = {setlist['id']: setlist for setlist in self._ordered}
+            stamps = sorted((file_path, stamp) for file_path, (stamp, _, _) in self._entries.items())
+            self._fingerprint = hashlib.sha1(repr(stamps).encode('utf-8')).hexdigest()[:16]
+            self._version += 1
+        return changed
+
+    def _assign_ids(self, files: Dict[str, str]) -> Dict[str, str]:
+        """assign_setlist_ids against the id file shared by every worker; records new ids in it."""
+        id_file = self.setlists_dir / SETLIST_IDS_FILE
+
+        def relative(file_path: str) -> str:
+            return f"{files[file_path]}/{Path(file_path).name}"
 
-    def sort_key(x):
         try:
-            return datetime.strptime(x['date'], "%m/%d/%y")
-        except ValueError:
-            return datetime.min
+            with file_lock(id_file):
+                try:
+                    with open(id_file, 'r', encoding='utf-8') as f:
+                        recorded = json.load(f)
+                except FileNotFoundError:
+                    recorded = {}
+                by_relative = {relative(file_path): file_path for file_path in files}
+                known = {by_relative[name]: setlist_id for name, setlist_id in recorded.items()
+                         if name in by_relative}
+                ids = assign_setlist_ids(files, known)
+                current = {relative(file_path): setlist_id for file_path, setlist_id in sorted(ids.items())}
+                if current != recorded:
+                    atomic_write(id_file, json.dumps(current, indent=2, ensure_ascii=False) + "\n")
+                return ids
+        except (OSError, ValueError, WriteConflict) as e:
+            # Still serve the archive; ids fall back to this process's earlier assignment
+            print(f"Could not use setlist id file {id_file}: {e}")
+            return assign_setlist_ids(files, self._ids)
+
+    def refresh(self, force: bool = False) -> None:
+        """Rescan the archive if forced, never scanned, or the scan interval elapsed."""
+        watched = self._watcher is not None and self._watcher.running
+        with self._lock:
+            now = time.monotonic()
+            if (force or self._last_scan is None
+                    or (not watched and now - self._last_scan >= SETLIST_RESCAN_INTERVAL)):
+                self._scan()
+                self._last_scan = now
+
+    def setlists(self) -> List[Dict]:
+        """All setlists, newest first."""
+        self.refresh()
+        return list(self._ordered)
+
+    def get(self, setlist_id: str) -> Optional[Dict]:
+        """Setlist by stable id, or None."""
+        self.refresh()
+        return self._by_id.get(setlist_id)
+
+    def id_for_path(self, file_path: str) -> Optional[str]:
+        """Stable id of the setlist stored in ``file_path``, or None."""
+        self.refresh()
+        with self._lock:
+            entry = self._entries.get(str(file_path))
+            return entry[2]['id'] if entry else None
+
+    def get_by_position(self, position: int) -> Optional[Dict]:
+        """Setlist at a position in the newest-first ordering (legacy integer ids), or None."""
+        self.refresh()
+        ordered = self._ordered
+        if 0 <= position < len(ordered):
+            return ordered[position]
+        return None
+
+    def song_plays(self, song_name: str, partial: bool = False) -> List[Dict]:
+        """Every play of a song, newest show first, as {'setlist', 'set', 'position', 'song'}.
+
+        Matching is on normalised names; ``partial`` also matches names containing ``song_name``.
+        """
+        self.refresh()
+        postings = self._storage.song_postings(song_name, partial)
+        with self._lock:
+            if postings is None:
+                postings = self._plays.lookup(song_name, partial)
+            shows = sorted(((file_path, self._entries[file_path], plays)
+                            for file_path, plays in postings.items() if file_path in self._entries),
+                           key=lambda show: show[0])
+        # Same order as setlists(): newest first, ties by file path
+        shows.sort(key=lambda show: show[1][1], reverse=True)
+        key = normalize_song_name(song_name)
+        results = []
+        for _, (_, _, setlist_data), plays in shows:
+            for set_key, position in sorted(plays):
+                set_songs = setlist_data['sets'].get(set_key, ())
+                # Database entries another worker stored from a newer version of the file are skipped
+                if position >= len(set_songs):
+                    continue
+                name = normalize_song_name(set_songs[position]['name'])
+                if not (key in name if partial else name == key):
+                    continue
+                results.append({
+                    'setlist': setlist_data,
+                    'set': set_key,
+                    'position': position,
+                    'song': set_songs[position],
+                })
+        return results
+
+    @staticmethod
+    def _distinct_setlists(plays: List[Dict]) -> List[Dict]:
+        shows: List[Dict] = []
+        for play in plays:
+            if not shows or shows[-1] is not play['setlist']:
+                shows.append(play['setlist'])
+        return shows
+
+    def song_setlists(self, song_name: str, partial: bool = False) -> List[Dict]:
+        """Setlists that played a song, newest first."""
+        return self._distinct_setlists(self.song_plays(song_name, partial))
+
+    def song_stats(self, song_name: str) -> Dict:
+        """How often and when a song was played, matched on its normalised name."""
+        plays = self.song_plays(song_name)
+        shows = self._distinct_setlists(plays)
+
+        def show_summary(setlist_data: Dict) -> Dict:
+            return {'id': setlist_data['id'], 'venue': setlist_data['venue'], 'date': setlist_data['date']}
+
+        return {
+            'song_name': song_name,
+            'times_played': len(plays),
+            'shows': len(shows),
+            'last_played': show_summary(shows[0]) if shows else None,
+            'first_played': show_summary(shows[-1]) if shows else None,
+        }
+
+    @property
+    def version(self) -> int:
+        self.refresh()
+        return self._version
+
+    @property
+    def fingerprint(self) -> str:
+        """Digest of every file's (mtime_ns, size); unlike ``version`` it is the same in every process."""
+        self.refresh()
+        return self._fingerprint
+
+    def invalidate(self) -> None:
+        """Force a rescan on next access (used after in-process writes)."""
+        with self._lock:
+            self._last_scan = None
+
+    def attach_watcher(self, watcher) -> None:
+        """Skip timed rescans while ``watcher`` (a file_watcher.DataWatcher) is running."""
+        self._watcher = watcher
+
+    def attach_storage(self, storage: FileStorage) -> None:
+        """Load parsed setlists through ``storage`` (see core.storage)."""
+        with self._lock:
+            self._storage = storage
+            self._last_scan = None
+
+    def on_changes(self, events) -> None:
+        """Data watcher subscriber; the rescan reparses only the files that changed."""
+        self.invalidate()
+
+
+_ARCHIVE = SetlistArchive(SETLISTS_DIR)
+
+
+def load_previous_setlists() -> List[Dict]:
+    """Load all previous setlists"""
+    return _ARCHIVE.setlists()
 
-    return sorted(setlists, key=sort_key, reverse=True)
 
+def get_setlist(setlist_id: str) -> Optional[Dict]:
+    """Look up a single setlist by its stable id."""
+    return _ARCHIVE.get(setlist_id)
 
-def delete_setlist(setlist_id: int) -> bool:
+
+def get_setlist_by_position(position: int) -> Optional[Dict]:
+    """Look up a setlist by its position in the newest-first list (legacy integer ids)."""
+    return _ARCHIVE.get_by_position(position)
+
+
+def get_setlist_archive() -> SetlistArchive:
+    """The shared setlist archive index."""
+    return _ARCHIVE
+
+
+def invalidate_setlist_archive() -> None:
+    """Rescan the setlist archive on next access."""
+    _ARCHIVE.invalidate()
+
+
+def publish_setlist_saved(file_path: str) -> None:
+    """Announce a written setlist file to live clients by its stable id."""
+    try:
+        setlist_id = _ARCHIVE.id_for_path(file_path)
+    except Exception as e:
+        print(f"Error resolving setlist id for {file_path}: {e}")
+        setlist_id = None
+    if setlist_id is not None:
+        publish_change(SETLIST, setlist_id)
+    publish_change(SETLISTS)
+
+
+def delete_setlist(setlist_id: str) -> bool:
     """Delete a setlist file and its parent folder if empty."""
     try:
-        setlists = load_previous_setlists()
-        if setlist_id < 0 or setlist_id >= len(setlists):
+        setlist = get_setlist(setlist_id)
+        if setlist is None:
             return False
 
-        setlist = setlists[setlist_id]
         file_path = Path(setlist['file_path'])
 
-        if file_path.exists():
-            file_path.unlink()
+        with file_lock(file_path):
+            if file_path.exists():
+                file_path.unlink()
 
         # Remove parent folder if empty or only contains .DS_Store
         parent_dir = file_path.parent
@@ -63,7 +422,12 @@ def delete_setlist(setlist_id: int) -> bool:
                     f.unlink()
                 parent_dir.rmdir()
 
+        invalidate_setlist_archive()
+        publish_change(SETLIST, setlist_id, DELETED)
+        publish_change(SETLISTS)
         return True
+    except WriteConflict:
+        raise
     except Exception as e:
         raise Exception(f"Error deleting setlist: {e}")
 
@@ -188,15 +552,43 @@ def save_setlist_to_file(setlist_data: Dict) -> bool:
             if set_num < 3:
                 content += "#   \n"
 
-        # Write to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        with file_lock(file_path):
+            atomic_write(file_path, content)
 
+        invalidate_setlist_archive()
+        publish_setlist_saved(file_path)
         return True
+    except WriteConflict:
+        raise
     except Exception as e:
         raise Exception(f"Error saving setlist: {e}")
 
 
+def read_setlist_markdown(file_path: str) -> str:
+    """Read the raw markdown of a setlist file."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def setlist_markdown_version(markdown: str) -> str:
+    """Optimistic version of a setlist's raw markdown, for the edit form."""
+    return content_version(markdown)
+
+
+def write_setlist_markdown(file_path: str, content: str, expected_version: Optional[str] = None) -> None:
+    """Overwrite a setlist file with raw markdown and refresh the archive.
+
+    Raises WriteConflict if ``expected_version`` is given and the file changed since it was read.
+    """
+    try:
+        with file_lock(file_path):
+            check_version(expected_version, file_version(file_path), "This setlist")
+            atomic_write(file_path, content)
+    finally:
+        invalidate_setlist_archive()
+    publish_setlist_saved(file_path)
+
+
 def format_duration(seconds: int) -> str:
     """Format duration in MM:SS format"""
     minutes = seconds // 60
@@ -341,21 +733,29 @@ def load_setlist_from_json(json_data: str) -> Optional[Dict]:
 
 
 def search_setlists_by_song(song_name: str) -> List[Dict]:
-    """Find all setlists that contain a specific song"""
-    setlists = load_previous_setlists()
+    """Find all setlists that contain a specific song (partial, case-insensitive name match)"""
     matching_setlists = []
-
-    song_name_lower = song_name.lower()
-
-    for setlist in setlists:
-        for set_key, songs in setlist['sets'].items():
-            for song in songs:
-                if song_name_lower in song['name'].lower():
-                    matching_setlists.append({
-                        'setlist': setlist,
-                        'set': set_key,
-                        'song': song
-                    })
-                    break
-
-    return matching_setlists
\ No newline at end of file
+    seen_sets = set()
+    for play in _ARCHIVE.song_plays(song_name, partial=True):
+        # One match per set, as the first matching song in it
+        set_ref = (play['setlist']['file_path'], play['set'])
+        if set_ref in seen_sets:
+            continue
+        seen_sets.add(set_ref)
+        matching_setlists.append({
+            'setlist': play['setlist'],
+            'set': play['set'],
+            'song': play['song']
+        })
+
+    return matching_setlists
+
+
+def find_setlists_with_song(song_name: str) -> List[Dict]:
+    """Setlists containing a song (partial name match), newest first."""
+    return _ARCHIVE.song_setlists(song_name, partial=True)
+
+
+def get_song_play_stats(song_name: str) -> Dict:
+    """Times played, number of shows, and first/last show for a song."""
+    return _ARCHIVE.song_stats(song_name)
@@ -0,0 +1,251 @@
+"""Synchronised show mode: one device leads, the others follow.
+
+Every device showing a setlist joins that setlist's ShowSession over a
+WebSocket. The leader's messages update the shared state (current song index,
+autoscroll position as a fraction of the lyrics height, play/pause and speed),
+which is pushed straight to the other members. Each member has its own writer
+task and a one-slot mailbox for state, so a slow phone only ever receives the
+newest state and never holds up the rest of the band.
+
+Sessions live in this process's memory, so every device of a show must reach
+the same server process; reconnecting devices are resent the full state.
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+# Sessions with no devices are forgotten after this long
+SESSION_IDLE_SECONDS = 6 * 3600
+# Autoscroll speed limits, matching the autoscroll engine
+MIN_SPEED = 0.25
+MAX_SPEED = 4.0
+# Replies (acks, pongs, errors) queued for a stalled socket; the oldest are dropped beyond this
+MEMBER_REPLY_LIMIT = 16
+
+Sender = Callable[[str], Awaitable[None]]
+
+
+class ShowSyncError(ValueError):
+    """A client message that can't be applied."""
+
+
+class Member:
+    """One connected device and its outgoing messages."""
+
+    def __init__(self, client_id: str, send: Sender) -> None:
+        self.client_id = client_id
+        self.send = send
+        # Only the newest state is worth sending; replies queue in order, bounded
+        self.pending_state: Optional[Dict] = None
+        self.replies: Deque[Dict] = deque(maxlen=MEMBER_REPLY_LIMIT)
+        self.wakeup = asyncio.Event()
+        self.closed = False
+        self.writer: Optional[asyncio.Task] = None
+
+    def offer_state(self, state: Dict) -> None:
+        self.pending_state = state
+        self.wakeup.set()
+
+    def reply(self, message: Dict) -> None:
+        if message.get("type") == "pong" and any(queued.get("type") == "pong" for queued in self.replies):
+            # One unsent pong already answers the clock probe
+            return
+        self.replies.append(message)
+        self.wakeup.set()
+
+    async def run_writer(self, on_failure: Callable[["Member"], None]) -> None:
+        try:
+            while not self.closed:
+                await self.wakeup.wait()
+                self.wakeup.clear()
+                while self.replies or self.pending_state is not None:
+                    if self.replies:
+                        message = self.replies.popleft()
+                    else:
+                        message, self.pending_state = self.pending_state, None
+                    # A stalled socket only stalls this task; the server's
+                    # WebSocket pings close it, and the send then fails
+                    await self.send(json.dumps(message, separators=(',', ':')))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            on_failure(self)
+
+
+class ShowSession:
+    """Shared show state for one setlist and the devices following it."""
+
+    def __init__(self, setlist_id: str, song_count: int) -> None:
+        self.setlist_id = setlist_id
+        self.song_count = song_count
+        self.song = 0
+        self.scroll = 0.0
+        self.playing = False
+        self.speed = 1.0
+        self.leader: Optional[str] = None
+        self.rev = 0
+        self.updated = time.time()
+        self.members: Dict[str, Member] = {}
+
+    def state(self) -> Dict:
+        return {"type": "state", "setlist": self.setlist_id, "rev": self.rev,
+                "song": self.song, "scroll": self.scroll, "playing": self.playing,
+                "speed": self.speed, "leader": self.leader, "ts": self.updated,
+                "devices": len(self.members)}
+
+    def apply(self, client_id: str, message: Dict) -> bool:
+        """Apply a leader's state message; returns whether anything changed."""
+        if self.leader != client_id:
+            raise ShowSyncError("Only the leader can change the show")
+        changed = False
+        if "song" in message:
+            song = _number(message["song"], int, "song")
+            if not 0 <= song < max(1, self.song_count):
+                raise ShowSyncError(f"Song index {song} out of range")
+            if song != self.song:
+                # A new song starts paused at the top unless the same message says otherwise
+                self.song, self.scroll, self.playing = song, 0.0, False
+                changed = True
+        if "scroll" in message:
+            scroll = min(1.0, max(0.0, _number(message["scroll"], float, "scroll")))
+            changed = changed or scroll != self.scroll
+            self.scroll = scroll
+        if "playing" in message:
+            playing = bool(message["playing"])
+            changed = changed or playing != self.playing
+            self.playing = playing
+        if "speed" in message:
+            speed = min(MAX_SPEED, max(MIN_SPEED, _number(message["speed"], float, "speed")))
+            changed = changed or speed != self.speed
+            self.speed = speed
+        if changed:
+            self.touch()
+        return changed
+
+    def touch(self) -> None:
+        self.rev += 1
+        self.updated = time.time()
+
+
+def _number(value, kind, field: str):
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        raise ShowSyncError(f"Invalid {field}: {value!r}")
+
+
+class ShowSyncHub:
+    """All show sessions of this process; used from the event loop only."""
+
+    def __init__(self) -> None:
+        self.sessions: Dict[str, ShowSession] = {}
+
+    def session(self, setlist_id: str) -> Optional[ShowSession]:
+        return self.sessions.get(setlist_id)
+
+    def _prune(self) -> None:
+        cutoff = time.time() - SESSION_IDLE_SECONDS
+        for setlist_id, session in list(self.sessions.items()):
+            if not session.members and session.updated < cutoff:
+                del self.sessions[setlist_id]
+
+    def join(self, setlist_id: str, song_count: int, client_id: str, send: Sender,
+             lead: bool = False) -> Tuple[ShowSession, Member]:
+        """Add a device to a setlist's session (creating it) and send it the full state.
+
+        A device rejoining with its previous client id replaces its old
+        connection and keeps the lead if it had it. The first device to join
+        leads unless another device already does.
+        """
+        self._prune()
+        session = self.sessions.get(setlist_id)
+        if session is None:
+            session = self.sessions[setlist_id] = ShowSession(setlist_id, song_count)
+        session.song_count = song_count
+        session.song = min(session.song, max(0, song_count - 1))
+
+        previous = session.members.pop(client_id, None)
+        if previous is not None:
+            self._close_member(previous)
+        member = Member(client_id, send)
+        session.members[client_id] = member
+        member.writer = asyncio.ensure_future(member.run_writer(
+            lambda failed: self.leave(setlist_id, failed)))
+
+        if lead or session.leader is None:
+            session.leader = client_id
+        session.touch()
+        self.broadcast(session)
+        return session, member
+
+    def leave(self, setlist_id: str, member: Member) -> None:
+        """Remove a device; the lead is kept so a reconnecting leader resumes it."""
+        session = self.sessions.get(setlist_id)
+        if session is None or session.members.get(member.client_id) is not member:
+            self._close_member(member)
+            return
+        del session.members[member.client_id]
+        self._close_member(member)
+        session.touch()
+        self.broadcast(session)
+
+    def handle(self, session: ShowSession, member: Member, raw: str) -> None:
+        """Apply one client message and fan out the resulting state."""
+        try:
+            message = json.loads(raw)
+            if not isinstance(message, dict):
+                raise ShowSyncError("Messages must be JSON objects")
+        except ValueError as e:
+            member.reply({"type": "error", "detail": f"Invalid message: {e}"})
+            return
+
+        kind = message.get("type")
+        try:
+            if kind == "state":
+                if session.apply(member.client_id, message):
+                    # The leader already shows this state; only the rev matters to it
+                    self.broadcast(session, exclude=member)
+                    member.reply({"type": "ack", "rev": session.rev})
+            elif kind == "lead":
+                session.leader = member.client_id
+                session.touch()
+                self.broadcast(session)
+            elif kind == "release":
+                if session.leader == member.client_id:
+                    session.leader = None
+                    session.touch()
+                    self.broadcast(session)
+            elif kind == "resync":
+                member.offer_state(session.state())
+            elif kind == "ping":
+                # Echo the client's clock so it can measure the round trip
+                member.reply({"type": "pong", "t": message.get("t"), "server": time.time()})
+            else:
+                raise ShowSyncError(f"Unknown message type: {kind!r}")
+        except ShowSyncError as e:
+            member.reply({"type": "error", "detail": str(e)})
+            member.offer_state(session.state())
+
+    def broadcast(self, session: ShowSession, exclude: Optional[Member] = None) -> None:
+        state = session.state()
+        for member in session.members.values():
+            if member is not exclude:
+                member.offer_state(state)
+
+    @staticmethod
+    def _close_member(member: Member) -> None:
+        member.closed = True
+        member.wakeup.set()
+        if member.writer is not None and member.writer is not asyncio.current_task():
+            member.writer.cancel()
+
+
+_HUB = ShowSyncHub()
+
+
+def get_show_sync_hub() -> ShowSyncHub:
+    """The process-wide show sync hub."""
+    return _HUB
@@ -3,8 +3,18 @@
 import os
 import re
 import csv
+import io
+import time
+import atexit
+import threading
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Union
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Tuple, Optional, TypeVar, Union
+
+from .atomic_io import atomic_write, group_commit
+from .change_feed import CATALOG, DELETED, SAVED, SONG, publish_change
+from .file_locks import WriteConflict, content_version, file_lock
+from .storage import FileStorage
 
 
 def resolve_data_root(base_dir: Path) -> Path:
@@ -117,41 +127,47 @@ def combine_avg_length(minutes: int, seconds: int) -> Optional[int]:
     return total_seconds if total_seconds > 0 else None
 
 
+def song_from_csv_row(row: Mapping[str, Optional[str]]) -> Optional[Tuple[str, Dict]]:
+    """(title, song record) for one CSV row, or None for a row without a title."""
+    title = (row.get("title") or "").strip()
+    if not title:
+        return None
+    artist = (row.get("artist") or "").strip()
+    bpm_raw = (row.get("bpm") or "").strip()
+    try:
+        bpm = int(float(bpm_raw))
+    except (TypeError, ValueError):
+        bpm = 120
+    energy_level = (row.get("energy_level") or "standard").strip().lower()
+    energy_level = energy_level if energy_level in {"high", "standard", "low"} else "standard"
+    song_key = (row.get("song_key") or row.get("key") or "").strip()
+    has_horn = parse_bool(row.get("has_horn"))
+    is_jam_vehicle = parse_bool(row.get("is_jam_vehicle"))
+    avg_length_seconds = parse_avg_length_value(row.get("avg_length"))
+    duration_seconds = derive_song_duration(bpm, avg_length_seconds)
+
+    return title, {
+        'bpm': bpm,
+        'song_key': song_key,
+        'duration': duration_seconds,
+        'has_horn': has_horn,
+        'energy_level': energy_level,
+        'is_jam_vehicle': is_jam_vehicle,
+        'artist': artist,
+        'avg_length': avg_length_seconds,
+        'raw_line': f"{title} ({bpm})",
+    }
+
+
 def load_song_list_from_csv(song_file: Path) -> Dict[str, Dict]:
     """Load songs from CSV file."""
     songs: Dict[str, Dict] = {}
     try:
         with open(song_file, 'r', encoding='utf-8', newline='') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                title = (row.get("title") or "").strip()
-                if not title:
-                    continue
-                artist = (row.get("artist") or "").strip()
-                bpm_raw = (row.get("bpm") or "").strip()
-                try:
-                    bpm = int(float(bpm_raw))
-                except (TypeError, ValueError):
-                    bpm = 120
-                energy_level = (row.get("energy_level") or "standard").strip().lower()
-                energy_level = energy_level if energy_level in {"high", "standard", "low"} else "standard"
-                song_key = (row.get("song_key") or row.get("key") or "").strip()
-                has_horn = parse_bool(row.get("has_horn"))
-                is_jam_vehicle = parse_bool(row.get("is_jam_vehicle"))
-                avg_length_seconds = parse_avg_length_value(row.get("avg_length"))
-                duration_seconds = derive_song_duration(bpm, avg_length_seconds)
-
-                songs[title] = {
-                    'bpm': bpm,
-                    'song_key': song_key,
-                    'duration': duration_seconds,
-                    'has_horn': has_horn,
-                    'energy_level': energy_level,
-                    'is_jam_vehicle': is_jam_vehicle,
-                    'artist': artist,
-                    'avg_length': avg_length_seconds,
-                    'raw_line': f"{title} ({bpm})",
-                }
+            for row in csv.DictReader(f):
+                parsed = song_from_csv_row(row)
+                if parsed is not None:
+                    songs[parsed[0]] = parsed[1]
     except Exception as e:
         raise Exception(f"Error loading song list CSV: {e}")
     return songs
@@ -199,56 +215,206 @@ def load_song_list_from_markdown(song_file: Path) -> Dict[str, Dict]:
     return songs
 
 
-def load_song_list() -> Dict[str, Dict]:
-    """Load the complete song list, preferring CSV when available."""
+def resolve_song_list_source() -> Tuple[Path, str]:
+    """Pick the file the song list is loaded from. Returns (path, 'csv' | 'markdown')."""
     csv_path, md_path = get_songlist_load_paths()
     if csv_path.exists():
-        return load_song_list_from_csv(csv_path)
+        return csv_path, 'csv'
     if md_path.exists():
-        return load_song_list_from_markdown(md_path)
+        return md_path, 'markdown'
     if SONGLIST_CSV.exists():
-        return load_song_list_from_csv(SONGLIST_CSV)
-    return load_song_list_from_markdown(SONGLIST_MARKDOWN)
-
-
-def save_song_list_csv(songs_data: Dict[str, Dict]) -> bool:
-    """Save song metadata to CSV for editing outside the app (writing to all active targets)."""
-    targets = [SONGLIST_ROOT_DIR / "songlist_master.csv"]
-    if SONGLIST_SUB_DIR.exists():
-        targets.append(SONGLIST_SUB_DIR / "songlist_master.csv")
-
-    success = True
-    for target in targets:
+        return SONGLIST_CSV, 'csv'
+    return SONGLIST_MARKDOWN, 'markdown'
+
+
+def read_song_list_from_disk() -> Dict[str, Dict]:
+    """Parse the song list straight from disk, bypassing the in-memory catalog."""
+    source, kind = resolve_song_list_source()
+    if kind == 'csv':
+        return load_song_list_from_csv(source)
+    return load_song_list_from_markdown(source)
+
+
+class SongCatalog:
+    """Process-wide parsed song list, reparsed only when the source file changes.
+
+    The source file is identified by (path, mtime_ns, size, inode). Every reparse
+    bumps ``version``, so callers can use it as a cheap change token. While an
+    attached data watcher runs, the file is not stat'ed per call; the watcher's
+    change events invalidate the catalog instead.
+
+    Edits (``apply_edit``) replace the records at once and are served until
+    the CatalogWriter has written them out (``flushed``); meanwhile the file
+    is not reparsed, so an outside edit made in that window is overwritten.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._identity: Optional[Tuple] = None
+        self._songs: Mapping[str, Mapping] = MappingProxyType({})
+        self._version = 0
+        self._watcher = None
+        self._storage = FileStorage()
+        # Last edit applied in memory, and whether it is still waiting to be written
+        self._edit = 0
+        self._unflushed = False
+
+    @staticmethod
+    def _source_identity() -> Tuple[Path, str, Optional[Tuple[int, int, int]]]:
+        source, kind = resolve_song_list_source()
         try:
-            target.parent.mkdir(parents=True, exist_ok=True)
-            with open(target, 'w', encoding='utf-8', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=SONGLIST_CSV_HEADERS)
-                writer.writeheader()
-                for song_name in sorted(songs_data.keys()):
-                    song_info = songs_data[song_name]
-                    avg_length_value = song_info.get('avg_length')
-                    writer.writerow({
-                        "title": song_name,
-                        "artist": song_info.get('artist', ''),
-                        "bpm": song_info.get('bpm', ''),
-                        "song_key": song_info.get('song_key') or song_info.get('key', ''),
-                        "has_horn": song_info.get('has_horn', False),
-                        "energy_level": song_info.get('energy_level', 'standard'),
-                        "is_jam_vehicle": song_info.get('is_jam_vehicle', False),
-                        "avg_length": avg_length_value if avg_length_value is not None else '',
-                    })
-        except Exception as e:
-            print(f"Error saving song list CSV to {target}: {e}")
-            success = False
-    return success
+            st = os.stat(source)
+        except OSError:
+            return source, kind, None
+        return source, kind, (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def snapshot(self, fresh: bool = False) -> Tuple[int, Mapping[str, Mapping]]:
+        """Return (version, songs), reloading first if the source file changed.
+
+        ``fresh`` stats the file even while the watcher runs (writers under the file lock).
+        """
+        watcher = self._watcher
+        with self._lock:
+            if self._unflushed or (self._identity is not None and not fresh
+                                   and watcher is not None and watcher.running):
+                return self._version, self._songs
+        source, kind, stamp = self._source_identity()
+        identity = (str(source), stamp)
+        with self._lock:
+            if identity != self._identity:
+                parse = load_song_list_from_csv if kind == 'csv' else load_song_list_from_markdown
+                parsed = self._storage.load_songs(source, stamp, lambda: parse(source))
+                self._songs = MappingProxyType({
+                    title: MappingProxyType(info) for title, info in parsed.items()
+                })
+                self._identity = identity
+                self._version += 1
+            return self._version, self._songs
+
+    @property
+    def version(self) -> int:
+        return self.snapshot()[0]
+
+    @property
+    def fingerprint(self) -> str:
+        """Source file identity; unlike ``version`` it is the same in every process."""
+        self.snapshot()
+        if self._unflushed:
+            # Only this process serves the edit until it is written
+            return repr((self._identity, os.getpid(), self._edit))
+        return repr(self._identity)
+
+    def apply_edit(self, songs_data: Mapping[str, Mapping]) -> int:
+        """Serve ``songs_data`` from now on, as it will read back once written. Returns the edit number."""
+        records = {}
+        for title in sorted(songs_data):
+            parsed = song_from_csv_row(song_csv_row(title, songs_data[title]))
+            if parsed is not None:
+                records[parsed[0]] = MappingProxyType(parsed[1])
+        with self._lock:
+            self._songs = MappingProxyType(records)
+            self._version += 1
+            self._edit += 1
+            self._unflushed = True
+            return self._edit
+
+    def flushed(self, edit: int) -> None:
+        """Edit ``edit`` is on disk; adopt the written file unless a newer edit is pending."""
+        source, _, stamp = self._source_identity()
+        with self._lock:
+            if edit != self._edit:
+                return
+            self._unflushed = False
+            self._identity = (str(source), stamp)
+            songs, storage = self._songs, self._storage
+        # The sqlite backend's copy must match the file too, or an export would revert the edit
+        storage.store_songs(source, stamp, songs)
+
+    @property
+    def unflushed(self) -> bool:
+        return self._unflushed
+
+    def songs(self) -> Mapping[str, Mapping]:
+        """Read-only view of the catalog; records must not be mutated."""
+        return self.snapshot()[1]
+
+    def invalidate(self) -> None:
+        """Force a reparse on next access (used after in-process writes)."""
+        with self._lock:
+            self._identity = None
+
+    def attach_watcher(self, watcher) -> None:
+        """Skip per-call stats while ``watcher`` (a file_watcher.DataWatcher) is running."""
+        self._watcher = watcher
+
+    def attach_storage(self, storage: FileStorage) -> None:
+        """Read parsed songs through ``storage`` (see core.storage)."""
+        with self._lock:
+            self._storage = storage
+            self._identity = None
+
+    def on_changes(self, events) -> None:
+        """Data watcher subscriber for song list changes."""
+        self.invalidate()
+
+
+_CATALOG = SongCatalog()
+
+
+def get_song_catalog() -> Mapping[str, Mapping]:
+    """Read-only song catalog shared across requests."""
+    return _CATALOG.songs()
+
+
+def get_catalog_cache() -> SongCatalog:
+    """The shared song catalog cache."""
+    return _CATALOG
+
+
+def get_catalog_snapshot() -> Tuple[int, Mapping[str, Mapping]]:
+    """Catalog version and read-only songs, taken atomically."""
+    return _CATALOG.snapshot()
+
+
+def invalidate_song_catalog() -> None:
+    """Drop the cached catalog so the next read reparses the source file."""
+    _CATALOG.invalidate()
 
 
-def save_song_list_markdown(songs_data: Dict[str, Dict]) -> bool:
-    """Save the updated song list back to the markdown file."""
-    targets = [SONGLIST_ROOT_DIR / "Buckingham Conspiracy 3.0  SONG LIST.md"]
-    if SONGLIST_SUB_DIR.exists():
-        targets.append(SONGLIST_SUB_DIR / "Buckingham Conspiracy 3.0  SONG LIST.md")
+def load_song_list() -> Dict[str, Dict]:
+    """Load the complete song list, preferring CSV when available.
+
+    Returns a mutable copy of the cached catalog, safe for read-modify-write callers.
+    """
+    return {title: dict(info) for title, info in get_song_catalog().items()}
+
+
+def song_csv_row(title: str, song_info: Mapping) -> Dict[str, str]:
+    """CSV row for a song, as csv.DictWriter would write it."""
+    avg_length_value = song_info.get('avg_length')
+    row = {
+        "title": title,
+        "artist": song_info.get('artist', ''),
+        "bpm": song_info.get('bpm', ''),
+        "song_key": song_info.get('song_key') or song_info.get('key', ''),
+        "has_horn": song_info.get('has_horn', False),
+        "energy_level": song_info.get('energy_level', 'standard'),
+        "is_jam_vehicle": song_info.get('is_jam_vehicle', False),
+        "avg_length": avg_length_value if avg_length_value is not None else '',
+    }
+    return {key: '' if value is None else str(value) for key, value in row.items()}
+
+
+def render_song_list_csv(songs_data: Mapping[str, Mapping]) -> str:
+    buffer = io.StringIO(newline='')
+    writer = csv.DictWriter(buffer, fieldnames=SONGLIST_CSV_HEADERS)
+    writer.writeheader()
+    for song_name in sorted(songs_data.keys()):
+        writer.writerow(song_csv_row(song_name, songs_data[song_name]))
+    return buffer.getvalue()
 
+
+def render_song_list_markdown(songs_data: Mapping[str, Mapping]) -> str:
     content = "# ****Buckingham Conspiracy 3.0 : SONG LIST ****  \n  \n#   \n"
 
     for song_name in sorted(songs_data.keys()):
@@ -262,42 +428,269 @@ def save_song_list_markdown(songs_data: Dict[str, Dict]) -> bool:
         content += line + "  \n"
 
     content += "  \n  \n#   \n  \n"
+    return content
 
-    success = True
-    for target in targets:
-        try:
-            target.parent.mkdir(parents=True, exist_ok=True)
-            with open(target, 'w', encoding='utf-8') as f:
-                f.write(content)
-        except Exception as e:
-            print(f"Error saving song list markdown to {target}: {e}")
-            success = False
+
+def song_list_targets() -> List[Tuple[Path, str]]:
+    """Every (file, 'csv' | 'markdown') the song list is written to."""
+    targets = [(SONGLIST_ROOT_DIR / "songlist_master.csv", 'csv'),
+               (SONGLIST_ROOT_DIR / "Buckingham Conspiracy 3.0  SONG LIST.md", 'markdown')]
+    if SONGLIST_SUB_DIR.exists():
+        targets += [(SONGLIST_SUB_DIR / "songlist_master.csv", 'csv'),
+                    (SONGLIST_SUB_DIR / "Buckingham Conspiracy 3.0  SONG LIST.md", 'markdown')]
+    return targets
+
+
+def write_song_list_files(songs_data: Mapping[str, Mapping], targets: List[Tuple[Path, str]]) -> bool:
+    """Render the song list once per format and write every target in one atomic group commit."""
+    rendered = {'csv': render_song_list_csv(songs_data), 'markdown': render_song_list_markdown(songs_data)}
+    try:
+        with group_commit():
+            for target, kind in targets:
+                atomic_write(target, rendered[kind], newline='' if kind == 'csv' else None)
+    except Exception as e:
+        print(f"Error saving song list to {', '.join(str(target) for target, _ in targets)}: {e}")
+        return False
+    return True
+
+
+def save_song_list_csv(songs_data: Dict[str, Dict]) -> bool:
+    """Save song metadata to CSV for editing outside the app (writing to all active targets)."""
+    success = write_song_list_files(songs_data, [t for t in song_list_targets() if t[1] == 'csv'])
+    invalidate_song_catalog()
+    return success
+
+
+def save_song_list_markdown(songs_data: Dict[str, Dict]) -> bool:
+    """Save the updated song list back to the markdown file."""
+    success = write_song_list_files(songs_data, [t for t in song_list_targets() if t[1] == 'markdown'])
+    invalidate_song_catalog()
     return success
 
 
+# Quiet period after the last edit before the song list is written
+CATALOG_FLUSH_DELAY = float(os.getenv("BCH_CATALOG_FLUSH_SECONDS", "0.5"))
+# An edit is never left unwritten for longer than this, even during a steady stream of edits
+CATALOG_FLUSH_MAX_DELAY = float(os.getenv("BCH_CATALOG_FLUSH_MAX_SECONDS", "2.0"))
+# Server worker processes sharing the data directory. Write-behind is per process,
+# so with several workers every edit is written before its request returns.
+SERVER_WORKERS = max(1, int(os.getenv("BCH_WORKERS", "1")))
+
+
+def song_list_lock_target() -> Path:
+    """The file whose lock guards every song list write (see core.file_locks)."""
+    return SONGLIST_ROOT_DIR / "songlist_master.csv"
+
+
+class CatalogWriter:
+    """Write-behind persistence for song list edits.
+
+    ``submit`` applies an edit to the in-memory catalog and returns at once; a
+    background thread writes the newest pending catalog once the edits pause
+    for ``delay`` seconds, and no later than ``max_delay`` seconds after the
+    first unwritten edit. A burst of edits therefore costs one atomic write
+    per target file. ``flush`` writes synchronously (shutdown, tests); edits
+    not yet flushed are lost only if the process dies within that window.
+    A failed write keeps the edit pending and is retried. With ``delay`` <= 0
+    every submit writes before returning.
+    """
+
+    def __init__(self, catalog: SongCatalog, delay: float = CATALOG_FLUSH_DELAY,
+                 max_delay: float = CATALOG_FLUSH_MAX_DELAY) -> None:
+        self.catalog = catalog
+        self.delay = delay
+        self.max_delay = max(delay, max_delay)
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._pending: Optional[Tuple[int, Dict[str, Dict], List[Tuple[Path, str]]]] = None
+        self._first_edit = 0.0
+        self._last_edit = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.edits = 0
+        self.flushes = 0
+
+    def submit(self, songs_data: Mapping[str, Mapping]) -> bool:
+        """Apply an edit now and schedule it to be written; True unless a synchronous write failed."""
+        snapshot = {title: dict(info) for title, info in songs_data.items()}
+        targets = song_list_targets()
+        with self._cond:
+            edit = self.catalog.apply_edit(snapshot)
+            now = time.monotonic()
+            if self._pending is None:
+                self._first_edit = now
+            self._last_edit = now
+            self._pending = (edit, snapshot, targets)
+            self.edits += 1
+            synchronous = self.delay <= 0 or self._closed
+            if not synchronous:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="catalog-writer", daemon=True)
+                    self._thread.start()
+                self._cond.notify()
+        return self.flush() if synchronous else True
+
+    @property
+    def pending(self) -> bool:
+        return self._pending is not None
+
+    def _due(self) -> float:
+        return min(self._last_edit + self.delay, self._first_edit + self.max_delay)
+
+    def _run(self) -> None:
+        with self._cond:
+            while not self._closed:
+                if self._pending is None:
+                    self._cond.wait()
+                    continue
+                remaining = self._due() - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                self._cond.release()
+                try:
+                    self.flush()
+                finally:
+                    self._cond.acquire()
+
+    def flush(self) -> bool:
+        """Write the pending edit now. Returns False if a target could not be written."""
+        try:
+            # The file lock is always taken before _flush_lock, also by submitting writers
+            with file_lock(song_list_lock_target()), self._flush_lock:
+                with self._cond:
+                    pending, self._pending = self._pending, None
+                if pending is None:
+                    return True
+                edit, songs_data, targets = pending
+                if not write_song_list_files(songs_data, targets):
+                    with self._cond:
+                        if self._pending is None:
+                            # Retry after another quiet period
+                            self._pending = pending
+                            self._first_edit = self._last_edit = time.monotonic()
+                    return False
+                self.catalog.flushed(edit)
+                self.flushes += 1
+                return True
+        except WriteConflict as e:
+            print(f"Song list write postponed: {e}")
+            return False
+
+    def close(self) -> bool:
+        """Flush and stop the background thread; later submits write synchronously."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+        return self.flush()
+
+
+_WRITER = CatalogWriter(_CATALOG, delay=CATALOG_FLUSH_DELAY if SERVER_WORKERS == 1 else 0)
+# Last resort for scripts; the app flushes in its lifespan shutdown
+atexit.register(_WRITER.close)
+
+
+# Above this many changed songs in one save, only a catalog-wide event is published
+MAX_SONG_CHANGE_EVENTS = 20
+
+
+def catalog_changes(before: Mapping[str, Mapping], after: Mapping[str, Mapping]) -> List[Tuple[str, str]]:
+    """(song title, saved/deleted) for every song that differs between two catalogs."""
+    changes = [(title, DELETED) for title in before if title not in after]
+    for title, info in after.items():
+        previous = before.get(title)
+        if previous is None or dict(previous) != dict(info):
+            changes.append((title, SAVED))
+    return changes
+
+
 def save_song_list(songs_data: Dict[str, Dict]) -> bool:
-    """Save song data to CSV and markdown for compatibility."""
+    """Save song data to CSV and markdown for compatibility.
+
+    The catalog serves the edit immediately; the files are written behind (see CatalogWriter).
+    Read-modify-write callers should use update_song_list so edits from other workers aren't lost.
+    """
     try:
-        csv_ok = save_song_list_csv(songs_data)
-        md_ok = save_song_list_markdown(songs_data)
-        return csv_ok or md_ok
-    except Exception:
+        with file_lock(song_list_lock_target()):
+            before = get_song_catalog()
+            saved = _WRITER.submit(songs_data)
+        changes = catalog_changes(before, songs_data)
+        if len(changes) <= MAX_SONG_CHANGE_EVENTS:
+            for title, action in changes:
+                publish_change(SONG, title, action)
+        publish_change(CATALOG)
+        return saved
+    except WriteConflict:
+        raise
+    except Exception as e:
+        print(f"Error saving song list: {e}")
         return False
 
 
+T = TypeVar("T")
+
+
+def update_song_list(mutate: Callable[[Dict[str, Dict]], T]) -> T:
+    """Apply ``mutate`` to the latest song list and save it, holding the song list lock throughout.
+
+    ``mutate`` edits the dict in place; if it raises, nothing is saved. Concurrent
+    updates from other threads or worker processes run one after another.
+    """
+    with file_lock(song_list_lock_target()):
+        _CATALOG.snapshot(fresh=True)
+        songs_data = load_song_list()
+        result = mutate(songs_data)
+        if not save_song_list(songs_data):
+            raise Exception("Failed to save the song list")
+        return result
+
+
+def song_version(title: str, song_info: Mapping) -> str:
+    """Optimistic version of one song's record, for edit forms (see core.file_locks)."""
+    return content_version("\x1f".join(song_csv_row(title, song_info).values()))
+
+
+def check_song_version(songs_data: Mapping[str, Mapping], title: str, expected: Optional[str]) -> None:
+    """Raise WriteConflict if ``title`` changed since the edit form showed version ``expected``."""
+    if expected is None or title not in songs_data:
+        return
+    if song_version(title, songs_data[title]) != expected:
+        raise WriteConflict(f"'{title}' was changed by someone else since you opened it; reload and try again")
+
+
+def get_catalog_writer() -> CatalogWriter:
+    """The shared write-behind writer for song list edits."""
+    return _WRITER
+
+
+def flush_song_catalog() -> bool:
+    """Write any pending song list edit now (app shutdown, before reading the files directly)."""
+    return _WRITER.flush()
+
+
+def close_catalog_writer() -> bool:
+    """Flush pending song list edits and stop the background writer."""
+    return _WRITER.close()
+
+
 def delete_song_from_catalog(song_name: str) -> bool:
     """Remove a song from the catalog and update CSV and markdown files."""
-    songs_data = load_song_list()
-    matched_key = None
-    for name in songs_data.keys():
-        if name.lower() == song_name.lower():
-            matched_key = name
-            break
-    if not matched_key:
-        return False
-    
-    del songs_data[matched_key]
-    return save_song_list(songs_data)
+    with file_lock(song_list_lock_target()):
+        _CATALOG.snapshot(fresh=True)
+        songs_data = load_song_list()
+        matched_key = None
+        for name in songs_data.keys():
+            if name.lower() == song_name.lower():
+                matched_key = name
+                break
+        if not matched_key:
+            return False
+
+        del songs_data[matched_key]
+        return save_song_list(songs_data)
 
 
 def get_song_stats(songs_data: Dict[str, Dict]) -> Dict[str, Union[int, float]]:
@@ -0,0 +1,241 @@
+"""Indexed queries over the song catalog for the library list.
+
+A SongLibraryIndex is built once per catalog version. Filters are integer
+bitmaps (bit i = i-th song in catalog order) AND-ed together in C, the BPM
+range is a bisect over the sorted distinct BPMs and their cumulative masks,
+text search intersects precomputed character-bigram masks and only checks the
+surviving songs, and every sort order is precomputed. A query then costs
+about the size of its page rather than the size of the catalog.
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .song_manager import get_catalog_snapshot
+
+ENERGY_LEVELS = ('high', 'standard', 'low')
+
+# Sort keys accepted by the library list; anything else keeps catalog order
+SORT_KEYS = {
+    'title': lambda name, info: name.lower(),
+    'artist': lambda name, info: (info.get('artist') or '').lower(),
+    'bpm': lambda name, info: info.get('bpm') or 0,
+    'duration': lambda name, info: info.get('duration') or 0,
+}
+
+# Separates title from artist in the search keys; never part of a query
+_FIELD_SEP = '\x00'
+
+# Recent search masks kept per index, so paging through results doesn't search again
+SEARCH_CACHE_SIZE = 64
+
+
+class InvalidCursor(ValueError):
+    """A pagination cursor that does not name a song in the current catalog."""
+
+
+def _mask(indexes: Iterable[int], size: int) -> int:
+    """Bitmap with the given bits set, built as a digit string instead of one shift per bit."""
+    digits = bytearray(b'0' * size)
+    for i in indexes:
+        digits[i] = 0x31
+    digits.reverse()
+    return int(digits, 2) if size else 0
+
+
+class SongLibraryIndex:
+    """Immutable query structures for one catalog version."""
+
+    def __init__(self, version: int, songs: Mapping[str, Mapping]) -> None:
+        self.version = version
+        self.songs = songs
+        self.names: List[str] = list(songs)
+        self.position: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        size = len(self.names)
+        self.all_mask = (1 << size) - 1
+
+        infos = [songs[name] for name in self.names]
+        self.energy_masks = {
+            level: _mask((i for i, info in enumerate(infos) if info.get('energy_level') == level), size)
+            for level in ENERGY_LEVELS
+        }
+        self.flag_masks: Dict[Tuple[str, bool], int] = {}
+        for flag in ('has_horn', 'is_jam_vehicle'):
+            for value in (True, False):
+                self.flag_masks[(flag, value)] = _mask(
+                    (i for i, info in enumerate(infos) if info.get(flag) == value), size)
+
+        # below_bpm[j] holds every song slower than bpm_values[j]
+        by_bpm: Dict[int, List[int]] = {}
+        for i, info in enumerate(infos):
+            by_bpm.setdefault(info.get('bpm') or 0, []).append(i)
+        self.bpm_values = sorted(by_bpm)
+        self.below_bpm = [0]
+        for bpm in self.bpm_values:
+            self.below_bpm.append(self.below_bpm[-1] | _mask(by_bpm[bpm], size))
+
+        # Lowercase "title\x00artist" keys, and a mask per 1- and 2-character substring
+        self.search_keys = [name.lower() + _FIELD_SEP + (info.get('artist') or '').lower()
+                            for name, info in zip(self.names, infos)]
+        grams: Dict[str, List[int]] = {}
+        for i, text in enumerate(self.search_keys):
+            for gram in set(text) | {text[j:j + 2] for j in range(len(text) - 1)}:
+                if _FIELD_SEP not in gram:
+                    grams.setdefault(gram, []).append(i)
+        self.gram_masks = {gram: _mask(indexes, size) for gram, indexes in grams.items()}
+        self._search_cache: "OrderedDict[str, int]" = OrderedDict()
+        self._search_lock = threading.Lock()
+
+        # Both directions are sorted separately so ties keep catalog order either way
+        self.orderings: Dict[Tuple[str, bool], List[int]] = {}
+        self.ranks: Dict[Tuple[str, bool], List[int]] = {}
+        for sort_by, key in SORT_KEYS.items():
+            keys = [key(name, info) for name, info in zip(self.names, infos)]
+            for reverse in (False, True):
+                order = sorted(range(size), key=keys.__getitem__, reverse=reverse)
+                rank = [0] * size
+                for r, i in enumerate(order):
+                    rank[i] = r
+                self.orderings[(sort_by, reverse)] = order
+                self.ranks[(sort_by, reverse)] = rank
+
+    def search_mask(self, text: str) -> int:
+        """Songs whose lowercase title or artist contains ``text``."""
+        needle = text.lower()
+        with self._search_lock:
+            mask = self._search_cache.get(needle)
+            if mask is not None:
+                self._search_cache.move_to_end(needle)
+                return mask
+
+        if _FIELD_SEP in needle:
+            mask = 0
+        elif len(needle) <= 2:
+            mask = self.gram_masks.get(needle, 0)
+        else:
+            # Every bigram of the needle must occur; only those candidates are checked
+            candidates = self.all_mask
+            for j in range(len(needle) - 1):
+                candidates &= self.gram_masks.get(needle[j:j + 2], 0)
+                if not candidates:
+                    break
+            bits = format(candidates, 'b')[::-1]
+            keys, hits = self.search_keys, []
+            i = bits.find('1') if candidates else -1
+            while i != -1:
+                if needle in keys[i]:
+                    hits.append(i)
+                i = bits.find('1', i + 1)
+            mask = _mask(hits, len(keys))
+
+        with self._search_lock:
+            self._search_cache[needle] = mask
+            while len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+        return mask
+
+    def bpm_mask(self, min_bpm: Optional[int], max_bpm: Optional[int]) -> int:
+        """Songs with min_bpm <= bpm <= max_bpm; a falsy bound is open."""
+        lo = bisect_left(self.bpm_values, min_bpm) if min_bpm else 0
+        hi = bisect_right(self.bpm_values, max_bpm) if max_bpm else len(self.bpm_values)
+        if hi <= lo:
+            return 0
+        return self.below_bpm[hi] & ~self.below_bpm[lo]
+
+    def query(
+        self,
+        search: Optional[str] = None,
+        energy_level: Optional[str] = None,
+        has_horn: Optional[bool] = None,
+        is_jam_vehicle: Optional[bool] = None,
+        min_bpm: Optional[int] = None,
+        max_bpm: Optional[int] = None,
+        sort_by: Optional[str] = "title",
+        sort_order: Optional[str] = "asc",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[str], int, Optional[str]]:
+        """(page of song names, total matches, next cursor or None).
+
+        ``cursor`` is the last song name of the previous page, as returned in
+        ``next_cursor``; it raises InvalidCursor if that song is gone.
+        """
+        mask = self.all_mask
+        if search:
+            mask &= self.search_mask(search)
+        if energy_level:
+            mask &= self.energy_masks.get(energy_level, 0)
+        if has_horn is not None:
+            mask &= self.flag_masks[('has_horn', has_horn)]
+        if is_jam_vehicle is not None:
+            mask &= self.flag_masks[('is_jam_vehicle', is_jam_vehicle)]
+        if min_bpm or max_bpm:
+            mask &= self.bpm_mask(min_bpm, max_bpm)
+        total = mask.bit_count()
+
+        key = (sort_by, sort_order == "desc")
+        order = self.orderings.get(key)
+        rank = self.ranks.get(key)
+        start = 0
+        if cursor is not None:
+            if cursor not in self.position:
+                raise InvalidCursor(f"Unknown cursor song '{cursor}'")
+            i = self.position[cursor]
+            start = (rank[i] if rank else i) + 1
+
+        # One extra row tells whether there is a next page
+        want = limit + 1 if limit else total
+        # bits[i] == '1' tests membership without shifting a catalog-sized integer
+        bits = format(mask, 'b')[::-1]
+        page: List[int] = []
+        if order is None:
+            # Catalog order is bit order
+            i = bits.find('1', start)
+            while i != -1 and len(page) < want:
+                page.append(i)
+                i = bits.find('1', i + 1)
+        elif total * total * 8 < want * len(order):
+            # Few matches: sort them by rank instead of walking the ordering
+            i = bits.find('1')
+            while i != -1:
+                if rank[i] >= start:
+                    page.append(i)
+                i = bits.find('1', i + 1)
+            page.sort(key=rank.__getitem__)
+            del page[want:]
+        else:
+            width = len(bits)
+            for i in order[start:]:
+                if i < width and bits[i] == '1':
+                    page.append(i)
+                    if len(page) == want:
+                        break
+
+        next_cursor = None
+        if limit and len(page) > limit:
+            del page[limit:]
+            next_cursor = self.names[page[-1]]
+        return [self.names[i] for i in page], total, next_cursor
+
+
+_INDEX: Optional[SongLibraryIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_song_library_index() -> SongLibraryIndex:
+    """Query index for the current catalog, rebuilt when the catalog version changes."""
+    global _INDEX
+    version, songs = get_catalog_snapshot()
+    with _INDEX_LOCK:
+        if _INDEX is None or _INDEX.version != version:
+            _INDEX = SongLibraryIndex(version, songs)
+        return _INDEX
+
+
+def query_song_library(**filters) -> Tuple[Mapping[str, Mapping], List[str], int, Optional[str]]:
+    """(catalog, page of song names, total matches, next cursor) for SongLibraryIndex.query filters."""
+    index = get_song_library_index()
+    names, total, next_cursor = index.query(**filters)
+    return index.songs, names, total, next_cursor
@@ -0,0 +1,165 @@
+"""Search-as-you-type suggestions over song titles and artists.
+
+Titles and artists are split into folded words (lowercase ASCII, apostrophes
+dropped) and the distinct words go into a trie. Each query word is matched as
+a prefix within a small edit distance by walking the trie with a Levenshtein
+row, so "drems" still finds "Dreams" and "fleetw" finds "Fleetwood Mac".
+Every query word must match a word of the suggestion; suggestions are ranked
+by total edit distance, then by whether the name starts with the query.
+"""
+
+import heapq
+import re
+import threading
+import unicodedata
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from .song_manager import get_catalog_snapshot
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Suggestions returned when the caller doesn't ask for a number
+DEFAULT_SUGGESTIONS = 8
+
+
+def fold(text: str) -> str:
+    """Lowercase ASCII with apostrophes removed: "Don’t Stop" -> "dont stop"."""
+    ascii_text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return ascii_text.lower().replace("'", "")
+
+
+def words(text: str) -> List[str]:
+    return WORD_PATTERN.findall(fold(text))
+
+
+def max_typos(token: str) -> int:
+    """Edits allowed for a query word: none for 1-2 letters, one up to 5, then two."""
+    if len(token) <= 2:
+        return 0
+    return 1 if len(token) <= 5 else 2
+
+
+class _Node:
+    __slots__ = ('children', 'word_ids')
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node"] = {}
+        # Every vocabulary word at or below this node
+        self.word_ids: List[int] = []
+
+
+class SongSuggestIndex:
+    """Trie over the words of every title and artist for one catalog version."""
+
+    def __init__(self, version: int, songs: Mapping[str, Mapping]) -> None:
+        self.version = version
+        # (kind, display name, artist or song count, folded name)
+        self.entries: List[Tuple[str, str, object, str]] = []
+        artist_songs: Dict[str, int] = {}
+        for title, info in songs.items():
+            artist = (info.get('artist') or '').strip()
+            self.entries.append(('song', title, artist, fold(title)))
+            if artist:
+                artist_songs[artist] = artist_songs.get(artist, 0) + 1
+        for artist, count in artist_songs.items():
+            self.entries.append(('artist', artist, count, fold(artist)))
+
+        self.vocabulary: List[str] = []
+        self.postings: List[List[int]] = []
+        word_ids: Dict[str, int] = {}
+        for entry_id, entry in enumerate(self.entries):
+            for word in set(WORD_PATTERN.findall(entry[3])):
+                if word not in word_ids:
+                    word_ids[word] = len(self.vocabulary)
+                    self.vocabulary.append(word)
+                    self.postings.append([])
+                self.postings[word_ids[word]].append(entry_id)
+
+        self.root = _Node()
+        for word_id, word in enumerate(self.vocabulary):
+            node = self.root
+            node.word_ids.append(word_id)
+            for char in word:
+                node = node.children.setdefault(char, _Node())
+                node.word_ids.append(word_id)
+
+    def match_word(self, token: str, budget: Optional[int] = None) -> Dict[int, int]:
+        """{word id: edits} for vocabulary words that start with ``token`` within ``budget`` edits.
+
+        The budget defaults to max_typos(token).
+        """
+        if budget is None:
+            budget = max_typos(token)
+        matches: Dict[int, int] = {}
+        stack = [(self.root, list(range(len(token) + 1)))]
+        while stack:
+            node, row = stack.pop()
+            for char, child in node.children.items():
+                next_row = [row[0] + 1]
+                for i, token_char in enumerate(token, 1):
+                    next_row.append(min(next_row[i - 1] + 1, row[i] + 1,
+                                        row[i - 1] + (token_char != char)))
+                distance = next_row[-1]
+                if distance <= budget:
+                    # This prefix matches, so every word below it does
+                    for word_id in child.word_ids:
+                        if distance < matches.get(word_id, budget + 1):
+                            matches[word_id] = distance
+                if min(next_row) <= budget and distance > 0:
+                    stack.append((child, next_row))
+        return matches
+
+    def suggest(self, query: str, limit: int = DEFAULT_SUGGESTIONS) -> List[Dict]:
+        """Top ``limit`` songs and artists for a partly typed, possibly misspelled query."""
+        tokens = words(query)
+        if not tokens or limit <= 0:
+            return []
+
+        scores: Optional[Dict[int, int]] = None
+        for token in tokens:
+            token_scores: Dict[int, int] = {}
+            for word_id, distance in self.match_word(token).items():
+                for entry_id in self.postings[word_id]:
+                    if distance < token_scores.get(entry_id, distance + 1):
+                        token_scores[entry_id] = distance
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {entry_id: total + token_scores[entry_id]
+                          for entry_id, total in scores.items() if entry_id in token_scores}
+            if not scores:
+                return []
+
+        folded_query = ' '.join(tokens)
+        entries = self.entries
+
+        def rank(entry_id: int) -> Tuple:
+            kind, name, _, folded = entries[entry_id]
+            return (scores[entry_id], not folded.startswith(folded_query), kind != 'song', len(name), name)
+
+        results = []
+        for entry_id in heapq.nsmallest(limit, scores, key=rank):
+            kind, name, extra, _ = entries[entry_id]
+            suggestion = {'type': kind, 'name': name, 'distance': scores[entry_id]}
+            suggestion['artist' if kind == 'song' else 'songs'] = extra
+            results.append(suggestion)
+        return results
+
+
+_INDEX: Optional[SongSuggestIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_song_suggest_index() -> SongSuggestIndex:
+    """Suggestion index for the current catalog, rebuilt when the catalog version changes."""
+    global _INDEX
+    version, songs = get_catalog_snapshot()
+    with _INDEX_LOCK:
+        if _INDEX is None or _INDEX.version != version:
+            _INDEX = SongSuggestIndex(version, songs)
+        return _INDEX
+
+
+def suggest_songs(query: str, limit: int = DEFAULT_SUGGESTIONS) -> List[Dict]:
+    """Ranked song and artist suggestions for a search box."""
+    return get_song_suggest_index().suggest(query, limit)
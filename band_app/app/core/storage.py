@@ -0,0 +1,469 @@
+"""Storage backends for songs, setlists and lyrics.
+
+The CSV/markdown/txt layout under the data directory is always kept current:
+it is what Obsidian and the Streamlit app edit. A backend decides where the
+app reads parsed data from, and is selected with ``BCH_STORAGE_BACKEND``:
+
+``files`` (default)
+    Parse the flat files directly, as the managers always have.
+``sqlite``
+    A SQLite database (WAL mode) holding the parsed catalog, every setlist
+    with its entries indexed by normalised song name, and the lyrics with an
+    FTS5 full-text index. Each record carries the (mtime_ns, size) of the file
+    it came from, so edits made outside the app are imported the next time
+    that file is read, and an unchanged archive is loaded without reparsing a
+    single markdown file. ``export_to_files`` writes the database back out to
+    the flat layout.
+
+The managers hold a FileStorage until ``open_storage()`` (app startup)
+attaches the configured backend to their caches.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .atomic_io import atomic_write, group_commit
+from .lyrics_index import LYRICS_RESCAN_INTERVAL, MAX_SNIPPETS, parse_query, tokenize
+
+# files or sqlite
+STORAGE_BACKEND = os.getenv("BCH_STORAGE_BACKEND", "files").lower()
+# Database location; defaults to a dotfile in the data directory, which the data watcher ignores
+SQLITE_PATH = os.getenv("BCH_SQLITE_PATH", "")
+SQLITE_FILENAME = ".band_hub.sqlite3"
+
+Stamp = Tuple[int, int]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS songs (
+    title TEXT PRIMARY KEY,
+    artist TEXT NOT NULL DEFAULT '',
+    bpm INTEGER,
+    energy_level TEXT,
+    has_horn INTEGER NOT NULL DEFAULT 0,
+    is_jam_vehicle INTEGER NOT NULL DEFAULT 0,
+    info TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS songs_artist ON songs (artist COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS setlists (
+    path TEXT PRIMARY KEY,
+    venue_dir TEXT NOT NULL,
+    stamp TEXT NOT NULL,
+    venue TEXT,
+    date TEXT,
+    markdown TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS setlist_entries (
+    path TEXT NOT NULL REFERENCES setlists (path) ON DELETE CASCADE,
+    set_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    norm_name TEXT NOT NULL,
+    bpm INTEGER,
+    is_segue INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (path, set_key, position)
+);
+CREATE INDEX IF NOT EXISTS setlist_entries_song ON setlist_entries (norm_name);
+CREATE TABLE IF NOT EXISTS lyrics (
+    id INTEGER PRIMARY KEY,
+    song_name TEXT NOT NULL UNIQUE,
+    stamp TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS lyrics_fts USING fts5 (
+    song_name, content, content='lyrics', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS lyrics_ai AFTER INSERT ON lyrics BEGIN
+    INSERT INTO lyrics_fts (rowid, song_name, content) VALUES (new.id, new.song_name, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS lyrics_ad AFTER DELETE ON lyrics BEGIN
+    INSERT INTO lyrics_fts (lyrics_fts, rowid, song_name, content)
+    VALUES ('delete', old.id, old.song_name, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS lyrics_au AFTER UPDATE ON lyrics BEGIN
+    INSERT INTO lyrics_fts (lyrics_fts, rowid, song_name, content)
+    VALUES ('delete', old.id, old.song_name, old.content);
+    INSERT INTO lyrics_fts (rowid, song_name, content) VALUES (new.id, new.song_name, new.content);
+END;
+"""
+
+
+def _stamp_text(stamp) -> str:
+    return json.dumps(list(stamp) if stamp is not None else None)
+
+
+def _songs_source_key(source: Path, stamp) -> str:
+    return json.dumps([str(source), _stamp_text(stamp)])
+
+
+class FileStorage:
+    """Flat files only: every hook hands the work straight back to the file parsers."""
+
+    name = "files"
+
+    def load_songs(self, source: Path, stamp, parse: Callable[[], Dict[str, Dict]]) -> Dict[str, Dict]:
+        """Songs for the song list file ``source`` at ``stamp``; ``parse`` reads the file."""
+        return parse()
+
+    def store_songs(self, source: Path, stamp, songs: Mapping[str, Mapping]) -> None:
+        """The app wrote ``songs`` to the song list file ``source``, which is now at ``stamp``."""
+
+    def load_setlist(self, file_path: str, venue_dir: str, stamp: Stamp,
+                     parse: Callable[[str, str], Dict]) -> Dict:
+        """Parsed setlist for ``file_path`` at ``stamp``; ``parse`` reads the file."""
+        return parse(file_path, venue_dir)
+
+    def forget_setlists(self, file_paths: Iterable[str]) -> None:
+        """Setlist files that no longer exist."""
+
+    def song_postings(self, song_name: str, partial: bool = False) -> Optional[Dict[str, List[Tuple[str, int]]]]:
+        """{setlist file: [(set key, position), ...]} for a song, or None to use the in-memory SongPlayIndex."""
+        return None
+
+    def search_lyrics(self, lyrics_dir: Path, query: str, limit: Optional[int] = None) -> Optional[List[Dict]]:
+        """Ranked lyrics matches, or None to use the in-memory LyricsIndex."""
+        return None
+
+    def invalidate_lyrics(self) -> None:
+        """Lyrics files were written in-process."""
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteStorage(FileStorage):
+    """SQLite store synchronised with the flat files by file stamp.
+
+    One connection per thread; WAL lets request threads read while another
+    thread (or worker process) writes.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._lyrics_lock = threading.Lock()
+        self._lyrics_synced: Optional[float] = None
+        self._db().executescript(SCHEMA)
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None,
+                                 check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA foreign_keys=ON")
+            self._local.db = db
+            with self._connections_lock:
+                self._connections.append(db)
+        return db
+
+    class _Transaction:
+        def __init__(self, db: sqlite3.Connection) -> None:
+            self.db = db
+
+        def __enter__(self) -> sqlite3.Connection:
+            self.db.execute("BEGIN IMMEDIATE")
+            return self.db
+
+        def __exit__(self, exc_type, exc, tb) -> None:
+            self.db.execute("COMMIT" if exc_type is None else "ROLLBACK")
+
+    def _transaction(self) -> "_Transaction":
+        return self._Transaction(self._db())
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for db in self._connections:
+                try:
+                    db.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
+
+    # Songs
+
+    def load_songs(self, source: Path, stamp, parse: Callable[[], Dict[str, Dict]]) -> Dict[str, Dict]:
+        source_key = _songs_source_key(source, stamp)
+        db = self._db()
+        row = db.execute("SELECT value FROM meta WHERE key = 'songs_source'").fetchone()
+        if row is not None and row[0] == source_key:
+            return {title: json.loads(info)
+                    for title, info in db.execute("SELECT title, info FROM songs ORDER BY rowid")}
+        songs = parse()
+        self.replace_songs(songs, source_key)
+        return songs
+
+    def replace_songs(self, songs: Dict[str, Dict], source_key: str = "") -> None:
+        """Replace the whole catalog; ``source_key`` names the file version it came from."""
+        with self._transaction() as db:
+            db.execute("DELETE FROM songs")
+            db.executemany(
+                "INSERT INTO songs (title, artist, bpm, energy_level, has_horn, is_jam_vehicle, info)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(title, info.get('artist') or '', info.get('bpm'), info.get('energy_level'),
+                  bool(info.get('has_horn')), bool(info.get('is_jam_vehicle')), json.dumps(info))
+                 for title, info in songs.items()])
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('songs_source', ?)", (source_key,))
+
+    def store_songs(self, source: Path, stamp, songs: Mapping[str, Mapping]) -> None:
+        self.replace_songs({title: dict(info) for title, info in songs.items()},
+                           _songs_source_key(source, stamp))
+
+    def songs(self) -> Dict[str, Dict]:
+        return {title: json.loads(info)
+                for title, info in self._db().execute("SELECT title, info FROM songs ORDER BY rowid")}
+
+    # Setlists
+
+    def load_setlist(self, file_path: str, venue_dir: str, stamp: Stamp,
+                     parse: Callable[[str, str], Dict]) -> Dict:
+        stamp_text = _stamp_text(stamp)
+        row = self._db().execute("SELECT data FROM setlists WHERE path = ? AND stamp = ?",
+                                 (file_path, stamp_text)).fetchone()
+        if row is not None:
+            return json.loads(row[0])
+        setlist_data = parse(file_path, venue_dir)
+        with open(file_path, 'r', encoding='utf-8') as f:
+            markdown = f.read()
+        self.put_setlist(file_path, venue_dir, stamp_text, markdown, setlist_data)
+        return setlist_data
+
+    def put_setlist(self, file_path: str, venue_dir: str, stamp_text: str, markdown: str,
+                    setlist_data: Dict) -> None:
+        from .setlist_manager import normalize_song_name
+
+        data = {key: value for key, value in setlist_data.items() if key != 'id'}
+        entries = []
+        for set_key, songs in data.get('sets', {}).items():
+            for position, song in enumerate(songs):
+                name = song['name'] if isinstance(song, dict) else str(song)
+                entries.append((file_path, set_key, position, name, normalize_song_name(name),
+                                song.get('bpm') if isinstance(song, dict) else None,
+                                bool(isinstance(song, dict) and song.get('is_segue'))))
+        with self._transaction() as db:
+            db.execute("DELETE FROM setlists WHERE path = ?", (file_path,))
+            db.execute("INSERT INTO setlists (path, venue_dir, stamp, venue, date, markdown, data)"
+                       " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       (file_path, venue_dir, stamp_text, data.get('venue'), data.get('date'),
+                        markdown, json.dumps(data)))
+            db.executemany("INSERT INTO setlist_entries (path, set_key, position, name, norm_name, bpm, is_segue)"
+                           " VALUES (?, ?, ?, ?, ?, ?, ?)", entries)
+
+    def forget_setlists(self, file_paths: Iterable[str]) -> None:
+        paths = [(path,) for path in file_paths]
+        if paths:
+            with self._transaction() as db:
+                db.executemany("DELETE FROM setlists WHERE path = ?", paths)
+
+    def song_postings(self, song_name: str, partial: bool = False) -> Optional[Dict[str, List[Tuple[str, int]]]]:
+        """Postings from the setlist_entries index, matched like SongPlayIndex.lookup."""
+        from .setlist_manager import normalize_song_name
+
+        key = normalize_song_name(song_name)
+        if partial and not key:
+            return {}
+        where = "instr(norm_name, ?) > 0" if partial else "norm_name = ?"
+        postings: Dict[str, List[Tuple[str, int]]] = {}
+        for path, set_key, position in self._db().execute(
+                "SELECT path, set_key, position FROM setlist_entries WHERE " + where, (key,)):
+            postings.setdefault(path, []).append((set_key, position))
+        return postings
+
+    # Lyrics
+
+    def invalidate_lyrics(self) -> None:
+        with self._lyrics_lock:
+            self._lyrics_synced = None
+
+    def sync_lyrics(self, lyrics_dir: Path, force: bool = False) -> bool:
+        """Import lyrics files whose (mtime_ns, size) changed; returns True if any did."""
+        with self._lyrics_lock:
+            now = time.monotonic()
+            if not (force or self._lyrics_synced is None
+                    or now - self._lyrics_synced >= LYRICS_RESCAN_INTERVAL):
+                return False
+            seen: Dict[str, Tuple[str, str]] = {}
+            if lyrics_dir.exists():
+                with os.scandir(lyrics_dir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith('.txt') and entry.is_file():
+                            st = entry.stat()
+                            seen[entry.name[:-4]] = (_stamp_text((st.st_mtime_ns, st.st_size)), entry.path)
+            stored = dict(self._db().execute("SELECT song_name, stamp FROM lyrics").fetchall())
+            removed = [(name,) for name in stored if name not in seen]
+            changed = []
+            for song_name, (stamp_text, path) in seen.items():
+                if stored.get(song_name) != stamp_text:
+                    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                        changed.append((song_name, stamp_text, f.read()))
+            if removed or changed:
+                with self._transaction() as db:
+                    db.executemany("DELETE FROM lyrics WHERE song_name = ?", removed)
+                    db.executemany(
+                        "INSERT INTO lyrics (song_name, stamp, content) VALUES (?, ?, ?)"
+                        " ON CONFLICT (song_name) DO UPDATE SET stamp = excluded.stamp, content = excluded.content",
+                        changed)
+            self._lyrics_synced = now
+            return bool(removed or changed)
+
+    def search_lyrics(self, lyrics_dir: Path, query: str, limit: Optional[int] = None) -> Optional[List[Dict]]:
+        """FTS5 search with the LyricsIndex query syntax and result shape; bm25 ranks."""
+        clauses = parse_query(query)
+        if not clauses:
+            return []
+        self.sync_lyrics(lyrics_dir)
+        match = " AND ".join('"' + " ".join(clause) + '"' for clause in clauses)
+        sql = ("SELECT lyrics.song_name, lyrics.content, -bm25(lyrics_fts) AS score"
+               " FROM lyrics_fts JOIN lyrics ON lyrics.id = lyrics_fts.rowid"
+               " WHERE lyrics_fts MATCH ? ORDER BY score DESC, lyrics.song_name")
+        params: Tuple = ("content : (" + match + ")",)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (limit,)
+        tokens = {token for clause in clauses for token in clause}
+        results = []
+        for song_name, content, score in self._db().execute(sql, params):
+            lines = content.replace('\r\n', '\n').replace('\r', '\n').replace('\xa0', ' ').split('\n')
+            snippets = [{'line': line_no + 1, 'text': line.strip()}
+                        for line_no, line in enumerate(lines) if tokens.intersection(tokenize(line))]
+            results.append({'song_name': song_name, 'score': round(score, 4),
+                            'snippets': snippets[:MAX_SNIPPETS]})
+        return results
+
+
+_STORAGE: FileStorage = FileStorage()
+
+
+def get_storage() -> FileStorage:
+    """The backend attached to the managers' caches."""
+    return _STORAGE
+
+
+def default_sqlite_path() -> Path:
+    from .song_manager import DATA_ROOT
+    return Path(SQLITE_PATH).expanduser() if SQLITE_PATH else DATA_ROOT / "buckingham_conspiracy" / SQLITE_FILENAME
+
+
+def open_storage(backend: str = STORAGE_BACKEND, path: Optional[Path] = None) -> FileStorage:
+    """Create the configured backend and attach it to the song catalog, setlist archive and lyrics."""
+    global _STORAGE
+    from .lyrics_manager import attach_lyrics_storage
+    from .setlist_manager import get_setlist_archive
+    from .song_manager import get_catalog_cache
+
+    if backend == "sqlite":
+        storage: FileStorage = SQLiteStorage(path or default_sqlite_path())
+    elif backend == "files":
+        storage = FileStorage()
+    else:
+        raise ValueError(f"Unknown storage backend {backend!r} (expected 'files' or 'sqlite')")
+
+    previous, _STORAGE = _STORAGE, storage
+    get_catalog_cache().attach_storage(storage)
+    get_setlist_archive().attach_storage(storage)
+    attach_lyrics_storage(storage)
+    previous.close()
+    return storage
+
+
+def close_storage() -> None:
+    """Detach the backend and close its connections (app shutdown)."""
+    open_storage("files")
+
+
+def import_from_files(storage: Optional[SQLiteStorage] = None) -> Dict[str, int]:
+    """Load the flat files into the database, reparsing only files that changed."""
+    from .lyrics_manager import LYRICS_DIR
+    from .setlist_manager import get_setlist_archive
+    from .song_manager import get_catalog_cache
+
+    storage = storage or _STORAGE
+    if not isinstance(storage, SQLiteStorage):
+        raise ValueError("import_from_files needs the sqlite backend")
+    catalog = get_catalog_cache()
+    catalog.invalidate()
+    archive = get_setlist_archive()
+    archive.refresh(force=True)
+    storage.sync_lyrics(LYRICS_DIR, force=True)
+    db = storage._db()
+    return {
+        'songs': len(catalog.songs()),
+        'setlists': db.execute("SELECT COUNT(*) FROM setlists").fetchone()[0],
+        'lyrics': db.execute("SELECT COUNT(*) FROM lyrics").fetchone()[0],
+    }
+
+
+def export_to_files(storage: Optional[SQLiteStorage] = None) -> Dict[str, int]:
+    """Write the database out to the CSV/markdown/txt layout (e.g. to restore a data directory).
+
+    Only files that are missing or differ from the database are written, and
+    the counts are of files written. The song list is written under its file
+    lock, after any edit the CatalogWriter still holds has been flushed (and
+    stored in the database), so the export neither reverts nor races it.
+    """
+    from .file_locks import file_lock
+    from .lyrics_manager import LYRICS_DIR
+    from .setlist_manager import SETLISTS_DIR
+    from .song_manager import (flush_song_catalog, invalidate_song_catalog, render_song_list_csv,
+                               render_song_list_markdown, song_list_lock_target, song_list_targets)
+
+    storage = storage or _STORAGE
+    if not isinstance(storage, SQLiteStorage):
+        raise ValueError("export_to_files needs the sqlite backend")
+    db = storage._db()
+    written = {'songs': 0, 'setlists': 0, 'lyrics': 0}
+
+    def write_if_changed(target: Path, content: str, newline: Optional[str] = None) -> bool:
+        try:
+            with open(target, 'r', encoding='utf-8', newline=newline) as f:
+                if f.read() == content:
+                    return False
+        except OSError:
+            pass
+        return atomic_write(target, content, newline=newline)
+
+    with file_lock(song_list_lock_target()):
+        if not flush_song_catalog():
+            raise Exception("A pending song list edit could not be written; export aborted")
+        # One group commit: the exported files are replaced together, each directory fsynced once
+        with group_commit():
+            songs = storage.songs()
+            if songs:
+                rendered = {'csv': render_song_list_csv(songs), 'markdown': render_song_list_markdown(songs)}
+                for target, kind in song_list_targets():
+                    written['songs'] += write_if_changed(target, rendered[kind], '' if kind == 'csv' else None)
+            for path, venue_dir, markdown in db.execute("SELECT path, venue_dir, markdown FROM setlists").fetchall():
+                written['setlists'] += write_if_changed(SETLISTS_DIR / venue_dir / Path(path).name, markdown)
+            for song_name, content in db.execute("SELECT song_name, content FROM lyrics").fetchall():
+                written['lyrics'] += write_if_changed(LYRICS_DIR / f"{song_name}.txt", content)
+    if written['songs']:
+        invalidate_song_catalog()
+    return written
+
+
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command not in ("import", "export"):
+        print("Usage: python -m core.storage import|export")
+        sys.exit(2)
+    open_storage("sqlite")
+    print(import_from_files() if command == "import" else export_to_files())
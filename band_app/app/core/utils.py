@@ -6,6 +6,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Tuple, Optional, Union
 
+from .atomic_io import atomic_write, is_temp_file
 from .song_manager import DATA_ROOT, BASE_DIR
 
 
@@ -73,8 +74,7 @@ def save_uploaded_tab(file_bytes: bytes, original_filename: str) -> Optional[Pat
     destination = TABS_DIR / f"{sanitized_name}_{timestamp}{ext}"
 
     try:
-        with open(destination, "wb") as f:
-            f.write(file_bytes)
+        atomic_write(destination, file_bytes)
     except Exception as e:
         raise Exception(f"Failed to save uploaded tab: {e}")
 
@@ -87,7 +87,7 @@ def load_available_tabs() -> List[str]:
         tab_files: set[str] = set()
         if TABS_DIR.exists():
             for file in TABS_DIR.glob("*"):
-                if file.is_file():
+                if file.is_file() and not is_temp_file(file):
                     tab_files.add(file.name)
         return sorted(tab_files)
     except Exception as e:
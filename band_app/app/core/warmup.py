@@ -0,0 +1,128 @@
+"""Startup warm-up: build every cache and index before the first request needs it.
+
+After a container restart the first page view would otherwise pay for parsing
+the catalog, crawling setlists, indexing lyrics and compiling templates. The
+app lifespan starts ``WarmUp.run`` in the background; requests are served
+throughout (anything not yet warm is built on demand as before) and /health
+reports ``warming`` until every stage has finished, then ``ready`` (or
+``degraded`` if a stage failed), with the time each stage took.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+WARMING = "warming"
+READY = "ready"
+DEGRADED = "degraded"
+
+Stage = Tuple[str, Callable[[], Any]]
+
+
+class WarmUp:
+    """Runs named warm-up stages once, in order, recording per-stage timings."""
+
+    def __init__(self, stages: Iterable[Stage] = ()) -> None:
+        self.stages: List[Stage] = list(stages)
+        self._lock = threading.Lock()
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    def add(self, name: str, func: Callable[[], Any]) -> None:
+        self.stages.append((name, func))
+
+    def run(self) -> str:
+        """Run every stage (blocking); a failing stage is recorded and the rest still run."""
+        with self._lock:
+            self._started = time.perf_counter()
+            self._finished = None
+            self._results = {name: {"status": "pending"} for name, _ in self.stages}
+        for name, func in self.stages:
+            with self._lock:
+                self._results[name] = {"status": "running"}
+            started = time.perf_counter()
+            try:
+                func()
+                result = {"status": "ok"}
+            except Exception as e:
+                print(f"Warm-up stage {name} failed: {e}")
+                result = {"status": "error", "error": str(e)}
+            result["ms"] = round((time.perf_counter() - started) * 1000, 1)
+            with self._lock:
+                self._results[name] = result
+        with self._lock:
+            self._finished = time.perf_counter()
+        return self.status
+
+    @property
+    def status(self) -> str:
+        with self._lock:
+            if self._finished is None:
+                return WARMING
+            failed = any(result["status"] == "error" for result in self._results.values())
+            return DEGRADED if failed else READY
+
+    def report(self) -> Dict[str, Any]:
+        """Readiness and per-stage timings, for /health."""
+        status = self.status
+        with self._lock:
+            total_ms = None
+            if self._started is not None:
+                end = self._finished if self._finished is not None else time.perf_counter()
+                total_ms = round((end - self._started) * 1000, 1)
+            return {
+                "status": status,
+                "total_ms": total_ms,
+                "stages": {name: dict(self._results.get(name, {"status": "pending"}))
+                           for name, _ in self.stages},
+            }
+
+
+def compile_templates(environments: Iterable[Any]) -> int:
+    """Load every template of each Jinja environment into its cache; returns how many."""
+    compiled = 0
+    for env in environments:
+        for name in env.list_templates(filter_func=lambda name: name.endswith(".html")):
+            env.get_template(name)
+            compiled += 1
+    return compiled
+
+
+def core_stages() -> List[Stage]:
+    """Warm-up stages for the data caches and indexes of core."""
+    from .lyrics_manager import LYRICS_DIR, get_lyrics_index, load_available_lyrics
+    from .setlist_analytics import get_setlist_analytics
+    from .setlist_manager import get_setlist_archive
+    from .song_manager import get_catalog_snapshot
+    from .song_query import get_song_library_index
+    from .song_suggest import get_song_suggest_index
+    from .storage import SQLiteStorage, get_storage
+    from .utils import load_available_tabs
+
+    def warm_lyrics_search() -> None:
+        storage = get_storage()
+        if isinstance(storage, SQLiteStorage):
+            # Searches go to FTS5 instead of the in-memory index
+            storage.sync_lyrics(LYRICS_DIR, force=True)
+        else:
+            get_lyrics_index().refresh(force=True)
+
+    return [
+        ("song_catalog", get_catalog_snapshot),
+        ("song_query", get_song_library_index),
+        ("song_suggest", get_song_suggest_index),
+        ("setlist_archive", lambda: get_setlist_archive().refresh(force=True)),
+        ("setlist_analytics", get_setlist_analytics),
+        ("lyrics_list", load_available_lyrics),
+        ("lyrics_search", warm_lyrics_search),
+        ("tabs", load_available_tabs),
+    ]
+
+
+_WARMUP = WarmUp()
+
+
+def get_warmup() -> WarmUp:
+    """The process-wide warm-up state reported by /health."""
+    return _WARMUP
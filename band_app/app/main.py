@@ -8,16 +8,61 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
+from contextlib import asynccontextmanager
 from pathlib import Path
+import asyncio
 import os
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the storage backend, start warming every cache and index (see core.warmup) and start
+    watching the data directory at startup; end change streams, stop the watcher and admin jobs,
+    write pending song list edits, close pooled HTTP connections and the storage backend on shutdown"""
+    from core.executor import run_blocking
+    from core.warmup import compile_templates, core_stages, get_warmup
+    from core.genius_client import close_genius_client
+    from core.jobs import get_job_manager
+    from core.file_watcher import start_data_watcher, stop_data_watcher
+    from core.song_manager import close_catalog_writer
+    from core.storage import close_storage, open_storage
+    open_storage()
+    warmup = get_warmup()
+    warmup.stages = core_stages() + [
+        ("templates", lambda: compile_templates(
+            t.env for t in (templates, lyrics.templates, songs.templates, setlists.templates, builder.templates))),
+        ("show_bundles", setlists.warm_show_bundles),
+    ]
+    # Served meanwhile; /health reports progress
+    app.state.warmup_task = asyncio.ensure_future(run_blocking(warmup.run))
+    start_data_watcher()
+    yield
+    # Usually already ended by the exit hook below; other servers only get here
+    get_change_feed().end_streams()
+    stop_data_watcher()
+    await get_job_manager().shutdown()
+    close_catalog_writer()
+    await close_genius_client()
+    close_storage()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Band Hub",
     description="Mobile-first band management app for The Conspiracy Hub",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
+# End change streams (/api/events) as soon as the server is told to stop, so
+# shutdown and dev reloads don't wait on open browser tabs
+from core.change_feed import get_change_feed
+from core.server_config import on_server_exit
+on_server_exit(get_change_feed().end_streams)
+
+# Answer unchanged data-driven GETs with 304 before rendering (inside CORS)
+from core.conditional_get import ConditionalGetMiddleware
+app.add_middleware(ConditionalGetMiddleware)
+
 # Configure CORS for local network access
 app.add_middleware(
     CORSMiddleware,
@@ -71,11 +116,14 @@ async def home(request: Request):
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint for monitoring"""
-    return {"status": "ok", "app": "Band Hub", "version": "2.0.0"}
+    """Health check endpoint for monitoring; ``ready`` turns true once startup warm-up is done"""
+    from core.warmup import WARMING, get_warmup
+    warmup = get_warmup().report()
+    return {"status": "ok", "app": "Band Hub", "version": "2.0.0",
+            "ready": warmup["status"] != WARMING, "warmup": warmup}
 
 # Import API routers
-from api import lyrics, songs, setlists, admin, builder
+from api import lyrics, songs, setlists, admin, builder, events
 
 # Include API routes
 app.include_router(lyrics.router, prefix="/api/lyrics", tags=["lyrics"])
@@ -83,20 +131,11 @@ app.include_router(songs.router, prefix="/api/songs", tags=["songs"])
 app.include_router(setlists.router, prefix="/api/setlists", tags=["setlists"])
 app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 app.include_router(builder.router, prefix="/api/builder", tags=["builder"])
+app.include_router(events.router, prefix="/api/events", tags=["events"])
 
-# Development server configuration
+# Server launch: `python main.py` runs the dev profile (auto-reload);
+# `python main.py --profile production` (or BAND_APP_PROFILE=production) the Pi profile
 if __name__ == "__main__":
-    import uvicorn
-
-    # Get host and port from environment or use defaults
-    host = os.getenv("BAND_APP_HOST", "0.0.0.0")  # Bind to all interfaces for Pi access
-    port = int(os.getenv("BAND_APP_PORT", "8000"))
-
-    uvicorn.run(
-        "main:app",
-        host=host,
-        port=port,
-        reload=True,  # Enable for development
-        access_log=True,
-        log_level="info"
-    )
\ No newline at end of file
+    from core.server_config import run
+
+    run()
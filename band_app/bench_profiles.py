@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Compare request throughput of the dev and production server profiles.
+
+Starts ``python main.py --profile <name>`` for each profile in turn, waits for
+/health to report ready, then keeps CONCURRENCY requests in flight against a
+mix of pages for DURATION seconds and reports requests per second and latency
+percentiles. Single runs vary by 10-15%, so the profiles take turns for
+ROUNDS rounds and the round with the median throughput is reported.
+
+    python bench_profiles.py                      # both profiles, defaults
+    python bench_profiles.py --duration 30 --concurrency 32 --workers 2
+
+Run it on the machine you deploy to (the Pi); numbers from a laptop say little.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+APP_DIR = Path(__file__).parent / "app"
+PATHS = [
+    "/health",
+    "/",
+    "/api/songs/",
+    "/api/songs/list",
+    "/api/setlists/",
+    "/api/lyrics/",
+]
+
+
+def start_server(profile: str, port: int, workers: int) -> subprocess.Popen:
+    command = [sys.executable, "main.py", "--profile", profile, "--port", str(port),
+               "--host", "127.0.0.1", "--workers", str(workers)]
+    return subprocess.Popen(command, cwd=APP_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            start_new_session=True)
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGINT)
+        process.wait(timeout=15)
+    except (ProcessLookupError, subprocess.TimeoutExpired):
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+async def wait_ready(base_url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                response = await client.get(base_url + "/health")
+                # Measure warm servers only (see core.warmup)
+                if response.status_code == 200 and response.json().get("ready", True):
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError(f"Server at {base_url} did not become healthy")
+
+
+async def load(base_url: str, duration: float, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    stop_at = 0.0
+
+    async def user(client: httpx.AsyncClient, offset: int) -> None:
+        nonlocal errors
+        i = offset
+        while time.monotonic() < stop_at:
+            path = PATHS[i % len(PATHS)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                response = await client.get(base_url + path)
+                if response.status_code >= 500:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        # Warm caches before measuring
+        for path in PATHS:
+            await client.get(base_url + path)
+        started = time.monotonic()
+        stop_at = started + duration
+        await asyncio.gather(*(user(client, n) for n in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--profiles", nargs="+", default=["dev", "production"])
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1, help="production worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rounds", type=int, default=3, help="alternating runs per profile")
+    args = parser.parse_args()
+
+    runs: Dict[str, List[Dict[str, float]]] = {profile: [] for profile in args.profiles}
+    for _ in range(max(1, args.rounds)):
+        for profile in args.profiles:
+            process = start_server(profile, args.port, args.workers)
+            base_url = f"http://127.0.0.1:{args.port}"
+            try:
+                asyncio.run(wait_ready(base_url))
+                runs[profile].append(asyncio.run(load(base_url, args.duration, args.concurrency)))
+            finally:
+                stop_server(process)
+    results = {profile: sorted(r, key=lambda run: run["rps"])[len(r) // 2] for profile, r in runs.items()}
+
+    print(f"\n{args.concurrency} concurrent clients, {args.duration:.0f}s per run, "
+          f"median of {max(1, args.rounds)} rounds\n")
+    print(f"{'profile':<12}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for profile, r in results.items():
+        spread = ", ".join(f"{run['rps']:.0f}" for run in runs[profile])
+        print(f"{profile:<12}{r['rps']:>9.1f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['errors']:>8}"
+              f"   (req/s per round: {spread})")
+    if "dev" in results and "production" in results and results["dev"]["rps"]:
+        print(f"\nproduction / dev throughput: {results['production']['rps'] / results['dev']['rps']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Tests for crash-safe atomic file writes"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core import atomic_io
+from core.atomic_io import atomic_write, group_commit
+
+
+class _Interrupted(Exception):
+    pass
+
+
+def test_atomic_write_replaces_whole_file():
+    """Targets are replaced by rename, never truncated in place; no temp files remain"""
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / "songs" / "songlist_master.csv"
+        assert atomic_write(target, "title\nAlpha\n", newline='')
+        inode = target.stat().st_ino
+        assert atomic_write(target, "title\nBeta\n")
+        assert target.read_text(encoding="utf-8") == "title\nBeta\n"
+        assert target.stat().st_ino != inode
+
+        assert not atomic_write(target, "clobbered", overwrite=False)
+        assert target.read_text(encoding="utf-8") == "title\nBeta\n"
+        assert atomic_write(Path(tmp) / "songs" / "tab.pdf", b"%PDF-1.4")
+        assert sorted(os.listdir(target.parent)) == ["songlist_master.csv", "tab.pdf"]
+    print("✅ Atomic writes replace files whole")
+
+
+def test_failed_write_leaves_old_content():
+    """A write that dies before the rename leaves the previous file untouched"""
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / "setlist.md"
+        atomic_write(target, "# SET 1\nDreams\n")
+
+        original = os.replace
+
+        def crash(*args):
+            raise _Interrupted("power cut")
+
+        os.replace = crash
+        try:
+            atomic_write(target, "# SET 1\n")
+            raise AssertionError("write should have failed")
+        except _Interrupted:
+            pass
+        finally:
+            os.replace = original
+        assert target.read_text(encoding="utf-8") == "# SET 1\nDreams\n"
+        assert os.listdir(tmp) == ["setlist.md"]
+    print("✅ Interrupted writes keep the old file")
+
+
+def test_group_commit_fsyncs_only_its_files():
+    """Writes in a group appear together on exit, fsyncing only the staged files; a failing group writes nothing"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        calls = {"fsync": 0, "sync": 0}
+        original_fsync, original_sync = os.fsync, os.sync
+        enabled = atomic_io.FSYNC_ENABLED
+
+        def counting_fsync(fd):
+            calls["fsync"] += 1
+            original_fsync(fd)
+
+        def counting_sync():
+            calls["sync"] += 1
+
+        os.fsync, os.sync = counting_fsync, counting_sync
+        atomic_io.FSYNC_ENABLED = True
+        try:
+            with group_commit():
+                for name in ("a.csv", "b.md", "c.csv"):
+                    atomic_write(root / name, name)
+                with group_commit():
+                    atomic_write(root / "sub" / "d.md", "d")
+                assert not (root / "a.csv").exists()
+            # One fsync per file and per directory; never a system-wide sync
+            assert calls == {"fsync": 6, "sync": 0}
+            assert (root / "a.csv").read_text(encoding="utf-8") == "a.csv"
+            assert (root / "sub" / "d.md").read_text(encoding="utf-8") == "d"
+
+            try:
+                with group_commit():
+                    atomic_write(root / "a.csv", "half")
+                    raise _Interrupted("crash mid-group")
+            except _Interrupted:
+                pass
+        finally:
+            os.fsync, os.sync = original_fsync, original_sync
+            atomic_io.FSYNC_ENABLED = enabled
+        assert (root / "a.csv").read_text(encoding="utf-8") == "a.csv"
+        assert sorted(os.listdir(root)) == ["a.csv", "b.md", "c.csv", "sub"]
+    print("✅ Group commit verified")
+
+
+def test_replacement_keeps_file_mode():
+    """A replaced file keeps its permission bits, alone or in a group"""
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / "songlist.md"
+        target.write_text("old", encoding="utf-8")
+        os.chmod(target, 0o664)
+        atomic_write(target, "new")
+        assert target.stat().st_mode & 0o777 == 0o664
+        os.chmod(target, 0o640)
+        with group_commit():
+            atomic_write(target, "newer")
+        assert target.stat().st_mode & 0o777 == 0o640
+        assert target.read_text(encoding="utf-8") == "newer"
+    print("✅ File modes preserved")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Atomic IO Tests...\n")
+    test_atomic_write_replaces_whole_file()
+    test_failed_write_leaves_old_content()
+    test_group_commit_fsyncs_only_its_files()
+    test_replacement_keeps_file_mode()
+    print("\n🎉 ALL TESTS PASSED!")
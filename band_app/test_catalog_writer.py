@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Tests for write-behind persistence of song list edits"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core import song_manager
+from core.song_manager import CatalogWriter, SongCatalog
+from test_song_catalog import _TempSonglist
+
+
+def _count_writes():
+    """Record every (path) written through write_song_list_files; returns (calls, original)"""
+    calls = []
+    original = song_manager.write_song_list_files
+
+    def counting(songs_data, targets):
+        calls.extend(path for path, _ in targets)
+        return original(songs_data, targets)
+
+    song_manager.write_song_list_files = counting
+    return calls, original
+
+
+def _edit(catalog, bpm):
+    songs = {title: dict(info) for title, info in catalog.songs().items()}
+    songs["Alpha"]["bpm"] = bpm
+    return songs
+
+
+def test_edits_are_visible_before_they_are_written():
+    """Read-your-writes: the catalog serves an edit at once, exactly as it will read back"""
+    with _TempSonglist() as csv_path:
+        catalog = SongCatalog()
+        writer = CatalogWriter(catalog, delay=60, max_delay=60)
+        version = catalog.version
+        fingerprint = catalog.fingerprint
+        assert writer.submit(_edit(catalog, 133))
+        assert catalog.songs()["Alpha"]["bpm"] == 133 and catalog.version > version
+        assert catalog.fingerprint != fingerprint and catalog.unflushed
+        assert song_manager.load_song_list_from_csv(csv_path)["Alpha"]["bpm"] == 120
+
+        # A pending edit wins over the (stale) file until it is written
+        catalog.invalidate()
+        assert catalog.songs()["Alpha"]["bpm"] == 133
+
+        applied = {title: dict(info) for title, info in catalog.songs().items()}
+        assert writer.close()
+        assert song_manager.load_song_list_from_csv(csv_path) == applied
+        assert not catalog.unflushed
+        # The written file is adopted without a reparse
+        assert {title: dict(info) for title, info in catalog.songs().items()} == applied
+    print("✅ Edits are served before they are written")
+
+
+def test_burst_of_edits_is_one_write_per_target():
+    """Many edits within the quiet period are coalesced into a single write of each file"""
+    with _TempSonglist() as csv_path:
+        catalog = SongCatalog()
+        writer = CatalogWriter(catalog, delay=0.1, max_delay=5)
+        calls, original = _count_writes()
+        try:
+            for bpm in range(100, 120):
+                writer.submit(_edit(catalog, bpm))
+            assert calls == []
+            deadline = time.monotonic() + 3
+            while not writer.flushes and time.monotonic() < deadline:
+                time.sleep(0.02)
+            assert len(calls) == len(set(calls)) == len(song_manager.song_list_targets())
+            assert writer.edits == 20 and writer.flushes == 1
+            assert song_manager.load_song_list_from_csv(csv_path)["Alpha"]["bpm"] == 119
+        finally:
+            song_manager.write_song_list_files = original
+            writer.close()
+    print("✅ Edit bursts coalesced into one write per file")
+
+
+def test_steady_edits_are_written_within_max_delay():
+    """Edits that never pause are still written no later than max_delay after the first"""
+    with _TempSonglist() as csv_path:
+        catalog = SongCatalog()
+        writer = CatalogWriter(catalog, delay=0.2, max_delay=0.4)
+        try:
+            started = time.monotonic()
+            written_at = None
+            bpm = 100
+            while time.monotonic() - started < 1.5 and written_at is None:
+                bpm += 1
+                writer.submit(_edit(catalog, bpm))
+                if writer.flushes:
+                    written_at = time.monotonic() - started
+                time.sleep(0.05)
+            assert written_at is not None and written_at < 1.0, written_at
+            assert song_manager.load_song_list_from_csv(csv_path)["Alpha"]["bpm"] > 100
+        finally:
+            writer.close()
+        assert song_manager.load_song_list_from_csv(csv_path)["Alpha"]["bpm"] == bpm
+    print("✅ Flush delay is bounded under continuous edits")
+
+
+def test_failed_write_is_retried_and_files_are_replaced_atomically():
+    """A failed write keeps the edit pending; no temp files are left behind"""
+    with _TempSonglist() as csv_path:
+        catalog = SongCatalog()
+        writer = CatalogWriter(catalog, delay=0)
+        original = song_manager.write_song_list_files
+        song_manager.write_song_list_files = lambda songs_data, targets: False
+        try:
+            assert not writer.submit(_edit(catalog, 150))
+            assert writer.pending and catalog.songs()["Alpha"]["bpm"] == 150
+        finally:
+            song_manager.write_song_list_files = original
+        assert writer.flush() and not writer.pending
+        assert song_manager.load_song_list_from_csv(csv_path)["Alpha"]["bpm"] == 150
+
+        inode = csv_path.stat().st_ino
+        assert writer.submit(_edit(catalog, 151))
+        assert csv_path.stat().st_ino != inode
+        assert sorted(os.listdir(csv_path.parent)) == sorted(
+            path.name for path, _ in song_manager.song_list_targets())
+        writer.close()
+    print("✅ Failed writes retried; files replaced atomically")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Catalog Writer Tests...\n")
+    test_edits_are_visible_before_they_are_written()
+    test_burst_of_edits_is_one_write_per_target()
+    test_steady_edits_are_written_within_max_delay()
+    test_failed_write_is_retried_and_files_are_replaced_atomically()
+    print("\n🎉 ALL TESTS PASSED!")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Test the live client change feed"""
+
+import asyncio
+import json
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core import change_feed, lyrics_manager
+from core.change_feed import ChangeFeed, format_sse, sse_stream
+from core.song_manager import catalog_changes
+
+
+def test_events_published_from_threads_reach_subscribers():
+    """A write on a worker thread is delivered on the subscriber's event loop"""
+    feed = ChangeFeed()
+
+    async def run():
+        subscription = feed.subscribe()
+        thread = threading.Thread(target=feed.publish, args=(change_feed.SONG, "Dreams"))
+        thread.start()
+        thread.join()
+        event = await subscription.next_event(timeout=1)
+        assert event == {"seq": 1, "type": "song", "id": "Dreams", "action": "saved", "version": 1}
+        assert await subscription.next_event(timeout=0.01) is None
+        subscription.close()
+        assert feed.subscriber_count == 0
+
+    asyncio.run(run())
+    print("✅ Cross-thread events delivered")
+
+
+def test_reconnecting_clients_replay_or_resync():
+    """Last-Event-ID replays missed events; gaps and overflows become one resync"""
+    feed = ChangeFeed(history=3)
+    for name in ("A", "B", "C", "D"):
+        feed.publish(change_feed.LYRICS, name)
+
+    async def run():
+        replay = feed.subscribe(last_event_id=2)
+        assert [(await replay.next_event(timeout=1))["id"] for _ in range(2)] == ["C", "D"]
+        assert (await feed.subscribe(last_event_id=0).next_event(timeout=1))["type"] == change_feed.RESYNC
+        # An id from before a server restart
+        assert (await feed.subscribe(last_event_id=99).next_event(timeout=1))["type"] == change_feed.RESYNC
+        assert await feed.subscribe(last_event_id=4).next_event(timeout=0.01) is None
+
+        slow = feed.subscribe()
+        for i in range(change_feed.SUBSCRIBER_QUEUE_SIZE + 5):
+            feed.publish(change_feed.SONG, str(i))
+        await asyncio.sleep(0)
+        event = await slow.next_event(timeout=1)
+        assert event["type"] == change_feed.RESYNC and event["seq"] == feed.seq
+        assert await slow.next_event(timeout=0.01) is None
+
+    asyncio.run(run())
+    print("✅ Replay and resync verified")
+
+
+def test_stream_framing_and_cleanup():
+    """The SSE stream frames events, sends heartbeats and unsubscribes on disconnect"""
+    feed = ChangeFeed()
+    event = feed.publish(change_feed.SETLIST, "bar-setlist-010124", change_feed.DELETED)
+    frame = format_sse(event)
+    assert frame.startswith("id: 1\nevent: setlist\ndata: ") and frame.endswith("\n\n")
+    assert json.loads(frame.split("data: ", 1)[1]) == event
+
+    async def run():
+        subscription = feed.subscribe(last_event_id=0)
+        polls = []
+
+        async def is_disconnected():
+            polls.append(1)
+            return len(polls) > 2
+
+        chunks = [chunk async for chunk in sse_stream(subscription, is_disconnected, heartbeat=0.01)]
+        assert chunks[0].startswith("retry:")
+        assert chunks[1:] == [frame, ": keep-alive\n\n"]
+        assert feed.subscriber_count == 0
+
+    asyncio.run(run())
+    print("✅ Stream framing verified")
+
+
+def test_server_shutdown_ends_open_streams():
+    """end_streams (server exit) finishes a stream that is waiting for events, from any thread"""
+    feed = ChangeFeed()
+
+    async def run():
+        subscription = feed.subscribe()
+
+        async def is_disconnected():
+            return False
+
+        async def consume():
+            return [chunk async for chunk in sse_stream(subscription, is_disconnected, heartbeat=30)]
+
+        stream = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.05)
+        ender = threading.Thread(target=feed.end_streams)
+        ender.start()
+        chunks = await asyncio.wait_for(stream, timeout=2)
+        ender.join()
+        assert len(chunks) == 1 and chunks[0].startswith("retry:")
+        assert feed.subscriber_count == 0
+        # Events published later don't revive it
+        feed.publish(change_feed.SONG, "Dreams")
+        assert await subscription.next_event(timeout=0.01) is None
+
+    asyncio.run(run())
+    print("✅ Shutdown ends open streams")
+
+
+def test_write_paths_publish_changes():
+    """Lyrics saves and deletes are announced; catalog diffs name each changed song"""
+    feed = change_feed.get_change_feed()
+    saved_dir = lyrics_manager.LYRICS_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        lyrics_manager.LYRICS_DIR = Path(tmp)
+        try:
+            start = feed.seq
+            lyrics_manager.save_lyrics_content("Rhiannon", "words")
+            lyrics_manager.delete_lyrics_file("Rhiannon")
+            assert [(e["type"], e["id"], e["action"]) for e in feed.recent(start)] == [
+                ("lyrics", "Rhiannon", "saved"), ("lyrics", "Rhiannon", "deleted")]
+        finally:
+            lyrics_manager.LYRICS_DIR = saved_dir
+            lyrics_manager.get_lyrics_cache().clear()
+
+    before = {"Dreams": {"bpm": 120}, "Landslide": {"bpm": 80}}
+    after = {"Dreams": {"bpm": 121}, "Sara": {"bpm": 90}}
+    assert sorted(catalog_changes(before, after)) == [
+        ("Dreams", "saved"), ("Landslide", "deleted"), ("Sara", "saved")]
+    assert catalog_changes(before, dict(before)) == []
+    print("✅ Write paths publish change events")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Change Feed Tests...\n")
+    test_events_published_from_threads_reach_subscribers()
+    test_reconnecting_clients_replay_or_resync()
+    test_stream_framing_and_cleanup()
+    test_server_shutdown_ends_open_streams()
+    test_write_paths_publish_changes()
+    print("\n🎉 ALL TESTS PASSED!")
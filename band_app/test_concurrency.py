@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Verify slow outbound lyrics fetches do not block other requests (e.g. Show Mode)"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from starlette.testclient import TestClient
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+import main
+from core import genius_cache, lyrics_fetcher
+
+SLOW_RESPONSE_SECONDS = 1.5
+
+
+class _SlowGeniusHandler(BaseHTTPRequestHandler):
+    """Stand-in for Genius search that takes a while to answer"""
+
+    request_seen = threading.Event()
+
+    def do_GET(self):
+        _SlowGeniusHandler.request_seen.set()
+        time.sleep(SLOW_RESPONSE_SECONDS)
+        body = json.dumps({"response": {"sections": []}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_show_mode_served_while_fetch_in_flight():
+    """Show Mode answers promptly while a Genius preview is waiting on the network"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowGeniusHandler)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+
+    saved_url = lyrics_fetcher.GENIUS_SEARCH_URL
+    saved_token = os.environ.pop("GENIUS_ACCESS_TOKEN", None)
+    lyrics_fetcher.GENIUS_SEARCH_URL = f"http://127.0.0.1:{server.server_address[1]}/api/search/multi"
+    _SlowGeniusHandler.request_seen.clear()
+    # An earlier run's negative cache entry would answer without touching the slow server
+    saved_cache = genius_cache.set_genius_cache(genius_cache.ResponseCache(Path("."), enabled=False))
+    try:
+        with TestClient(main.app) as client:
+            # Warm caches so the timing below measures scheduling, not first-parse cost
+            assert client.get("/api/setlists/0/show?song=0&partial=1").status_code == 200
+
+            fetch_result = {}
+
+            def slow_fetch():
+                fetch_result["response"] = client.post(
+                    "/api/lyrics/fetch-preview", data={"title": "Slow Song", "artist": "Nobody"}
+                )
+
+            fetch_thread = threading.Thread(target=slow_fetch)
+            fetch_thread.start()
+            assert _SlowGeniusHandler.request_seen.wait(5), "fetch never reached the stand-in server"
+
+            started = time.perf_counter()
+            res_show = client.get("/api/setlists/0/show?song=1&partial=1", headers={"HX-Request": "true"})
+            elapsed = time.perf_counter() - started
+
+            assert res_show.status_code == 200
+            assert "show-song-hero" in res_show.text
+            assert fetch_thread.is_alive(), "fetch finished before show mode was measured"
+            assert elapsed < SLOW_RESPONSE_SECONDS / 2, f"show mode took {elapsed:.2f}s behind a slow fetch"
+
+            fetch_thread.join(10)
+            assert fetch_result["response"].status_code == 200
+            assert "No Genius search results" in fetch_result["response"].text
+    finally:
+        genius_cache.set_genius_cache(saved_cache)
+        lyrics_fetcher.GENIUS_SEARCH_URL = saved_url
+        if saved_token is not None:
+            os.environ["GENIUS_ACCESS_TOKEN"] = saved_token
+        server.shutdown()
+        server.server_close()
+    print(f"✅ Show Mode served in {elapsed * 1000:.0f}ms while a {SLOW_RESPONSE_SECONDS}s fetch was in flight")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Concurrency Tests...\n")
+    test_show_mode_served_while_fetch_in_flight()
+    print("\n🎉 ALL TESTS PASSED!")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Test the conditional GET middleware"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core.conditional_get import RULES, SOURCES, ConditionalGetMiddleware, etag_matches
+from core.setlist_manager import load_previous_setlists
+
+
+class _Route:
+    """ASGI app standing in for the router; counts how often it actually runs"""
+
+    def __init__(self, status=200, headers=()):
+        self.calls = 0
+        self.status = status
+        self.headers = list(headers)
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        await send({"type": "http.response.start", "status": self.status, "headers": self.headers})
+        await send({"type": "http.response.body", "body": b"rendered"})
+
+
+def _get(app, path, method="GET", headers=()):
+    scope = {"type": "http", "method": method, "path": path, "query_string": b"",
+             "headers": [(k.lower().encode(), v.encode()) for k, v in headers]}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = messages[0]
+    return start["status"], {k.decode(): v.decode() for k, v in start["headers"]}
+
+
+def test_unchanged_data_is_answered_with_304_before_the_route():
+    """A matching If-None-Match skips the route; a data change issues a new ETag"""
+    state = {"catalog": 1}
+    route = _Route()
+    app = ConditionalGetMiddleware(route, sources={"catalog": lambda params: state["catalog"]},
+                                   rules=[(r"/api/songs/list", ("catalog",))])
+
+    status, headers = _get(app, "/api/songs/list")
+    assert status == 200 and route.calls == 1
+    etag = headers["etag"]
+    assert etag.startswith('W/"') and headers["cache-control"] == "no-cache"
+
+    status, headers = _get(app, "/api/songs/list", headers=[("If-None-Match", etag)])
+    assert status == 304 and route.calls == 1 and headers["etag"] == etag
+    # Strong form of the same tag, and a list of tags, also match
+    assert _get(app, "/api/songs/list", headers=[("If-None-Match", '"x", ' + etag[2:])])[0] == 304
+
+    # HTMX partials and full pages are validated separately
+    assert _get(app, "/api/songs/list", headers=[("If-None-Match", etag), ("HX-Request", "true")])[0] == 200
+
+    state["catalog"] = 2
+    status, headers = _get(app, "/api/songs/list", headers=[("If-None-Match", etag)])
+    assert status == 200 and headers["etag"] != etag
+    print("✅ Conditional GET answers 304 only while data is unchanged")
+
+
+def test_uncovered_requests_pass_through():
+    """POSTs, unmatched paths, error responses and self-validating routes are left alone"""
+    route = _Route()
+    app = ConditionalGetMiddleware(route, sources={"catalog": lambda params: 1},
+                                   rules=[(r"/api/songs/list", ("catalog",)), (r"/api/songs/own", None)])
+    assert "etag" not in _get(app, "/api/songs/list", method="POST")[1]
+    assert "etag" not in _get(app, "/api/admin/jobs")[1]
+    assert "etag" not in _get(app, "/api/songs/own")[1]
+
+    own = _Route(headers=[(b"etag", b'"own"')])
+    app = ConditionalGetMiddleware(own, sources={"catalog": lambda params: 1},
+                                   rules=[(r"/api/songs/list", ("catalog",))])
+    assert _get(app, "/api/songs/list")[1]["etag"] == '"own"'
+
+    missing = _Route(status=404)
+    app = ConditionalGetMiddleware(missing, sources={"catalog": lambda params: 1},
+                                   rules=[(r"/api/songs/list", ("catalog",))])
+    assert "etag" not in _get(app, "/api/songs/list")[1]
+    print("✅ Uncovered requests pass through untouched")
+
+
+def test_rules_route_to_expected_sources():
+    """The shipped rules map each route to the data it reads"""
+    app = ConditionalGetMiddleware(_Route(), rules=RULES)
+    assert app.match("/api/songs/list")[0] == ("catalog",)
+    assert app.match("/api/lyrics/Dreams/view_partial") == (("catalog", "lyrics_file"), {"song_name": "Dreams"})
+    assert app.match("/api/lyrics/fetch-modal")[0] == ("catalog", "lyrics_listing")
+    assert app.match("/api/setlists/bar-setlist-010124/show")[0] == ("setlists", "catalog", "show_lyrics")
+    assert app.match("/api/setlists/bar-setlist-010124/show/bundle") is None
+    assert app.match("/api/setlists/analytics") is None
+    assert app.match("/api/songs/Dreams/edit") is None
+    assert etag_matches("*", 'W/"a"') and not etag_matches('"b"', 'W/"a"')
+    print("✅ Conditional GET rules verified")
+
+
+def test_show_etag_covers_only_its_songs():
+    """A show's ETag depends on its own songs' lyrics files, not on every lyrics file"""
+    setlist = load_previous_setlists()[0]
+    stamps = SOURCES["show_lyrics"]({"setlist_id": setlist["id"]})
+    names = [song["name"] for set_songs in setlist["sets"].values() for song in set_songs]
+    assert [name for name, _ in stamps] == names
+    assert SOURCES["show_lyrics"]({"setlist_id": "no-such-show"}) is None
+    print("✅ Show ETag scoped to the setlist's lyrics")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Conditional GET Tests...\n")
+    test_unchanged_data_is_answered_with_304_before_the_route()
+    test_uncovered_requests_pass_through()
+    test_rules_route_to_expected_sources()
+    test_show_etag_covers_only_its_songs()
+    print("\n🎉 ALL TESTS PASSED!")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Tests for inter-process write locks and optimistic version checks"""
+
+import multiprocessing
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core import file_locks, setlist_manager, song_manager
+from core.file_locks import WriteConflict, file_lock, file_version
+from test_song_catalog import _TempSonglist
+
+_FORK = multiprocessing.get_context("fork")
+ADDS_PER_WORKER = 15
+
+
+def _worker_adds_songs(worker: int) -> None:
+    """One 'uvicorn worker': writes through immediately, as with BCH_WORKERS > 1"""
+    song_manager._WRITER = song_manager.CatalogWriter(song_manager._CATALOG, delay=0)
+    song_manager.invalidate_song_catalog()
+
+    for i in range(ADDS_PER_WORKER):
+        def add(songs_data, title=f"Worker {worker} Song {i}"):
+            songs_data[title] = {"bpm": 100 + i, "artist": f"Worker {worker}"}
+        song_manager.update_song_list(add)
+
+
+def _hold_lock(target: str, locked, release) -> None:
+    with file_lock(target):
+        locked.set()
+        release.wait(5)
+
+
+def test_concurrent_workers_never_lose_edits():
+    """Read-modify-write cycles from several processes are serialised by the file lock"""
+    with _TempSonglist() as csv_path, tempfile.TemporaryDirectory() as lock_dir:
+        saved_lock_dir, file_locks.LOCK_DIR = file_locks.LOCK_DIR, Path(lock_dir)
+        try:
+            song_manager.flush_song_catalog()
+            workers = [_FORK.Process(target=_worker_adds_songs, args=(n,)) for n in range(4)]
+            for process in workers:
+                process.start()
+            for process in workers:
+                process.join(30)
+                assert process.exitcode == 0
+        finally:
+            file_locks.LOCK_DIR = saved_lock_dir
+        songs = song_manager.load_song_list_from_csv(csv_path)
+        assert len(songs) == 2 + 4 * ADDS_PER_WORKER
+        assert {"Alpha", "Beta", "Worker 3 Song 14"} <= set(songs)
+    song_manager.invalidate_song_catalog()
+    print("✅ Concurrent worker edits all persisted")
+
+
+def test_lock_held_by_another_process_times_out_as_conflict():
+    """A writer gives up with WriteConflict instead of waiting forever"""
+    with tempfile.TemporaryDirectory() as tmp:
+        target = str(Path(tmp) / "setlist.md")
+        locked, release = _FORK.Event(), _FORK.Event()
+        holder = _FORK.Process(target=_hold_lock, args=(target, locked, release))
+        holder.start()
+        try:
+            assert locked.wait(5)
+            try:
+                with file_lock(target, timeout=0.1):
+                    raise AssertionError("lock should be held by the other process")
+            except WriteConflict:
+                pass
+        finally:
+            release.set()
+            holder.join(5)
+        with file_lock(target, timeout=1):
+            # Reentrant within a thread
+            with file_lock(target, timeout=0):
+                pass
+    print("✅ Lock timeouts reported as conflicts")
+
+
+def test_stale_edits_are_rejected():
+    """Edits made from an outdated form raise WriteConflict and change nothing"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "Bar Setlist (010124).md")
+        Path(path).write_text("# ****—SET 1****  \nDreams  \n", encoding="utf-8")
+        opened = setlist_manager.setlist_markdown_version(setlist_manager.read_setlist_markdown(path))
+        assert opened == file_version(path)
+
+        setlist_manager.write_setlist_markdown(path, "# ****—SET 1****  \nSara  \n", opened)
+        try:
+            setlist_manager.write_setlist_markdown(path, "# ****—SET 1****  \nLandslide  \n", opened)
+            raise AssertionError("stale setlist edit should conflict")
+        except WriteConflict:
+            pass
+        assert "Sara" in setlist_manager.read_setlist_markdown(path)
+
+    with _TempSonglist():
+        songs = song_manager.load_song_list()
+        opened = song_manager.song_version("Alpha", songs["Alpha"])
+        song_manager.check_song_version(songs, "Alpha", opened)
+
+        def rename(songs_data):
+            songs_data["Alpha"]["artist"] = "Renamed"
+        song_manager.update_song_list(rename)
+
+        def stale_edit(songs_data):
+            song_manager.check_song_version(songs_data, "Alpha", opened)
+            songs_data["Alpha"]["bpm"] = 1
+        try:
+            song_manager.update_song_list(stale_edit)
+            raise AssertionError("stale song edit should conflict")
+        except WriteConflict:
+            pass
+        assert song_manager.get_song_catalog()["Alpha"]["bpm"] == 120
+        song_manager.flush_song_catalog()
+    song_manager.invalidate_song_catalog()
+    print("✅ Stale edits rejected")
+
+
+if __name__ == "__main__":
+    print("🎸 Running File Lock Tests...\n")
+    test_concurrent_workers_never_lose_edits()
+    test_lock_held_by_another_process_times_out_as_conflict()
+    test_stale_edits_are_rejected()
+    print("\n🎉 ALL TESTS PASSED!")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Test the data directory change-notification bus"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core import file_watcher, setlist_manager
+from core.file_watcher import ChangeEvent, DataWatcher
+
+
+def _wait_for(events, predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if any(predicate(e) for e in events):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_classify_paths():
+    """Paths map to typed events; temp files and unknown folders are ignored"""
+    root = Path("/data")
+    assert file_watcher.classify("/data/songlist/songlist_master.csv", root) == \
+        ChangeEvent("catalog", "modified", "/data/songlist/songlist_master.csv", "songlist_master.csv")
+    assert file_watcher.classify("/data/setlists/Bar (010124)/Bar (010124).md", root, "added").name == "Bar (010124)"
+    assert file_watcher.classify("/data/song_data/lyrics/Dreams.txt", root).kind == "lyrics"
+    assert file_watcher.classify("/data/song_data/tabs/Dreams.pdf", root).kind == "tabs"
+    assert file_watcher.classify("/data/stage_plots/plot.png", root).kind == "stage_plot"
+    assert file_watcher.classify("/data/song_data/lyrics/.abc123.tmp", root) is None
+    assert file_watcher.classify("/data/.cache/genius/ab/key.json", root) is None
+    assert file_watcher.classify("/elsewhere/Dreams.txt", root) is None
+    print("✅ Change event classification verified")
+
+
+def _check_backend(backend):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        lyrics_dir = root / "song_data" / "lyrics"
+        lyrics_dir.mkdir(parents=True)
+        (root / "setlists").mkdir()
+        (lyrics_dir / "Dreams.txt").write_text("thunder", encoding="utf-8")
+
+        watcher = DataWatcher(root, backend=backend, poll_interval=0.1)
+        lyrics_events, all_events = [], []
+        watcher.subscribe(lyrics_events.extend, kinds=["lyrics"])
+        watcher.subscribe(all_events.extend)
+        assert watcher.start() and watcher.running
+        try:
+            time.sleep(0.3)
+            (lyrics_dir / "Dreams.txt").write_text("thunder only happens", encoding="utf-8")
+            (lyrics_dir / "Time.txt").write_text("new", encoding="utf-8")
+            venue = root / "setlists" / "Bar Setlist (010124)"
+            venue.mkdir()
+            (venue / "Bar Setlist (010124).md").write_text("# ****—SET 1****  \n", encoding="utf-8")
+
+            assert _wait_for(lyrics_events, lambda e: e.name == "Dreams"), lyrics_events
+            assert _wait_for(lyrics_events, lambda e: e.name == "Time" and e.action in ("added", "modified"))
+            assert _wait_for(all_events, lambda e: e.kind == "setlist" and e.name == "Bar Setlist (010124)")
+            assert all(e.kind == "lyrics" for e in lyrics_events)
+
+            (lyrics_dir / "Time.txt").unlink()
+            assert _wait_for(lyrics_events, lambda e: e.name == "Time" and e.action == "deleted")
+        finally:
+            started = time.monotonic()
+            watcher.stop()
+            assert time.monotonic() - started < 3
+        assert not watcher.running
+
+
+def test_polling_backend_publishes_changes():
+    """The scandir polling fallback reports adds, edits and deletes per kind"""
+    _check_backend("polling")
+    print("✅ Polling watcher events verified")
+
+
+def test_inotify_backend_publishes_changes():
+    """The inotify backend reports the same events when watchfiles is installed"""
+    if file_watcher.watchfiles is None:
+        print("⚠️ watchfiles not installed; inotify backend skipped")
+        return
+    _check_backend("inotify")
+    print("✅ inotify watcher events verified")
+
+
+def test_watched_archive_skips_timed_rescans():
+    """While the watcher runs, the archive rescans on change events only"""
+    with tempfile.TemporaryDirectory() as tmp:
+        setlists_dir = Path(tmp) / "setlists"
+        venue = setlists_dir / "Bar Setlist (010124)"
+        venue.mkdir(parents=True)
+        (venue / "Bar Setlist (010124).md").write_text("# ****—SET 1****  \nDreams  \n", encoding="utf-8")
+
+        archive = setlist_manager.SetlistArchive(setlists_dir)
+        watcher = DataWatcher(Path(tmp), backend="polling", poll_interval=0.5)
+        archive.attach_watcher(watcher)
+        watcher.subscribe(archive.on_changes, kinds=["setlist"])
+        saved_interval = setlist_manager.SETLIST_RESCAN_INTERVAL
+        setlist_manager.SETLIST_RESCAN_INTERVAL = 0
+        watcher.start()
+        try:
+            version = archive.version
+            other = setlists_dir / "Club Setlist (020124)"
+            other.mkdir()
+            (other / "Club Setlist (020124).md").write_text("# ****—SET 1****  \nTime  \n", encoding="utf-8")
+            # No event published yet: the archive trusts what it has
+            assert archive.version == version
+
+            deadline = time.monotonic() + 5
+            while archive.version == version and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert [s['venue'] for s in archive.setlists()] == ["Club", "Bar"]
+        finally:
+            watcher.stop()
+            setlist_manager.SETLIST_RESCAN_INTERVAL = saved_interval
+    print("✅ Watched setlist archive invalidated by change events")
+
+
+if __name__ == "__main__":
+    print("🎸 Running File Watcher Tests...\n")
+    test_classify_paths()
+    test_polling_backend_publishes_changes()
+    test_inotify_backend_publishes_changes()
+    test_watched_archive_skips_timed_rescans()
+    print("\n🎉 ALL TESTS PASSED!")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Test the on-disk Genius response cache"""
+
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core.genius_cache import ResponseCache, cache_key
+
+SEARCH_URL = "https://api.genius.com/search"
+
+
+def test_hit_miss_and_content_addressing():
+    """Entries are keyed by namespace, URL and params regardless of param order"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(Path(tmp))
+        assert cache.get("search", SEARCH_URL, {"q": "superstition"}) == (False, None)
+
+        cache.put("search", SEARCH_URL, {"response": {"hits": [1]}}, {"q": "superstition", "per_page": 5})
+        assert cache.get("search", SEARCH_URL, {"per_page": "5", "q": "superstition"}) == (True, {"response": {"hits": [1]}})
+        assert cache.get("lyrics", SEARCH_URL, {"q": "superstition", "per_page": 5}) == (False, None)
+
+        key = cache_key("search", SEARCH_URL, {"q": "superstition", "per_page": 5})
+        entry = json.loads((Path(tmp) / key[:2] / f"{key}.json").read_text(encoding="utf-8"))
+        assert entry["negative"] is False and entry["url"] == SEARCH_URL
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 2, 1)
+        assert stats["hit_ratio"] == 0.333
+    print("✅ Cache hits, misses and content addressing verified")
+
+
+def test_negative_entries_expire_sooner():
+    """Negative entries use the shorter TTL and expired entries are pruned"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(Path(tmp), ttl=60, negative_ttl=0.05)
+        cache.put("lyrics", "https://genius.com/a", "la la la")
+        cache.put("lyrics", "https://genius.com/b", None, negative=True)
+
+        assert cache.get("lyrics", "https://genius.com/b") == (True, None)
+        assert cache.stats()["negative_hits"] == 1
+
+        time.sleep(0.1)
+        assert cache.get("lyrics", "https://genius.com/a") == (True, "la la la")
+        assert cache.get("lyrics", "https://genius.com/b") == (False, None)
+        assert cache.stats()["expired"] == 1
+
+        assert cache.prune() == 1
+        assert len(list(Path(tmp).glob("*/*.json"))) == 1
+    print("✅ Negative caching TTL and pruning verified")
+
+
+def test_disabled_and_corrupt_entries():
+    """A disabled cache stores nothing; a corrupt entry reads as a miss"""
+    with tempfile.TemporaryDirectory() as tmp:
+        disabled = ResponseCache(Path(tmp), enabled=False)
+        disabled.put("lyrics", "https://genius.com/a", "text")
+        assert not list(Path(tmp).glob("*/*.json"))
+
+        cache = ResponseCache(Path(tmp))
+        cache.put("lyrics", "https://genius.com/a", "text")
+        key = cache_key("lyrics", "https://genius.com/a")
+        (Path(tmp) / key[:2] / f"{key}.json").write_text("{not json", encoding="utf-8")
+        assert cache.get("lyrics", "https://genius.com/a") == (False, None)
+        assert cache.stats()["errors"] == 1
+    print("✅ Disabled cache and corrupt entries handled")
+
+
+def test_import_does_not_load_the_app():
+    """The maintenance scripts can import the cache without starting the catalog writer"""
+    probe = (
+        "import sys; sys.path.insert(0, sys.argv[1]); import core.genius_cache; "
+        "assert 'core.song_manager' not in sys.modules, 'song_manager imported'"
+    )
+    subprocess.run([sys.executable, "-c", probe, str(app_dir)], check=True)
+    print("✅ Cache import stays independent of the app")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Genius Cache Tests...\n")
+    test_hit_miss_and_content_addressing()
+    test_negative_entries_expire_sooner()
+    test_disabled_and_corrupt_entries()
+    test_import_does_not_load_the_app()
+    print("\n🎉 ALL TESTS PASSED!")
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Test the pooled Genius client against a local stand-in HTTP server"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core import genius_cache, genius_client, lyrics_fetcher
+
+SONG_PAGE = (
+    "<html><body>"
+    "<div data-lyrics-container='true'>[Verse 1]<br/>Very superstitious<br/>Writing on the wall</div>"
+    "</body></html>"
+)
+
+
+class _StandInGenius(BaseHTTPRequestHandler):
+    """Serves a search endpoint, a song page and a flaky endpoint; records client ports"""
+
+    protocol_version = "HTTP/1.1"
+    client_ports = []
+    flaky_calls = 0
+
+    def _send(self, status, body, content_type):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        _StandInGenius.client_ports.append(self.client_address[1])
+        host = f"http://127.0.0.1:{self.server.server_address[1]}"
+        if self.path.startswith("/api/search/multi") and "q=Nothing" in self.path:
+            self._send(200, json.dumps({"response": {"sections": []}}), "application/json")
+        elif self.path.startswith("/api/search/multi"):
+            data = {"response": {"sections": [{"type": "song", "hits": [{"result": {
+                "url": f"{host}/songs/superstition",
+                "title": "Superstition",
+                "primary_artist": {"name": "Stevie Wonder"},
+            }}]}]}}
+            self._send(200, json.dumps(data), "application/json")
+        elif self.path.startswith("/songs/"):
+            self._send(200, SONG_PAGE, "text/html")
+        elif self.path.startswith("/flaky"):
+            _StandInGenius.flaky_calls += 1
+            if _StandInGenius.flaky_calls < 3:
+                self._send(503, "busy", "text/plain")
+            else:
+                self._send(200, "ok", "text/plain")
+        elif self.path.startswith("/slow"):
+            time.sleep(1.0)
+            self._send(200, "late", "text/plain")
+        else:
+            self._send(404, "missing", "text/plain")
+
+    def log_message(self, *args):
+        pass
+
+
+class _StandInServer:
+    def __init__(self, cached=False):
+        self.cached = cached
+
+    def __enter__(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInGenius)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        _StandInGenius.client_ports = []
+        _StandInGenius.flaky_calls = 0
+        self._saved_url = lyrics_fetcher.GENIUS_SEARCH_URL
+        self._saved_token = os.environ.pop("GENIUS_ACCESS_TOKEN", None)
+        lyrics_fetcher.GENIUS_SEARCH_URL = f"{self.base}/api/search/multi"
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self._saved_cache = genius_cache.set_genius_cache(
+            genius_cache.ResponseCache(Path(self.cache_dir.name), enabled=self.cached)
+        )
+        self._saved_client = genius_client.set_genius_client(
+            genius_client.GeniusClient(backoff_base=0.01, backoff_cap=0.05, rate_per_second=100, burst=100)
+        )
+        return self
+
+    def __exit__(self, *exc):
+        test_client = genius_client.set_genius_client(self._saved_client)
+        if test_client is not None:
+            genius_client.run_on_client_loop_sync(test_client.aclose())
+        genius_cache.set_genius_cache(self._saved_cache)
+        self.cache_dir.cleanup()
+        lyrics_fetcher.GENIUS_SEARCH_URL = self._saved_url
+        if self._saved_token is not None:
+            os.environ["GENIUS_ACCESS_TOKEN"] = self._saved_token
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_fetch_lyrics_online_contract_and_connection_reuse():
+    """fetch_lyrics_online keeps its dict contract and reuses pooled connections"""
+    with _StandInServer():
+        first = lyrics_fetcher.fetch_lyrics_online("Superstition", "Stevie Wonder")
+        second = lyrics_fetcher.fetch_lyrics_online("Superstition", "Stevie Wonder")
+        assert set(first) == {'success', 'lyrics', 'matched_title', 'matched_artist', 'source_url', 'error'}
+        assert first['success'] is True and first['error'] is None
+        assert first['lyrics'] == "[Verse 1]\nVery superstitious\nWriting on the wall"
+        assert first['matched_artist'] == "Stevie Wonder"
+        assert second == first
+        assert len(_StandInGenius.client_ports) == 4
+        assert len(set(_StandInGenius.client_ports)) == 1, "requests did not share a keep-alive connection"
+    print("✅ fetch_lyrics_online contract and keep-alive reuse verified")
+
+
+def test_async_variant_matches_sync():
+    """fetch_lyrics_online_async works from an unrelated event loop"""
+    with _StandInServer():
+        result = asyncio.run(lyrics_fetcher.fetch_lyrics_online_async("Superstition"))
+        assert result['success'] is True
+        assert "superstitious" in result['lyrics']
+    print("✅ Async lyrics fetch from a foreign event loop verified")
+
+
+def test_retry_and_deadline():
+    """5xx responses are retried with backoff; the deadline bounds slow servers"""
+    with _StandInServer() as stand_in:
+        async def flaky():
+            client = genius_client.get_genius_client()
+            return await client.get(f"{stand_in.base}/flaky", deadline=genius_client.deadline_in(5))
+
+        resp = genius_client.run_on_client_loop_sync(flaky())
+        assert resp.status_code == 200
+        assert _StandInGenius.flaky_calls == 3
+
+        async def slow():
+            client = genius_client.get_genius_client()
+            return await client.get(f"{stand_in.base}/slow", deadline=genius_client.deadline_in(0.3))
+
+        started = time.monotonic()
+        try:
+            genius_client.run_on_client_loop_sync(slow())
+            raise AssertionError("slow request should have exceeded its deadline")
+        except genius_client.GeniusRequestError:
+            pass
+        assert time.monotonic() - started < 0.9
+    print("✅ Jittered retry on 503 and overall deadline verified")
+
+
+def test_cached_lookup_skips_network():
+    """A repeated lookup is served from the on-disk cache; unknown songs are cached as negative"""
+    with _StandInServer(cached=True) as stand_in:
+        first = lyrics_fetcher.fetch_lyrics_online("Superstition", "Stevie Wonder")
+        requests_after_first = len(_StandInGenius.client_ports)
+        second = lyrics_fetcher.fetch_lyrics_online("Superstition", "Stevie Wonder")
+        assert second == first and first['success'] is True
+        assert len(_StandInGenius.client_ports) == requests_after_first == 2
+
+        cache = genius_cache.get_genius_cache()
+        assert cache.stats()["hits"] == 2  # search + lyrics page
+
+        # "No results" is cached (negatively) after one request
+        assert lyrics_fetcher.fetch_lyrics_online("Nothing Here")['success'] is False
+        assert lyrics_fetcher.fetch_lyrics_online("Nothing Here")['success'] is False
+        assert len(_StandInGenius.client_ports) == 3
+        assert cache.stats()["negative_hits"] == 1
+
+        # Error responses are never cached
+        lyrics_fetcher.GENIUS_SEARCH_URL = f"{stand_in.base}/missing"
+        assert lyrics_fetcher.fetch_lyrics_online("Superstition")['success'] is False
+        assert lyrics_fetcher.fetch_lyrics_online("Superstition")['success'] is False
+        assert len(_StandInGenius.client_ports) == 5
+        assert cache.stats()["stores"] == 3
+    print("✅ Cached Genius lookups skip the network")
+
+
+def test_lyrics_entries_shared_with_scripts():
+    """The app caches a page's raw lyrics text and serves a script's entry for the same page"""
+    with _StandInServer(cached=True) as stand_in:
+        page_url = f"{stand_in.base}/songs/superstition"
+        cache = genius_cache.get_genius_cache()
+        lyrics_fetcher.fetch_lyrics_online("Superstition", "Stevie Wonder")
+        assert cache.get(genius_cache.LYRICS_NAMESPACE, page_url) == (
+            True, "[Verse 1]\nVery superstitious\nWriting on the wall"
+        )
+
+        # An entry stored by scripts/fetch_lyrics.py is read back, cleaned, without a page fetch
+        cache.put(genius_cache.LYRICS_NAMESPACE, page_url, "Superstition Lyrics\n[Chorus]\nWhen you believe in things")
+        requests_before = len(_StandInGenius.client_ports)
+        result = lyrics_fetcher.fetch_lyrics_online("Superstition", "Stevie Wonder")
+        assert result['lyrics'] == "[Chorus]\nWhen you believe in things"
+        assert len(_StandInGenius.client_ports) == requests_before
+    print("✅ Lyrics cache entries shared with the scripts")
+
+
+def test_token_bucket_rate():
+    """The bucket allows a burst and then spaces requests at the configured rate"""
+    async def drain():
+        bucket = genius_client.TokenBucket(rate=20, capacity=2)
+        started = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(drain())
+    assert 0.15 <= elapsed < 0.5, f"unexpected rate-limited duration {elapsed:.3f}s"
+    print("✅ Token bucket rate limiting verified")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Genius Client Tests...\n")
+    test_fetch_lyrics_online_contract_and_connection_reuse()
+    test_async_variant_matches_sync()
+    test_retry_and_deadline()
+    test_cached_lookup_skips_network()
+    test_lyrics_entries_shared_with_scripts()
+    test_token_bucket_rate()
+    print("\n🎉 ALL TESTS PASSED!")
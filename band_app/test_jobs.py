@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Test the admin background job runner"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from starlette.testclient import TestClient
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+import main
+from api import admin
+from core.jobs import JobManager, python_command
+
+
+def _python(code):
+    return [sys.executable, "-c", code]
+
+
+def test_job_lifecycle_output_and_queueing():
+    """Jobs queue behind the concurrency limit, capture output and record exit status"""
+    async def run():
+        manager = JobManager(max_concurrent=1, state_dir=Path(state_dir))
+        first = manager.submit("first", _python("import time; print('hello'); time.sleep(0.3); print('bye')"))
+        second = manager.submit("second", _python("import sys; print('oops'); sys.exit(3)"))
+        await asyncio.sleep(0.1)
+        assert first.status == "running"
+        assert second.status == "queued"
+
+        await manager.wait(second.id)
+        assert first.status == "succeeded" and list(first.output) == ["hello", "bye"]
+        assert second.status == "failed" and second.returncode == 3
+        assert second.to_dict(include_output=True)["output"] == ["oops"]
+        assert [job.name for job in manager.list_jobs()] == ["second", "first"]
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        asyncio.run(run())
+    print("✅ Job queueing, output capture and exit codes verified")
+
+
+def test_cancel_and_timeout():
+    """Running jobs can be cancelled; jobs past their timeout are stopped"""
+    async def run():
+        manager = JobManager(max_concurrent=2, state_dir=Path(state_dir))
+        sleeper = manager.submit("sleeper", _python("import time; time.sleep(30)"))
+        slow = manager.submit("slow", _python("import time; time.sleep(30)"), timeout=0.3)
+        await asyncio.sleep(0.2)
+
+        started = time.monotonic()
+        assert await manager.cancel(sleeper.id) is True
+        assert sleeper.status == "cancelled"
+        assert await manager.cancel(sleeper.id) is False
+
+        await manager.wait(slow.id)
+        assert slow.status == "failed" and "Timed out" in slow.error
+        assert time.monotonic() - started < 5
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        asyncio.run(run())
+    print("✅ Job cancellation and timeout verified")
+
+
+def test_jobs_are_shared_between_workers():
+    """Another worker sees a job's status and output, can cancel it, and shares the job limit"""
+    async def run():
+        owner = JobManager(max_concurrent=1, state_dir=Path(state_dir))
+        other = JobManager(max_concurrent=1, state_dir=Path(state_dir))
+        sleeper = owner.submit("sleeper", _python("import time; print('started', flush=True); time.sleep(30)"))
+        await asyncio.sleep(1.0)
+        seen = other.get(sleeper.id)
+        assert seen is not None and seen.status == "running" and list(seen.output) == ["started"]
+        assert [job.id for job in other.list_jobs()] == [sleeper.id]
+
+        # The slot is held by the owner's job, so the other worker's job waits
+        queued = other.submit("queued", _python("print('ran')"))
+        await asyncio.sleep(0.6)
+        assert queued.status == "queued"
+
+        assert await other.cancel(sleeper.id) is True
+        assert sleeper.status == "cancelled" and other.get(sleeper.id).status == "cancelled"
+        assert await other.cancel(sleeper.id) is False
+        await other.wait(queued.id)
+        assert queued.status == "succeeded" and owner.get(queued.id).status == "succeeded"
+        assert other.get("unknown") is None
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        asyncio.run(run())
+    print("✅ Job state shared across workers")
+
+
+def test_admin_endpoints_do_not_block():
+    """The admin endpoint returns immediately and other requests are served while the job runs"""
+    saved_dir = admin.SCRIPTS_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        script = Path(tmp) / "update_artists.py"
+        script.write_text("import time\nprint('updating', flush=True)\ntime.sleep(1.0)\nprint('done')\n", encoding="utf-8")
+        admin.SCRIPTS_DIR = Path(tmp)
+        try:
+            with TestClient(main.app) as client:
+                started = time.perf_counter()
+                res = client.post("/api/admin/update-artists")
+                assert res.status_code == 200
+                job_id = res.json()["job_id"]
+                assert client.get("/health").status_code == 200
+                assert time.perf_counter() - started < 0.5
+
+                assert client.get(f"/api/admin/jobs/{job_id}").json()["status"] in ("queued", "running")
+                for _ in range(50):
+                    job = client.get(f"/api/admin/jobs/{job_id}").json()
+                    if job["status"] not in ("queued", "running"):
+                        break
+                    time.sleep(0.1)
+                assert job["status"] == "succeeded"
+                assert job["output"] == ["updating", "done"]
+                assert job["command"] == python_command(script)
+
+                assert any(j["id"] == job_id for j in client.get("/api/admin/jobs").json()["jobs"])
+                assert client.post(f"/api/admin/jobs/{job_id}/cancel").status_code == 409
+                assert client.get("/api/admin/jobs/unknown").status_code == 404
+        finally:
+            admin.SCRIPTS_DIR = saved_dir
+    print("✅ Admin job endpoints verified")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Job Runner Tests...\n")
+    test_job_lifecycle_output_and_queueing()
+    test_cancel_and_timeout()
+    test_jobs_are_shared_between_workers()
+    test_admin_endpoints_do_not_block()
+    print("\n🎉 ALL TESTS PASSED!")
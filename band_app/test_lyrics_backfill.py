@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Test the concurrent lyrics backfill pipeline"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core import lyrics_backfill, lyrics_manager
+
+FAKE_FETCH_SECONDS = 0.2
+
+
+class _PatchedBackfill:
+    """Point lyrics at a temp dir and replace the Genius fetch with a slow fake"""
+
+    def __init__(self, fake_fetch):
+        self.fake_fetch = fake_fetch
+
+    def __enter__(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self._saved_dir = lyrics_manager.LYRICS_DIR
+        self._saved_fetch = lyrics_backfill.fetch_lyrics_online_async
+        lyrics_manager.LYRICS_DIR = Path(self.tmp.name)
+        lyrics_backfill.fetch_lyrics_online_async = self.fake_fetch
+        return Path(self.tmp.name)
+
+    def __exit__(self, *exc):
+        lyrics_manager.LYRICS_DIR = self._saved_dir
+        lyrics_backfill.fetch_lyrics_online_async = self._saved_fetch
+        self.tmp.cleanup()
+
+
+def _collect(songs, concurrency):
+    async def run():
+        return [event async for event in lyrics_backfill.backfill_lyrics(songs, concurrency)]
+    return asyncio.run(run())
+
+
+def test_backfill_runs_concurrently_and_saves():
+    """Songs are fetched in parallel up to the limit and written to the lyrics dir"""
+    in_flight = {'now': 0, 'peak': 0}
+
+    async def fake_fetch(title, artist=""):
+        in_flight['now'] += 1
+        in_flight['peak'] = max(in_flight['peak'], in_flight['now'])
+        await asyncio.sleep(FAKE_FETCH_SECONDS)
+        in_flight['now'] -= 1
+        if title == "Unknown Jam":
+            return {'success': False, 'lyrics': '', 'error': "No Genius search results found"}
+        return {'success': True, 'lyrics': f"{title} by {artist}", 'matched_title': title,
+                'source_url': f"https://genius.com/{title}", 'error': None}
+
+    songs = {f"Song {i}": {'artist': "Band"} for i in range(11)}
+    songs["Unknown Jam"] = {'artist': ""}
+
+    with _PatchedBackfill(fake_fetch) as lyrics_dir:
+        started = time.perf_counter()
+        events = _collect(songs, concurrency=4)
+        elapsed = time.perf_counter() - started
+
+        assert events[0] == {'event': 'start', 'total': 12}
+        song_events = [e for e in events if e['event'] == 'song']
+        assert [e['done'] for e in song_events] == list(range(1, 13))
+        assert events[-1] == {'event': 'complete', 'total': 12, 'saved': 11, 'skipped': 0, 'not_found': 1, 'error': 0}
+
+        assert in_flight['peak'] == 4
+        # 12 songs at 4 wide is 3 rounds, far below the 12 rounds of a serial run
+        assert elapsed < FAKE_FETCH_SECONDS * 6, f"backfill took {elapsed:.2f}s"
+
+        assert (lyrics_dir / "Song 3.txt").read_text(encoding="utf-8") == "Song 3 by Band"
+        assert not (lyrics_dir / "Unknown Jam.txt").exists()
+        assert not list(lyrics_dir.glob(".*.tmp")), "temp files left behind"
+    print(f"✅ Backfilled 12 songs in {elapsed:.2f}s with at most 4 in flight")
+
+
+def test_backfill_never_overwrites_existing_lyrics():
+    """A lyrics file that appears while the backfill runs is kept, not clobbered"""
+    async def fake_fetch(title, artist=""):
+        await asyncio.sleep(0.01)
+        return {'success': True, 'lyrics': "fetched", 'matched_title': title, 'source_url': "", 'error': None}
+
+    with _PatchedBackfill(fake_fetch) as lyrics_dir:
+        (lyrics_dir / "Hand Written.txt").write_text("typed at rehearsal", encoding="utf-8")
+        events = _collect({"Hand Written": {'artist': ""}, "Fresh": {'artist': ""}}, concurrency=2)
+
+        statuses = {e['song']: e['status'] for e in events if e['event'] == 'song'}
+        assert statuses == {"Hand Written": "skipped", "Fresh": "saved"}
+        assert (lyrics_dir / "Hand Written.txt").read_text(encoding="utf-8") == "typed at rehearsal"
+        assert (lyrics_dir / "Fresh.txt").read_text(encoding="utf-8") == "fetched"
+    print("✅ Existing lyrics preserved during backfill")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Lyrics Backfill Tests...\n")
+    test_backfill_runs_concurrently_and_saves()
+    test_backfill_never_overwrites_existing_lyrics()
+    print("\n🎉 ALL TESTS PASSED!")
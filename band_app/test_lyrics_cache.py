@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Test the rendered-lyrics cache"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core import lyrics_manager
+from core.lyrics_manager import RenderedLyricsCache
+
+
+def _with_temp_lyrics_dir(test):
+    def run():
+        saved_dir = lyrics_manager.LYRICS_DIR
+        with tempfile.TemporaryDirectory() as tmp:
+            lyrics_manager.LYRICS_DIR = Path(tmp)
+            lyrics_manager.get_lyrics_cache().clear()
+            try:
+                test(Path(tmp))
+            finally:
+                lyrics_manager.LYRICS_DIR = saved_dir
+                lyrics_manager.get_lyrics_cache().clear()
+    run.__name__ = test.__name__
+    run.__doc__ = test.__doc__
+    return run
+
+
+@_with_temp_lyrics_dir
+def test_repeat_views_reuse_rendered_html(lyrics_dir):
+    """A second view is served from the cache and matches a fresh render"""
+    (lyrics_dir / "Sugar.txt").write_text("\r\n[Chorus]\r\nSweet & low\xa0\r\n", encoding="utf-8")
+    cache = lyrics_manager.get_lyrics_cache()
+    hits, misses = cache.hits, cache.misses
+
+    content, rendered = lyrics_manager.load_lyrics_for_display("Sugar")
+    assert content == "[Chorus]\nSweet & low"
+    assert rendered == lyrics_manager.format_lyrics_for_display(content)
+    assert rendered == "<strong>[Chorus]</strong><br/>Sweet &amp; low"
+    assert (cache.hits - hits, cache.misses - misses) == (0, 1)
+
+    assert lyrics_manager.load_lyrics_for_display("Sugar") == (content, rendered)
+    assert lyrics_manager.load_lyrics_content("Sugar") == content
+    assert (cache.hits - hits, cache.misses - misses) == (2, 1)
+
+    missing_content, missing_html = lyrics_manager.load_lyrics_for_display("Nope")
+    assert "not found" in missing_content and missing_html == ""
+    print("✅ Repeat lyrics views served from cache")
+
+
+@_with_temp_lyrics_dir
+def test_writes_and_external_edits_invalidate(lyrics_dir):
+    """Saves, deletes and out-of-band edits are never served stale"""
+    lyrics_manager.save_lyrics_content("Edit Me", "first")
+    assert lyrics_manager.load_lyrics_content("Edit Me") == "first"
+
+    lyrics_manager.save_lyrics_content("Edit Me", "first!")
+    assert lyrics_manager.load_lyrics_for_display("Edit Me")[1] == "first!"
+
+    # Edited by another tool: size changes, so the file identity changes
+    (lyrics_dir / "Edit Me.txt").write_text("edited elsewhere", encoding="utf-8")
+    assert lyrics_manager.load_lyrics_content("Edit Me") == "edited elsewhere"
+
+    lyrics_manager.delete_lyrics_file("Edit Me")
+    assert "not found" in lyrics_manager.load_lyrics_content("Edit Me")
+    print("✅ Lyrics cache invalidation verified")
+
+
+def test_cache_is_bounded():
+    """Least recently used files are evicted beyond the size limit"""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for name in ("a", "b", "c"):
+            path = Path(tmp) / f"{name}.txt"
+            path.write_text(name, encoding="utf-8")
+            paths.append(path)
+
+        cache = RenderedLyricsCache(max_entries=2)
+        cache.text(paths[0])
+        cache.text(paths[1])
+        cache.text(paths[0])
+        cache.text(paths[2])  # evicts b, the least recently used
+        assert list(cache._entries) == [str(paths[0]), str(paths[2])]
+    print("✅ Lyrics cache stays within its size limit")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Lyrics Cache Tests...\n")
+    test_repeat_views_reuse_rendered_html()
+    test_writes_and_external_edits_invalidate()
+    test_cache_is_bounded()
+    print("\n🎉 ALL TESTS PASSED!")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Tests for the inverted lyrics full-text index"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core.lyrics_index import LyricsIndex, parse_query
+
+
+def _make_corpus(root: Path) -> None:
+    (root / "Night Song.txt").write_text(
+        "[Verse 1]\nDancing in the moonlight\nEverybody feeling warm and bright\n"
+        "[Chorus]\nDancing in the moonlight\n", encoding="utf-8")
+    (root / "Day Song.txt").write_text(
+        "Moonlight fades away\nDancing through the day\n", encoding="utf-8")
+    (root / "Other Song.txt").write_text("Nothing to see here\n", encoding="utf-8")
+
+
+def test_query_parsing():
+    """Bare words are AND clauses and quoted text is a phrase"""
+    assert parse_query('dancing "in the moonlight"') == [["dancing"], ["in", "the", "moonlight"]]
+    assert parse_query("Don’t   stop") == [["don't"], ["stop"]]
+    assert parse_query('  "" ') == []
+    print("✅ Lyrics query parsing verified")
+
+
+def test_and_phrase_and_ranking():
+    """AND queries intersect, phrases need adjacency, and results carry snippets"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _make_corpus(root)
+        index = LyricsIndex(root)
+
+        both = index.search("dancing moonlight")
+        assert [r['song_name'] for r in both] == ["Night Song", "Day Song"]
+        assert both[0]['score'] > both[1]['score']
+        assert both[0]['snippets'][0] == {'line': 2, 'text': "Dancing in the moonlight"}
+
+        phrase = index.search('"in the moonlight"')
+        assert [r['song_name'] for r in phrase] == ["Night Song"]
+        assert index.search('"moonlight dancing"') == []
+        assert index.search("moonlight absentword") == []
+        assert len(index.search("dancing", limit=1)) == 1
+    print("✅ Lyrics AND, phrase and ranked search verified")
+
+
+def test_incremental_updates():
+    """Edited, added and removed files are reflected after invalidation"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _make_corpus(root)
+        index = LyricsIndex(root)
+        assert index.search("nothing")[0]['song_name'] == "Other Song"
+        version = index.version
+
+        (root / "Other Song.txt").write_text("Something new entirely\n", encoding="utf-8")
+        (root / "Fresh Song.txt").write_text("Nothing but fresh\n", encoding="utf-8")
+        (root / "Day Song.txt").unlink()
+        index.invalidate()
+
+        assert [r['song_name'] for r in index.search("nothing")] == ["Fresh Song"]
+        assert [r['song_name'] for r in index.search("dancing")] == ["Night Song"]
+        assert index.search("something")[0]['song_name'] == "Other Song"
+        assert index.version > version
+    print("✅ Lyrics index incremental updates verified")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Lyrics Index Tests...\n")
+    test_query_parsing()
+    test_and_phrase_and_ranking()
+    test_incremental_updates()
+    print("\n🎉 ALL TESTS PASSED!")
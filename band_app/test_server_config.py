@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Tests for the dev and production server launch profiles"""
+
+import io
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core import server_config
+from core.server_config import BufferedAccessLogHandler, parse_args, uvicorn_options
+
+
+def test_profiles_select_uvicorn_options():
+    """dev keeps the reloader; production drops it and tunes workers, loop and keep-alive"""
+    dev = uvicorn_options("dev", port=9000)
+    assert dev["reload"] is True and "workers" not in dev and dev["port"] == 9000
+
+    prod = uvicorn_options("production", workers=3)
+    assert prod["reload"] is False and prod["workers"] == 3
+    assert prod["timeout_keep_alive"] == server_config.PRODUCTION_KEEPALIVE_SECONDS
+    assert prod["loop"] in ("uvloop", "asyncio") and prod["http"] in ("httptools", "h11")
+    assert prod["loop"] == ("uvloop" if server_config.module_available("uvloop") else "asyncio")
+    access = prod["log_config"]["handlers"]["access"]
+    assert access["()"] == "core.server_config.BufferedAccessLogHandler"
+    assert uvicorn_options("production", workers=0, keepalive=5)["workers"] == 1
+    assert uvicorn_options("production", keepalive=5)["timeout_keep_alive"] == 5
+
+    try:
+        uvicorn_options("staging")
+        raise AssertionError("unknown profile should be rejected")
+    except ValueError:
+        pass
+    print("✅ Server profiles map to uvicorn options")
+
+
+def test_flags_override_environment():
+    """Environment variables set defaults; command-line flags win"""
+    saved = {key: os.environ.get(key) for key in ("BAND_APP_PROFILE", "BCH_WORKERS", "BAND_APP_KEEPALIVE_SECONDS")}
+    try:
+        os.environ.update({"BAND_APP_PROFILE": "production", "BCH_WORKERS": "2", "BAND_APP_KEEPALIVE_SECONDS": "12"})
+        args = parse_args([])
+        assert (args.profile, args.workers, args.keepalive) == ("production", 2, 12)
+        args = parse_args(["--profile", "dev", "--workers", "4", "--keepalive", "7"])
+        assert (args.profile, args.workers, args.keepalive) == ("dev", 4, 7)
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    print("✅ Flags override environment defaults")
+
+
+def test_access_log_is_written_in_batches():
+    """Logging a request only enqueues; lines are written in batches and on close"""
+    stream = io.StringIO()
+    handler = BufferedAccessLogHandler(stream=stream, capacity=5, flush_interval=60)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger("test.access.batched")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(4):
+            logger.info("GET /api/songs/%d 200", i)
+        time.sleep(0.1)
+        assert stream.getvalue() == ""
+
+        logger.info("GET /api/songs/4 200")
+        deadline = time.monotonic() + 2
+        while not stream.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert stream.getvalue().splitlines() == [f"GET /api/songs/{i} 200" for i in range(5)]
+
+        logger.info("GET /health 200")
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+    assert stream.getvalue().splitlines()[-1] == "GET /health 200"
+
+    timed = BufferedAccessLogHandler(stream=io.StringIO(), capacity=1000, flush_interval=0.05)
+    timed.setFormatter(logging.Formatter("%(message)s"))
+    timed.handle(logging.makeLogRecord({"msg": "GET / 200"}))
+    time.sleep(0.3)
+    assert timed.stream.getvalue() == "GET / 200\n"
+    timed.close()
+    print("✅ Access log buffered off the request path")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Server Config Tests...\n")
+    test_profiles_select_uvicorn_options()
+    test_flags_override_environment()
+    test_access_log_is_written_in_batches()
+    print("\n🎉 ALL TESTS PASSED!")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Tests for the incrementally maintained setlist analytics"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core import setlist_manager
+from core.setlist_analytics import SetlistAnalytics
+
+
+def _write_setlist(root: Path, venue_dir: str, songs) -> Path:
+    venue_path = root / venue_dir
+    venue_path.mkdir(parents=True, exist_ok=True)
+    file_path = venue_path / f"{venue_dir}.md"
+    body = "# ****—SET 1****  \n" + "".join(f"{song}  \n" for song in songs)
+    file_path.write_text(body, encoding="utf-8")
+    st = file_path.stat()
+    os.utime(file_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    return file_path
+
+
+def test_analytics_summary():
+    """Counts match a from-scratch tally of the archive"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write_setlist(root, "Bar Setlist (010124)", ["Dreams", "Time", "Remedy"])
+        _write_setlist(root, "Bar Setlist (020124)", ["Dreams", "Time"])
+        _write_setlist(root, "Club Setlist (030124)", ["Dreams"])
+
+        summary = SetlistAnalytics(setlist_manager.SetlistArchive(root)).summary()
+        assert summary['total_shows'] == 3
+        assert summary['unique_songs'] == 3
+        assert summary['total_songs_played'] == 6
+        assert summary['avg_songs_per_show'] == 2.0
+        assert summary['song_counts'][0] == {'song': "Dreams", 'times_played': 3}
+        assert summary['venue_counts'] == [{'venue': "Bar", 'shows': 2}, {'venue': "Club", 'shows': 1}]
+        assert [(s['venue'], s['songs']) for s in summary['songs_per_show']] == [
+            ("Club", 1), ("Bar", 2), ("Bar", 3)]
+        assert summary['played_once'] == ["Remedy"]
+        assert summary['etag'].startswith('"')
+    print("✅ Setlist analytics summary verified")
+
+
+def test_analytics_updates_only_changed_setlists():
+    """Edits and deletes adjust the running totals; an unchanged archive reuses the summary"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        first = _write_setlist(root, "Bar Setlist (010124)", ["Dreams", "Time"])
+        _write_setlist(root, "Club Setlist (020124)", ["Dreams"])
+
+        archive = setlist_manager.SetlistArchive(root)
+        analytics = SetlistAnalytics(archive)
+        before = analytics.summary()
+        assert analytics.summary() is before
+        assert before['played_once'] == ["Time"]
+
+        applied = []
+        original = analytics._apply
+        analytics._apply = lambda file_path, delta: (applied.append((file_path, delta)), original(file_path, delta))
+
+        _write_setlist(root, "Bar Setlist (010124)", ["Dreams", "Time", "Landslide"])
+        archive.invalidate()
+        after = analytics.summary()
+        assert applied == [(str(first), -1), (str(first), 1)]
+        assert after['played_once'] == ["Landslide", "Time"]
+        assert after['total_songs_played'] == 4
+        assert after['etag'] != before['etag']
+
+        first.unlink()
+        first.parent.rmdir()
+        archive.invalidate()
+        gone = analytics.summary()
+        assert gone['venue_counts'] == [{'venue': "Club", 'shows': 1}]
+        assert gone['song_counts'] == [{'song': "Dreams", 'times_played': 1}]
+        assert gone['played_once'] == ["Dreams"]
+    print("✅ Setlist analytics incremental updates verified")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Setlist Analytics Tests...\n")
+    test_analytics_summary()
+    test_analytics_updates_only_changed_setlists()
+    print("\n🎉 ALL TESTS PASSED!")
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Tests for the in-memory setlist archive index"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core import setlist_manager
+
+
+def _write_setlist(root: Path, venue_dir: str, songs) -> Path:
+    venue_path = root / venue_dir
+    venue_path.mkdir(parents=True, exist_ok=True)
+    file_path = venue_path / f"{venue_dir}.md"
+    body = "# ****—SET 1****  \n" + "".join(f"{song}  \n" for song in songs)
+    file_path.write_text(body, encoding="utf-8")
+    return file_path
+
+
+def _count_parses():
+    """Wrap parse_setlist_file so tests can see how often the archive reparses"""
+    calls = []
+    original = setlist_manager.parse_setlist_file
+
+    def counting(file_path, venue_dir):
+        calls.append(file_path)
+        return original(file_path, venue_dir)
+
+    setlist_manager.parse_setlist_file = counting
+    return calls, original
+
+
+def test_archive_orders_newest_first_and_looks_up_by_id():
+    """Setlists sort by ISO date; slug ids and positional lookups match the ordered list"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write_setlist(root, "Old Bar Setlist (010223)", ["Dreams (120)"])
+        _write_setlist(root, "New Bar Setlist (120624)", ["1999 (119)"])
+        _write_setlist(root, "Mystery Setlist", ["Time"])
+
+        archive = setlist_manager.SetlistArchive(root)
+        setlists = archive.setlists()
+        assert [s['venue'] for s in setlists] == ["New Bar", "Old Bar", "Mystery Setlist"]
+        assert [s['id'] for s in setlists] == [
+            "new-bar-setlist-120624", "old-bar-setlist-010223", "mystery-setlist"]
+        assert archive.get("old-bar-setlist-010223") is setlists[1]
+        assert archive.get("0") is None
+        assert archive.get_by_position(0) is setlists[0]
+        assert archive.get_by_position(2)['date'] == "Unknown"
+        assert archive.get_by_position(3) is None
+        assert archive.get_by_position(-1) is None
+        assert setlist_manager.setlist_sort_key("12/06/24") == "2024-12-06"
+    print("✅ Setlist archive ordering, slug ids and positional lookup verified")
+
+
+def test_archive_reparses_only_changed_files():
+    """A rescan stats every file but only reparses the ones that changed"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        first = _write_setlist(root, "Venue A Setlist (010124)", ["Dreams"])
+        _write_setlist(root, "Venue B Setlist (020124)", ["Time"])
+
+        calls, original = _count_parses()
+        try:
+            archive = setlist_manager.SetlistArchive(root)
+            archive.refresh(force=True)
+            assert len(calls) == 2
+            version = archive.version
+
+            archive.refresh(force=True)
+            assert len(calls) == 2
+            assert archive.version == version
+
+            first.write_text("# ****—SET 1****  \nDreams  \nTime  \n", encoding="utf-8")
+            st = first.stat()
+            os.utime(first, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            archive.refresh(force=True)
+            assert calls[2:] == [str(first)]
+            assert archive.version > version
+
+            _write_setlist(root, "Venue C Setlist (030124)", ["Remedy"])
+            archive.invalidate()
+            assert archive.get_by_position(0)['venue'] == "Venue C"
+            # Ids don't shift when a newer setlist is added in front
+            assert archive.get("venue-a-setlist-010124")['file_path'] == str(first)
+            assert len(calls) == 4
+        finally:
+            setlist_manager.parse_setlist_file = original
+    print("✅ Setlist archive incremental reparse verified")
+
+
+def test_setlist_ids_are_unique_and_not_numeric():
+    """Several files in one venue dir, colliding slugs and digit-only names all get distinct ids"""
+    files = {
+        "/s/Café Bar (010124)/Early.md": "Café Bar (010124)",
+        "/s/Café Bar (010124)/Late.md": "Café Bar (010124)",
+        "/s/Cafe Bar (010124)/x.md": "Cafe Bar (010124)",
+        "/s/cafe bar (010124)/x.md": "cafe bar (010124)",
+        "/s/2024/2024.md": "2024",
+        "/s/Paradise (082424)/Notes.md": "Paradise (082424)",
+        "/s/Paradise (082424)/Paradise (082424).md": "Paradise (082424)",
+    }
+    ids = setlist_manager.assign_setlist_ids(files)
+    # Without history, directories take the slug in name order, then files within one
+    assert ids["/s/Cafe Bar (010124)/x.md"] == "cafe-bar-010124"
+    assert ids["/s/Café Bar (010124)/Early.md"].startswith("cafe-bar-010124-")
+    assert ids["/s/Café Bar (010124)/Late.md"] == "cafe-bar-010124--late"
+    # The file named after its directory is the directory's setlist
+    assert ids["/s/Paradise (082424)/Paradise (082424).md"] == "paradise-082424"
+    assert ids["/s/Paradise (082424)/Notes.md"] == "paradise-082424--notes"
+    assert len(set(ids.values())) == 7
+    assert all(not i.isdigit() for i in ids.values())
+    # Scan order must not change who gets the plain slug
+    assert ids == setlist_manager.assign_setlist_ids(dict(reversed(list(files.items()))))
+    print("✅ Setlist id collisions resolved deterministically")
+
+
+def test_setlist_ids_never_change_when_setlists_are_added():
+    """A second file in a venue dir, or a new dir with the same slug, only suffixes the newcomer"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        first = _write_setlist(root, "Venue A Setlist (010124)", ["Song One"])
+        archive = setlist_manager.SetlistArchive(root)
+        assert [s['id'] for s in archive.setlists()] == ["venue-a-setlist-010124"]
+
+        # Sorts before the existing file, and a colliding directory sorts before its directory
+        early = first.parent / "Aardvark.md"
+        early.write_text(first.read_text(encoding="utf-8"), encoding="utf-8")
+        rival = _write_setlist(root, "Venue A  Setlist (010124)", ["Song Two"])
+        archive.refresh(force=True)
+        assert archive.id_for_path(str(first)) == "venue-a-setlist-010124"
+        assert archive.id_for_path(str(early)) == "venue-a-setlist-010124--aardvark"
+        assert archive.id_for_path(str(rival)).startswith("venue-a-setlist-010124-")
+
+        # A restarted server (or another worker) reads the same ids back
+        restarted = setlist_manager.SetlistArchive(root)
+        assert {s['file_path']: s['id'] for s in restarted.setlists()} == \
+            {s['file_path']: s['id'] for s in archive.setlists()}
+    print("✅ Setlist ids survive new setlists and restarts")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Setlist Archive Tests...\n")
+    test_archive_orders_newest_first_and_looks_up_by_id()
+    test_archive_reparses_only_changed_files()
+    test_setlist_ids_are_unique_and_not_numeric()
+    test_setlist_ids_never_change_when_setlists_are_added()
+    print("\n🎉 ALL TESTS PASSED!")
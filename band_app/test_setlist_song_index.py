@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Tests for the song-to-setlist index of the setlist archive"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core import setlist_manager
+
+
+def _write_setlist(root: Path, venue_dir: str, sets) -> Path:
+    venue_path = root / venue_dir
+    venue_path.mkdir(parents=True, exist_ok=True)
+    file_path = venue_path / f"{venue_dir}.md"
+    body = ""
+    for number, songs in enumerate(sets, 1):
+        body += f"# ****—SET {number}****  \n" + "".join(f"{song}  \n" for song in songs)
+    file_path.write_text(body, encoding="utf-8")
+    return file_path
+
+
+def _touch(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def test_song_plays_and_stats():
+    """Plays come back newest first with set and position; stats count plays and shows"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write_setlist(root, "Old Bar Setlist (010223)", [["Dreams (120)", "Time"], ["dreams"]])
+        _write_setlist(root, "New Bar Setlist (120624)", [["1999 (119)", "Don’t Stop"]])
+        _write_setlist(root, "Mid Bar Setlist (060623)", [["Remedy"], ["Dreams ->"]])
+
+        archive = setlist_manager.SetlistArchive(root)
+        plays = archive.song_plays("DREAMS")
+        assert [(p['setlist']['venue'], p['set'], p['position']) for p in plays] == [
+            ("Mid Bar", "set2", 0), ("Old Bar", "set1", 0), ("Old Bar", "set2", 0)]
+        assert plays[0]['song']['is_segue']
+
+        stats = archive.song_stats("dreams")
+        assert stats['times_played'] == 3 and stats['shows'] == 2
+        assert stats['last_played']['id'] == "mid-bar-setlist-060623"
+        assert stats['first_played']['date'] == "01/02/23"
+        assert archive.song_stats("Don't  stop")['times_played'] == 1
+        assert archive.song_stats("Landslide") == {
+            'song_name': "Landslide", 'times_played': 0, 'shows': 0,
+            'last_played': None, 'first_played': None}
+
+        assert [s['venue'] for s in archive.song_setlists("rEAM", partial=True)] == ["Mid Bar", "Old Bar"]
+        assert archive.song_setlists("ream") == []
+        assert archive.song_setlists("", partial=True) == []
+    print("✅ Song plays, partial matches and play stats verified")
+
+
+def test_song_index_updates_with_changed_files():
+    """Editing or deleting one setlist only changes that setlist's postings"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        first = _write_setlist(root, "Venue A Setlist (010124)", [["Dreams"]])
+        _write_setlist(root, "Venue B Setlist (020124)", [["Time", "Dreams"]])
+
+        archive = setlist_manager.SetlistArchive(root)
+        assert archive.song_stats("Dreams")['shows'] == 2
+
+        first.write_text("# ****—SET 1****  \nTime  \nRemedy  \n", encoding="utf-8")
+        _touch(first)
+        archive.invalidate()
+        assert [p['setlist']['venue'] for p in archive.song_plays("Dreams")] == ["Venue B"]
+        assert archive.song_stats("Time")['shows'] == 2
+        assert archive.song_stats("Remedy")['last_played']['venue'] == "Venue A"
+
+        first.unlink()
+        first.parent.rmdir()
+        archive.invalidate()
+        assert archive.song_plays("Remedy") == []
+        assert archive.song_stats("Time")['shows'] == 1
+        assert archive._plays.lookup("remedy") == {}
+    print("✅ Song index incremental updates verified")
+
+
+def test_search_setlists_by_song_keeps_one_match_per_set():
+    """The module-level search reports the first matching song of each set"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write_setlist(root, "Venue A Setlist (010124)", [["Dreams", "Sweet Dreams"], ["Time"]])
+        saved = setlist_manager._ARCHIVE
+        setlist_manager._ARCHIVE = setlist_manager.SetlistArchive(root)
+        try:
+            matches = setlist_manager.search_setlists_by_song("dreams")
+            assert [(m['set'], m['song']['name']) for m in matches] == [("set1", "Dreams")]
+            assert [s['venue'] for s in setlist_manager.find_setlists_with_song("tim")] == ["Venue A"]
+        finally:
+            setlist_manager._ARCHIVE = saved
+    print("✅ search_setlists_by_song results verified")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Setlist Song Index Tests...\n")
+    test_song_plays_and_stats()
+    test_song_index_updates_with_changed_files()
+    test_search_setlists_by_song_keeps_one_match_per_set()
+    print("\n🎉 ALL TESTS PASSED!")
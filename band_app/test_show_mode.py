@@ -68,6 +68,50 @@ def test_show_mode_endpoint():
     assert "show-lyrics-container" in res_partial.text
     print("✅ Show Mode HTMX partial endpoint rendered successfully")
 
+def test_show_mode_bundle():
+    """Test /api/setlists/{setlist_id}/show/bundle preloads every song with compression and ETag"""
+    res = client.get("/api/setlists/0/show/bundle", headers={"Accept-Encoding": "gzip"})
+    assert res.status_code == 200
+    assert res.headers["content-encoding"] == "gzip"
+    etag = res.headers["etag"]
+    bundle = res.json()
+    assert bundle["total_songs"] == len(bundle["songs"]) > 1
+    assert all(song["duration"] > 0 and "partial_html" in song for song in bundle["songs"])
+
+    # Each preloaded song is exactly what the per-song HTMX request would return
+    res_partial = client.get("/api/setlists/0/show?song=1&partial=1", headers={"HX-Request": "true"})
+    assert bundle["songs"][1]["partial_html"] == res_partial.text
+
+    res_cached = client.get("/api/setlists/0/show/bundle", headers={"If-None-Match": etag})
+    assert res_cached.status_code == 304
+    # A list of tags matches on any member (weakly), never on a substring
+    res_listed = client.get("/api/setlists/0/show/bundle", headers={"If-None-Match": f'"stale", W/{etag}'})
+    assert res_listed.status_code == 304
+    res_partial_tag = client.get("/api/setlists/0/show/bundle", headers={"If-None-Match": etag[:-3] + '"'})
+    assert res_partial_tag.status_code == 200
+    assert client.get("/api/setlists/9999/show/bundle").status_code == 404
+
+    res_page = client.get("/api/setlists/0/show")
+    assert "/show/bundle" in res_page.text
+    print(f"✅ Show bundle verified ({bundle['total_songs']} songs in one response)")
+
+def test_show_bundle_etag_survives_restart():
+    """The bundle ETag is derived from the data, so a fresh process (or another worker) agrees on it"""
+    from api import setlists as setlists_api
+    setlist_id = setlist_manager.load_previous_setlists()[0]["id"]
+    etag = setlists_api.build_show_bundle(setlist_id)[0]
+
+    saved = setlist_manager._ARCHIVE, song_manager._CATALOG
+    try:
+        # Rebuilt caches start their in-process versions from scratch
+        setlist_manager._ARCHIVE = setlist_manager.SetlistArchive(setlist_manager.SETLISTS_DIR)
+        song_manager._CATALOG = song_manager.SongCatalog()
+        song_manager._CATALOG.snapshot()
+        assert setlists_api.build_show_bundle(setlist_id)[0] == etag
+    finally:
+        setlist_manager._ARCHIVE, song_manager._CATALOG = saved
+    print("✅ Show bundle ETag stable across restarts")
+
 def test_fullscreen_lyrics_with_autoscroll():
     """Test /api/lyrics/{song_name}/fullscreen includes autoscroll"""
     res = client.get("/api/lyrics/1999/fullscreen")
@@ -137,6 +181,27 @@ def test_builder_edit_and_delete_setlist():
     assert "Delete" in res_det.text
     print("✅ Setlist details builder edit and delete options verified")
 
+def test_stable_setlist_ids_and_legacy_redirect():
+    """Setlists are addressed by slug; old positional links redirect to it"""
+    first = setlist_manager.get_setlist_by_position(0)
+    slug = first['id']
+    assert not slug.isdigit()
+
+    res = client.get("/api/setlists/0/show?song=1", follow_redirects=False)
+    assert res.status_code == 307
+    assert res.headers["location"].endswith(f"/api/setlists/{slug}/show?song=1")
+
+    res_slug = client.get(f"/api/setlists/{slug}")
+    assert res_slug.status_code == 200
+    assert first['venue'] in res_slug.text
+    assert client.get("/api/setlists/no-such-show").status_code == 404
+    assert client.get("/api/setlists/99999").status_code == 404
+
+    res_edit = client.get(f"/api/builder/?edit={slug}")
+    assert res_edit.status_code == 200
+    assert f'"setlist_id": "{slug}"' in res_edit.text
+    print("✅ Stable setlist ids and positional redirects verified")
+
 def test_date_normalization():
     """Verify full 4-digit year dates like 10/17/2024 parse and format correctly"""
     assert setlist_manager.human_readable_date("10/17/2024") == "October 17, 2024"
@@ -440,10 +505,13 @@ if __name__ == "__main__":
     test_dont_you_forget_about_me()
     test_lyrics_loaded()
     test_show_mode_endpoint()
+    test_show_mode_bundle()
+    test_show_bundle_etag_survives_restart()
     test_fullscreen_lyrics_with_autoscroll()
     test_regular_lyrics_with_autoscroll()
     test_song_key_metadata()
     test_builder_edit_and_delete_setlist()
+    test_stable_setlist_ids_and_legacy_redirect()
     test_date_normalization()
     test_song_library_metadata_editing()
     test_segue_marker_persistence()
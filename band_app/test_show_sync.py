@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Test synchronised show mode sessions"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core import show_sync
+from core.show_sync import ShowSyncHub
+
+
+class _Device:
+    """Stands in for a WebSocket; records every message it is sent"""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.received = []
+        self.delay = delay
+        self.fail = fail
+
+    async def send(self, text):
+        if self.fail:
+            raise ConnectionError("socket closed")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received.append(json.loads(text))
+
+    def states(self):
+        return [m for m in self.received if m["type"] == "state"]
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_leader_state_reaches_followers():
+    """The first device leads; its changes reach followers, followers can't change the show"""
+    async def run():
+        hub = ShowSyncHub()
+        leader, follower = _Device(), _Device()
+        session, lead_member = hub.join("show-1", 12, "lead", leader.send)
+        _, follow_member = hub.join("show-1", 12, "band", follower.send)
+        await _settle()
+        assert session.leader == "lead"
+        assert follower.states()[-1]["devices"] == 2
+
+        started = time.perf_counter()
+        hub.handle(session, lead_member, json.dumps({"type": "state", "song": 3, "playing": True, "speed": 1.5}))
+        await _settle()
+        latency = time.perf_counter() - started
+        state = follower.states()[-1]
+        assert (state["song"], state["scroll"], state["playing"], state["speed"]) == (3, 0.0, True, 1.5)
+        assert latency < 0.1, latency
+        # The leader gets an ack rather than an echo of its own state
+        assert leader.received[-1] == {"type": "ack", "rev": state["rev"]}
+
+        hub.handle(session, lead_member, json.dumps({"type": "state", "scroll": 0.42}))
+        await _settle()
+        assert follower.states()[-1]["scroll"] == 0.42 and follower.states()[-1]["song"] == 3
+
+        hub.handle(session, follow_member, json.dumps({"type": "state", "song": 5}))
+        await _settle()
+        assert follower.received[-2]["type"] == "error" and session.song == 3
+        hub.handle(session, lead_member, json.dumps({"type": "state", "song": 99}))
+        await _settle()
+        assert leader.received[-2]["type"] == "error" and session.song == 3
+
+        hub.handle(session, follow_member, json.dumps({"type": "lead"}))
+        await _settle()
+        assert session.leader == "band" and leader.states()[-1]["leader"] == "band"
+
+    asyncio.run(run())
+    print("✅ Leader state mirrored to followers")
+
+
+def test_reconnects_resync_and_slow_devices_get_latest_state():
+    """A reconnecting device gets the full state; a slow or dead device doesn't hold up others"""
+    async def run():
+        hub = ShowSyncHub()
+        leader, slow, dead = _Device(), _Device(delay=0.05), _Device(fail=True)
+        session, lead_member = hub.join("show-2", 20, "lead", leader.send)
+        hub.join("show-2", 20, "slow", slow.send)
+        hub.join("show-2", 20, "dead", dead.send)
+        await _settle()
+        assert "dead" not in session.members
+
+        for song in range(1, 10):
+            hub.handle(session, lead_member, json.dumps({"type": "state", "song": song}))
+        await asyncio.sleep(0.2)
+        songs = [m["song"] for m in slow.states()]
+        # Intermediate states were skipped, the newest always arrives
+        assert songs[-1] == 9 and len(songs) < 9
+
+        hub.leave("show-2", lead_member)
+        assert session.leader == "lead"
+        again = _Device()
+        _, lead_member = hub.join("show-2", 20, "lead", again.send)
+        await _settle()
+        assert again.states()[-1]["song"] == 9 and session.leader == "lead"
+
+        hub.handle(session, lead_member, "not json")
+        hub.handle(session, lead_member, json.dumps({"type": "ping", "t": 123}))
+        await _settle()
+        assert again.received[-2]["type"] == "error"
+        assert again.received[-1]["type"] == "pong" and again.received[-1]["t"] == 123
+
+    asyncio.run(run())
+    print("✅ Reconnect and slow-device handling verified")
+
+
+def test_stalled_device_replies_are_bounded():
+    """Pings and bad messages from a device whose socket is stalled don't grow server memory"""
+    async def run():
+        hub = ShowSyncHub()
+        stalled = asyncio.Event()
+
+        async def never_sends(text):
+            await stalled.wait()
+
+        session, member = hub.join("show-4", 10, "stuck", never_sends)
+        await _settle()
+        for t in range(1000):
+            hub.handle(session, member, json.dumps({"type": "ping", "t": t}))
+            hub.handle(session, member, "not json")
+        assert len(member.replies) <= show_sync.MEMBER_REPLY_LIMIT
+        assert sum(1 for reply in member.replies if reply["type"] == "pong") == 1
+        hub.leave("show-4", member)
+
+    asyncio.run(run())
+    print("✅ Stalled device reply queue bounded")
+
+
+def test_idle_sessions_are_pruned():
+    """Empty sessions are forgotten after the idle timeout"""
+    async def run():
+        hub = ShowSyncHub()
+        session, member = hub.join("old-show", 5, "a", _Device().send)
+        hub.leave("old-show", member)
+        session.updated -= show_sync.SESSION_IDLE_SECONDS + 1
+        hub.join("new-show", 5, "b", _Device().send)
+        assert hub.session("old-show") is None and hub.session("new-show") is not None
+
+    asyncio.run(run())
+    print("✅ Idle sessions pruned")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Show Sync Tests...\n")
+    test_leader_state_reaches_followers()
+    test_reconnects_resync_and_slow_devices_get_latest_state()
+    test_stalled_device_replies_are_bounded()
+    test_idle_sessions_are_pruned()
+    print("\n🎉 ALL TESTS PASSED!")
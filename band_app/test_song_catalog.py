@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Tests for the in-memory song catalog and its file-identity invalidation"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core import song_manager
+
+CSV_BODY = (
+    "title,artist,bpm,song_key,has_horn,energy_level,is_jam_vehicle,avg_length\n"
+    "Alpha,Band A,120,C,true,high,false,200\n"
+    "Beta,Band B,95,G,false,low,true,\n"
+)
+
+
+class _TempSonglist:
+    """Point song_manager at a throwaway songlist directory for the duration of a test"""
+
+    def __enter__(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name) / "songlist"
+        root.mkdir()
+        self._saved = (song_manager.SONGLIST_ROOT_DIR, song_manager.SONGLIST_SUB_DIR,
+                       song_manager.SONGLIST_CSV, song_manager.SONGLIST_MARKDOWN)
+        song_manager.SONGLIST_ROOT_DIR = root
+        song_manager.SONGLIST_SUB_DIR = root / "Buckingham_Conspiracy_Song_List"
+        song_manager.SONGLIST_CSV = root / "songlist_master.csv"
+        song_manager.SONGLIST_MARKDOWN = root / "Buckingham Conspiracy 3.0  SONG LIST.md"
+        song_manager.SONGLIST_CSV.write_text(CSV_BODY, encoding="utf-8")
+        return song_manager.SONGLIST_CSV
+
+    def __exit__(self, *exc):
+        (song_manager.SONGLIST_ROOT_DIR, song_manager.SONGLIST_SUB_DIR,
+         song_manager.SONGLIST_CSV, song_manager.SONGLIST_MARKDOWN) = self._saved
+        self._tmp.cleanup()
+
+
+def test_catalog_parses_once_until_file_changes():
+    """Repeated reads share one parse; an edit on disk bumps the version"""
+    with _TempSonglist() as csv_path:
+        catalog = song_manager.SongCatalog()
+        version, songs = catalog.snapshot()
+        assert set(songs) == {"Alpha", "Beta"}
+        assert songs["Alpha"]["has_horn"] is True
+        assert songs["Beta"]["duration"] == song_manager.calculate_song_duration(95)
+
+        version_again, songs_again = catalog.snapshot()
+        assert version_again == version
+        assert songs_again is songs
+
+        csv_path.write_text(CSV_BODY + "Gamma,Band C,140,D,false,standard,false,\n", encoding="utf-8")
+        st = csv_path.stat()
+        os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        new_version, new_songs = catalog.snapshot()
+        assert new_version > version
+        assert "Gamma" in new_songs
+    print("✅ Song catalog reparses only on file identity change")
+
+
+def test_catalog_records_are_read_only():
+    """Catalog records are immutable while load_song_list hands out copies"""
+    with _TempSonglist():
+        catalog = song_manager.SongCatalog()
+        songs = catalog.songs()
+        try:
+            songs["Alpha"]["bpm"] = 1
+            raise AssertionError("catalog record should be read-only")
+        except TypeError:
+            pass
+
+        catalog.invalidate()
+        version_before = catalog.version
+        copy = {title: dict(info) for title, info in catalog.songs().items()}
+        copy["Alpha"]["bpm"] = 1
+        assert catalog.songs()["Alpha"]["bpm"] == 120
+        assert catalog.version == version_before
+    print("✅ Song catalog records are immutable and copies are independent")
+
+
+def test_save_song_list_invalidates_catalog():
+    """Writes through save_song_list are visible on the next read"""
+    with _TempSonglist():
+        songs = song_manager.load_song_list()
+        version_before, _ = song_manager.get_catalog_snapshot()
+        songs["Alpha"]["artist"] = "Renamed"
+        assert song_manager.save_song_list(songs)
+        version_after, catalog = song_manager.get_catalog_snapshot()
+        assert version_after > version_before
+        assert catalog["Alpha"]["artist"] == "Renamed"
+        assert song_manager.flush_song_catalog()
+        assert song_manager.load_song_list_from_csv(song_manager.SONGLIST_CSV)["Alpha"]["artist"] == "Renamed"
+    song_manager.invalidate_song_catalog()
+    print("✅ Saving the song list refreshes the shared catalog")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Song Catalog Tests...\n")
+    test_catalog_parses_once_until_file_changes()
+    test_catalog_records_are_read_only()
+    test_save_song_list_invalidates_catalog()
+    print("\n🎉 ALL TESTS PASSED!")
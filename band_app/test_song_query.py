@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Tests for the indexed song library query engine"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core.song_query import InvalidCursor, SongLibraryIndex
+
+WORDS = ["dreams", "time", "fire", "river", "night", "love", "stone", "heart", "road", "blue"]
+ARTISTS = ["Fleetwood Mac", "Prince", "The Band", "Stevie Wonder", ""]
+
+
+def _catalog(size, seed=7):
+    rng = random.Random(seed)
+    songs = {}
+    while len(songs) < size:
+        title = " ".join(rng.choice(WORDS).title() for _ in range(rng.randint(1, 3))) + f" {len(songs)}"
+        songs[title] = {
+            'bpm': rng.randint(60, 180),
+            'duration': rng.randint(120, 600),
+            'artist': rng.choice(ARTISTS),
+            'energy_level': rng.choice(['high', 'standard', 'low']),
+            'has_horn': rng.random() < 0.2,
+            'is_jam_vehicle': rng.random() < 0.1,
+        }
+    return songs
+
+
+def _linear(songs, search=None, energy_level=None, has_horn=None, is_jam_vehicle=None,
+            min_bpm=None, max_bpm=None, sort_by="title", sort_order="asc"):
+    """The scan-and-sort implementation the index replaces"""
+    filtered = {}
+    for name, info in songs.items():
+        if search and not (search.lower() in name.lower() or search.lower() in info.get('artist', '').lower()):
+            continue
+        if energy_level and info.get('energy_level') != energy_level:
+            continue
+        if has_horn is not None and info.get('has_horn') != has_horn:
+            continue
+        if is_jam_vehicle is not None and info.get('is_jam_vehicle') != is_jam_vehicle:
+            continue
+        if min_bpm and info.get('bpm', 0) < min_bpm:
+            continue
+        if max_bpm and info.get('bpm', 0) > max_bpm:
+            continue
+        filtered[name] = info
+    reverse = sort_order == "desc"
+    keys = {
+        'title': lambda x: x[0].lower(),
+        'artist': lambda x: x[1].get('artist', '').lower(),
+        'bpm': lambda x: x[1].get('bpm', 0),
+        'duration': lambda x: x[1].get('duration', 0),
+    }
+    if sort_by in keys:
+        return [name for name, _ in sorted(filtered.items(), key=keys[sort_by], reverse=reverse)]
+    return list(filtered)
+
+
+def test_query_matches_linear_scan():
+    """Every filter and sort combination returns what the linear scan returned"""
+    songs = _catalog(600)
+    index = SongLibraryIndex(1, songs)
+    rng = random.Random(3)
+    for _ in range(300):
+        filters = {
+            'search': rng.choice([None, "", "dream", "PRINCE", "e", "zzz", "fire 1"]),
+            'energy_level': rng.choice([None, "high", "low", "bogus"]),
+            'has_horn': rng.choice([None, True, False]),
+            'is_jam_vehicle': rng.choice([None, True, False]),
+            'min_bpm': rng.choice([None, 0, 90, 181]),
+            'max_bpm': rng.choice([None, 120, 59]),
+            'sort_by': rng.choice(["title", "artist", "bpm", "duration", "other"]),
+            'sort_order': rng.choice(["asc", "desc"]),
+        }
+        expected = _linear(songs, **filters)
+        names, total, next_cursor = index.query(**filters)
+        assert names == expected, filters
+        assert total == len(expected) and next_cursor is None
+    print("✅ Indexed queries match the linear scan")
+
+
+def test_cursor_pagination():
+    """Pages chain through next_cursor without gaps or repeats"""
+    songs = _catalog(500)
+    index = SongLibraryIndex(1, songs)
+    for filters in ({'sort_by': "bpm", 'sort_order': "desc"},
+                    {'sort_by': "other", 'has_horn': True},
+                    {'search': "heart", 'sort_by': "artist"}):
+        expected = _linear(songs, **filters)
+        pages, cursor = [], None
+        while True:
+            names, total, cursor = index.query(limit=7, cursor=cursor, **filters)
+            assert total == len(expected)
+            pages.extend(names)
+            if cursor is None:
+                break
+        assert pages == expected, filters
+
+    try:
+        index.query(cursor="No Such Song")
+        assert False, "unknown cursor accepted"
+    except InvalidCursor:
+        pass
+    print("✅ Cursor pagination verified")
+
+
+def test_large_catalog_queries_are_fast():
+    """A page from a 20k-song catalog stays well under a few milliseconds"""
+    index = SongLibraryIndex(1, _catalog(20000))
+    queries = [
+        {'limit': 50},
+        {'search': "dream", 'sort_by': "bpm", 'limit': 50},
+        {'energy_level': "high", 'has_horn': True, 'min_bpm': 100, 'max_bpm': 140, 'limit': 50},
+        {'is_jam_vehicle': True, 'sort_by': "duration", 'sort_order': "desc", 'limit': 50},
+    ]
+    for filters in queries:
+        index.query(**filters)
+        started = time.perf_counter()
+        for _ in range(20):
+            index.query(**filters)
+        elapsed = (time.perf_counter() - started) / 20
+        # Generous bound for slow CI machines
+        assert elapsed < 0.005, (filters, elapsed)
+    print("✅ Large catalog query latency verified")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Song Query Tests...\n")
+    test_query_matches_linear_scan()
+    test_cursor_pagination()
+    test_large_catalog_queries_are_fast()
+    print("\n🎉 ALL TESTS PASSED!")
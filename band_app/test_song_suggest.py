@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Tests for the typo-tolerant song suggestion index"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core.song_suggest import SongSuggestIndex, fold
+
+SONGS = {
+    "Dreams": {'artist': "Fleetwood Mac"},
+    "Go Your Own Way": {'artist': "Fleetwood Mac"},
+    "Sweet Dreams (Are Made of This)": {'artist': "Eurythmics"},
+    "Don’t Stop": {'artist': "Fleetwood Mac"},
+    "1999": {'artist': "Prince"},
+    "Purple Rain": {'artist': "Prince"},
+    "Dream On": {'artist': "Aerosmith"},
+    "Café Racer": {'artist': ""},
+}
+
+
+def _names(results):
+    return [(r['type'], r['name']) for r in results]
+
+
+def test_prefix_and_ranking():
+    """Prefixes match word starts; exact-start songs rank ahead of artists and inner-word matches"""
+    index = SongSuggestIndex(1, SONGS)
+    assert _names(index.suggest("drea", limit=3)) == [
+        ("song", "Dreams"), ("song", "Dream On"), ("song", "Sweet Dreams (Are Made of This)")]
+    assert _names(index.suggest("pri")) == [("artist", "Prince")]
+    assert ("artist", "Fleetwood Mac") in _names(index.suggest("fleetw"))
+    assert index.suggest("fleetw")[0]['songs'] == 3
+    assert _names(index.suggest("purple r")) == [("song", "Purple Rain")]
+    assert _names(index.suggest("dont")) == [("song", "Don’t Stop")]
+    assert _names(index.suggest("cafe")) == [("song", "Café Racer")]
+    assert index.suggest("  ") == [] and index.suggest("zzzz") == []
+    assert fold("Don’t Stop") == "dont stop"
+    print("✅ Prefix matching and ranking verified")
+
+
+def test_typos_within_budget():
+    """Misspellings match within the per-word edit budget and rank after exact matches"""
+    index = SongSuggestIndex(1, SONGS)
+    results = index.suggest("drems")
+    assert results[0]['name'] == "Dreams" and results[0]['distance'] == 1
+    assert ("song", "Purple Rain") in _names(index.suggest("purpel"))
+    assert ("artist", "Fleetwood Mac") in _names(index.suggest("fleetwod mac"))
+    # Two-letter words must be exact; long words allow two edits
+    assert index.suggest("dx") == []
+    assert index.suggest("eurithmcs")[0]['name'] == "Eurythmics"
+    assert index.suggest("eurxxxmics") == []
+    print("✅ Typo tolerance verified")
+
+
+def test_suggestions_are_fast_on_large_catalogs():
+    """Each keystroke of a query stays in the low milliseconds on 20k songs"""
+    rng = random.Random(5)
+    syllables = ["dra", "mon", "ki", "la", "vor", "tin", "sha", "ber", "nu", "qui", "zel", "po"]
+    songs = {}
+    while len(songs) < 20000:
+        title = " ".join("".join(rng.choice(syllables) for _ in range(rng.randint(1, 3))) for _ in range(rng.randint(1, 4)))
+        songs[title] = {'artist': rng.choice(["Mon Kila", "Vortin Sha", "Berqui", ""])}
+    index = SongSuggestIndex(1, songs)
+    query = "dramon kilavo"
+    started = time.perf_counter()
+    for end in range(1, len(query) + 1):
+        index.suggest(query[:end])
+    per_keystroke = (time.perf_counter() - started) / len(query)
+    # Generous bound for slow CI machines
+    assert per_keystroke < 0.05, per_keystroke
+    print(f"✅ Suggestion latency verified ({per_keystroke * 1000:.2f} ms per keystroke)")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Song Suggest Tests...\n")
+    test_prefix_and_ranking()
+    test_typos_within_budget()
+    test_suggestions_are_fast_on_large_catalogs()
+    print("\n🎉 ALL TESTS PASSED!")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Tests for the SQLite storage backend"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core import setlist_manager, song_manager
+from core.storage import FileStorage, SQLiteStorage, export_to_files
+from test_setlist_archive import _count_parses, _write_setlist
+from test_song_catalog import _TempSonglist
+
+
+def _bump_mtime(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def test_catalog_round_trips_through_sqlite():
+    """Songs parsed once are served from the database, and file edits are re-imported"""
+    with _TempSonglist() as csv_path, tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(Path(tmp) / "hub.sqlite3")
+        catalog = song_manager.SongCatalog()
+        catalog.attach_storage(storage)
+        songs = catalog.songs()
+        assert dict(songs["Alpha"]) == song_manager.load_song_list_from_csv(csv_path)["Alpha"]
+
+        # A new process (fresh catalog) reads the database instead of reparsing the CSV
+        original = song_manager.load_song_list_from_csv
+        song_manager.load_song_list_from_csv = lambda path: {}
+        try:
+            fresh = song_manager.SongCatalog()
+            fresh.attach_storage(storage)
+            assert {title: dict(info) for title, info in fresh.songs().items()} == \
+                {title: dict(info) for title, info in songs.items()}
+        finally:
+            song_manager.load_song_list_from_csv = original
+
+        with open(csv_path, "a", encoding="utf-8") as f:
+            f.write("Gamma,Band C,140,D,false,standard,false,\n")
+        _bump_mtime(csv_path)
+        assert "Gamma" in catalog.songs()
+        assert "Gamma" in storage.songs()
+        storage.close()
+    print("✅ Song catalog round-trips through SQLite")
+
+
+def test_setlists_load_from_database_until_changed():
+    """An unchanged archive is rebuilt without parsing markdown; entries are indexed by song"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "setlists"
+        _write_setlist(root, "Bar Setlist (010124)", ["Dreams (120)", "Sara"])
+        second = _write_setlist(root, "Club Setlist (020224)", ["dreams", "Landslide"])
+        storage = SQLiteStorage(Path(tmp) / "hub.sqlite3")
+
+        calls, original = _count_parses()
+        try:
+            archive = setlist_manager.SetlistArchive(root)
+            archive.attach_storage(storage)
+            first = archive.setlists()
+            assert len(calls) == 2
+
+            restarted = setlist_manager.SetlistArchive(root)
+            restarted.attach_storage(storage)
+            assert restarted.setlists() == first and len(calls) == 2
+
+            second.write_text("# ****—SET 1****  \nRhiannon  \n", encoding="utf-8")
+            _bump_mtime(second)
+            restarted.refresh(force=True)
+            assert len(calls) == 3
+        finally:
+            setlist_manager.parse_setlist_file = original
+
+        assert [len(plays) for plays in storage.song_postings("DREAMS").values()] == [1]
+        assert len(storage.song_postings("Rhiannon")) == 1
+        assert len(storage.song_postings("rhian", partial=True)) == 1
+        assert [play['song']['name'] for play in restarted.song_plays("rhiannon")] == ["Rhiannon"]
+
+        os.unlink(second)
+        restarted.refresh(force=True)
+        assert storage.song_postings("Rhiannon") == {}
+        assert restarted.song_plays("Rhiannon") == []
+        storage.close()
+    print("✅ Setlists served from SQLite and indexed by song")
+
+
+def test_lyrics_full_text_search():
+    """FTS5 search follows the LyricsIndex query syntax and result shape"""
+    with tempfile.TemporaryDirectory() as tmp:
+        lyrics_dir = Path(tmp) / "lyrics"
+        lyrics_dir.mkdir()
+        (lyrics_dir / "Dreams.txt").write_text(
+            "Now here you go again\nYou say you want your freedom\nThunder only happens when it's raining",
+            encoding="utf-8")
+        (lyrics_dir / "Landslide.txt").write_text("I took my love\nand I took it down", encoding="utf-8")
+        storage = SQLiteStorage(Path(tmp) / "hub.sqlite3")
+
+        results = storage.search_lyrics(lyrics_dir, "freedom thunder")
+        assert [r['song_name'] for r in results] == ["Dreams"]
+        assert [s['line'] for s in results[0]['snippets']] == [2, 3]
+        assert [r['song_name'] for r in storage.search_lyrics(lyrics_dir, '"took my love"')] == ["Landslide"]
+        assert storage.search_lyrics(lyrics_dir, '"love took"') == []
+        assert storage.search_lyrics(lyrics_dir, "  ") == []
+        assert len(storage.search_lyrics(lyrics_dir, "you", limit=1)) == 1
+
+        (lyrics_dir / "Landslide.txt").unlink()
+        (lyrics_dir / "Sara.txt").write_text("Drowning in the sea of love", encoding="utf-8")
+        storage.invalidate_lyrics()
+        assert [r['song_name'] for r in storage.search_lyrics(lyrics_dir, "love")] == ["Sara"]
+        assert FileStorage().search_lyrics(lyrics_dir, "love") is None
+        storage.close()
+    print("✅ Lyrics full-text search verified")
+
+
+def test_export_writes_only_changed_files_and_keeps_pending_edits():
+    """Export counts files written, skips identical ones and flushes the write-behind edit first"""
+    with _TempSonglist() as csv_path, tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(Path(tmp) / "hub.sqlite3")
+        catalog = song_manager.get_catalog_cache()
+        catalog.attach_storage(storage)
+        try:
+            songs = {title: dict(info) for title, info in catalog.songs().items()}
+            first = export_to_files(storage)
+            assert first['songs'] == 2  # the CSV in export format, plus the missing markdown mirror
+            assert export_to_files(storage)['songs'] == 0
+
+            # An edit saved through the CatalogWriter (written behind or at once) is exported, not reverted
+            songs["Gamma"] = dict(songs["Beta"], artist="Band C")
+            song_manager.save_song_list(songs)
+            written = export_to_files(storage)
+            assert not song_manager.get_catalog_writer().pending
+            assert written['songs'] == 0
+            assert "Gamma" in storage.songs()
+            assert "Gamma" in song_manager.load_song_list_from_csv(csv_path)
+        finally:
+            catalog.attach_storage(FileStorage())
+            storage.close()
+    print("✅ Export writes only changed files and keeps pending edits")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Storage Tests...\n")
+    test_catalog_round_trips_through_sqlite()
+    test_setlists_load_from_database_until_changed()
+    test_lyrics_full_text_search()
+    test_export_writes_only_changed_files_and_keeps_pending_edits()
+    print("\n🎉 ALL TESTS PASSED!")
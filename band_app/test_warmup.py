@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Tests for the startup warm-up and its readiness report"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add app directory to path
+app_dir = Path(__file__).parent / "app"
+sys.path.insert(0, str(app_dir))
+
+from core import song_query, song_suggest
+from core.warmup import DEGRADED, READY, WARMING, WarmUp, compile_templates, core_stages
+
+
+class _Env:
+    """Stands in for a Jinja environment"""
+
+    def __init__(self, names):
+        self.names = names
+        self.loaded = []
+
+    def list_templates(self, filter_func=None):
+        return [name for name in self.names if filter_func is None or filter_func(name)]
+
+    def get_template(self, name):
+        self.loaded.append(name)
+
+
+def test_stages_run_in_order_with_timings():
+    """Readiness stays 'warming' until every stage ran; each stage reports its time"""
+    seen = []
+    warmup = WarmUp()
+    assert warmup.status == WARMING and warmup.report()["total_ms"] is None
+
+    def slow():
+        seen.append(("slow", warmup.report()["status"], warmup.report()["stages"]["slow"]["status"]))
+        time.sleep(0.02)
+
+    warmup.add("slow", slow)
+    warmup.add("fast", lambda: seen.append(("fast", warmup.status, None)))
+    assert warmup.run() == READY
+
+    assert seen == [("slow", WARMING, "running"), ("fast", WARMING, None)]
+    report = warmup.report()
+    assert report["status"] == READY and list(report["stages"]) == ["slow", "fast"]
+    assert report["stages"]["slow"]["ms"] >= 20 and report["stages"]["slow"]["status"] == "ok"
+    assert report["total_ms"] >= report["stages"]["slow"]["ms"]
+    print("✅ Warm-up stages timed in order")
+
+
+def test_failing_stage_degrades_but_does_not_stop_warmup():
+    """A broken stage is reported; later stages still run"""
+    ran = []
+
+    def broken():
+        raise OSError("lyrics directory unreadable")
+
+    warmup = WarmUp([("broken", broken), ("after", lambda: ran.append(True))])
+    assert warmup.run() == DEGRADED
+    stages = warmup.report()["stages"]
+    assert stages["broken"]["status"] == "error" and "unreadable" in stages["broken"]["error"]
+    assert stages["after"]["status"] == "ok" and ran == [True]
+    print("✅ Failed stage reported as degraded")
+
+
+def test_core_stages_build_every_index():
+    """The core stages leave the song indexes built for the current catalog"""
+    stages = core_stages()
+    assert [name for name, _ in stages] == ["song_catalog", "song_query", "song_suggest", "setlist_archive",
+                                           "setlist_analytics", "lyrics_list", "lyrics_search", "tabs"]
+    warmup = WarmUp(stages)
+    assert warmup.run() == READY, warmup.report()
+    assert song_query._INDEX is not None and song_suggest._INDEX is not None
+
+    env, other = _Env(["base.html", "songs/card.html", "notes.txt"]), _Env(["index.html"])
+    assert compile_templates([env, other]) == 3
+    assert env.loaded == ["base.html", "songs/card.html"] and other.loaded == ["index.html"]
+    print("✅ Core caches warmed")
+
+
+if __name__ == "__main__":
+    print("🎸 Running Warm-up Tests...\n")
+    test_stages_run_in_order_with_timings()
+    test_failing_stage_degrades_but_does_not_stop_warmup()
+    test_core_stages_build_every_index()
+    print("\n🎉 ALL TESTS PASSED!")
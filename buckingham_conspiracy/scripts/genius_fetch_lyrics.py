@@ -41,6 +41,16 @@ USER_AGENT = (
     "Chrome/119.0 Safari/537.36"
 )
 
+# Share the band app's on-disk Genius cache when the app sits next to this checkout
+sys.path.append(str(BASE_DIR.parent / "band_app" / "app"))
+try:
+    from core.genius_cache import LYRICS_NAMESPACE, ResponseCache
+except ImportError:
+    LYRICS_NAMESPACE, ResponseCache = "lyrics", None
+
+GENIUS_CACHE_DIR = Path(os.getenv("GENIUS_CACHE_DIR") or DATA_ROOT / ".cache" / "genius")
+CACHE = ResponseCache(GENIUS_CACHE_DIR) if ResponseCache else None
+
 
 def normalize(text: str) -> str:
     return re.sub(r"[^a-z0-9]+", "", text.lower())
@@ -88,6 +98,11 @@ def ensure_token(options: argparse.Namespace) -> str:
 
 def genius_request(path: str, token: str, params: Optional[Dict[str, str]] = None) -> Dict:
     url = f"{GENIUS_API_BASE}{path}"
+    namespace = path.strip("/")
+    if CACHE is not None:
+        cached, payload = CACHE.get(namespace, url, params)
+        if cached:
+            return payload.get("response", {})
     headers = {
         "Authorization": f"Bearer {token}",
         "User-Agent": USER_AGENT,
@@ -98,6 +113,8 @@ def genius_request(path: str, token: str, params: Optional[Dict[str, str]] = Non
         raise SystemExit("Genius rejected the token (401). Check your credentials.")
     response.raise_for_status()
     payload = response.json()
+    if CACHE is not None:
+        CACHE.put(namespace, url, payload, params, negative=not payload.get("response", {}).get("hits"))
     return payload.get("response", {})
 
 
@@ -124,6 +141,17 @@ def search_song(title: str, artist: str, token: str) -> Optional[Dict]:
 
 
 def fetch_lyrics_from_url(url: str) -> Optional[str]:
+    if CACHE is not None:
+        cached, lyrics = CACHE.get(LYRICS_NAMESPACE, url)
+        if cached:
+            return lyrics
+    lyrics = download_lyrics(url)
+    if CACHE is not None:
+        CACHE.put(LYRICS_NAMESPACE, url, lyrics, negative=lyrics is None)
+    return lyrics
+
+
+def download_lyrics(url: str) -> Optional[str]:
     headers = {"User-Agent": USER_AGENT, "Accept": "text/html"}
     response = requests.get(url, headers=headers, timeout=30)
     response.raise_for_status()
@@ -136,8 +164,11 @@ def fetch_lyrics_from_url(url: str) -> Optional[str]:
     if not containers:
         return None
     chunks = []
+    # Same raw text the band app caches for this page (see core/genius_cache.py)
     for container in containers:
-        text = container.get_text(separator="\n").strip()
+        for br in container.find_all("br"):
+            br.replace_with("\n")
+        text = container.get_text().strip()
         if text:
             chunks.append(text)
     lyrics = "\n\n".join(chunks).strip()
@@ -195,6 +226,11 @@ def build_parser() -> argparse.ArgumentParser:
         default=1.0,
         help="Seconds to wait between API calls (default: 1s).",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the on-disk Genius cache and always hit the network.",
+    )
     parser.add_argument(
         "--token",
         help="Genius API access token (falls back to GENIUS_ACCESS_TOKEN).",
@@ -205,6 +241,8 @@ def build_parser() -> argparse.ArgumentParser:
 def main() -> int:
     parser = build_parser()
     options = parser.parse_args()
+    if CACHE is not None and options.no_cache:
+        CACHE.enabled = False
     token = ensure_token(options)
     songs = parse_song_list()
     targets = determine_targets(options, songs)
@@ -216,6 +254,7 @@ def main() -> int:
     for index, title in enumerate(targets, start=1):
         artist = songs[title]["artist"]
         print(f"[{index}/{len(targets)}] Fetching '{title}' ({artist or 'Unknown artist'})...")
+        misses_before = CACHE.stats()["misses"] if CACHE is not None else None
         try:
             result = search_song(title, artist, token)
         except requests.HTTPError as exc:
@@ -251,10 +290,14 @@ def main() -> int:
         print(f"  ✓ Saved to {display_path(destination)}")
         success_count += 1
 
-        if index < len(targets):
+        # Only throttle when this song actually went to Genius
+        went_online = CACHE is None or CACHE.stats()["misses"] != misses_before
+        if index < len(targets) and went_online:
             time.sleep(max(options.delay, 0))
 
     print(f"Done. {success_count} of {len(targets)} songs populated.")
+    if CACHE is not None and CACHE.enabled:
+        print(CACHE.summary())
     return 0
 
 